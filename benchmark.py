@@ -0,0 +1,281 @@
+"""Speed benchmarks for the evaluators, dealing and end-to-end simulation.
+
+Every benchmark runs on fixed inputs: hand corpora drawn from CORPUS_SEED and
+simulations run with SIM_SEED, so two runs of the same code do the same work.
+A benchmark is a list of steps (e.g. 100 hands of its corpus, or one whole
+simulation); each timed pass runs every step once and records its wall time
+and operation count.  Reported per benchmark:
+
+  - ops/s: operations (hands evaluated, deals simulated) per second of the
+    median pass;
+  - p50 / p90 / p99 latency per operation, over the steps of all passes
+    (for step sizes above one this is the mean latency within a step);
+  - peak traced memory: tracemalloc peak of one extra, untimed pass.
+
+Results can be saved as JSON (--json) and compared against an earlier file
+(--baseline): a benchmark whose ops/s fell by more than --threshold counts as
+a regression and makes the exit status 1.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from cards import CARDS, DECK, analyse_board
+from dealing import Dealer
+from standard_holdem import evaluate_5card_hand, evaluate_5card_strength, evaluate_7card_strength, evaluate_on_board
+from worst_case_holdem import (
+    classify_worst_case_cards,
+    classify_worst_case_hand,
+    classify_worst_case_on_board,
+    classify_worst_case_seven,
+)
+
+CORPUS_SEED = 20240601
+SIM_SEED = 12345
+CORPUS_SIZE = 20000
+STEP_SIZE = 100
+
+Step = Callable[[], int]  # runs one step, returns the operations it did
+
+
+@dataclass
+class Benchmark:
+    name: str
+    description: str
+    setup: Callable[[], List[Step]]
+    passes: int = 5
+
+
+def _corpus(num_cards: int) -> List[List[int]]:
+    rng = random.Random(f"{CORPUS_SEED}:{num_cards}")
+    return [rng.sample(CARDS, num_cards) for _ in range(CORPUS_SIZE)]
+
+
+def _steps_over(corpus, evaluate: Callable) -> List[Step]:
+    """Steps of STEP_SIZE calls of evaluate(hand) over the corpus."""
+
+    def step_for(chunk):
+        def step():
+            for hand in chunk:
+                evaluate(hand)
+            return len(chunk)
+
+        return step
+
+    return [step_for(corpus[i : i + STEP_SIZE]) for i in range(0, len(corpus), STEP_SIZE)]
+
+
+def _as_tuples(corpus) -> List[List[Tuple[int, int]]]:
+    return [[DECK[c] for c in hand] for hand in corpus]
+
+
+def _seven_on_board_steps(evaluate: Callable) -> List[Step]:
+    """Board analysed once, then evaluate(board_state, c0, c1) per hand, as simulate() does."""
+
+    corpus = [(analyse_board(hand[2:]), hand[0], hand[1]) for hand in _corpus(7)]
+    return _steps_over(corpus, lambda args: evaluate(*args))
+
+
+def _deal_steps() -> List[Step]:
+    dealer = Dealer("mt", SIM_SEED)
+
+    def step():
+        for _ in range(STEP_SIZE):
+            dealer.deal(23)
+        return STEP_SIZE
+
+    return [step] * (CORPUS_SIZE // STEP_SIZE)
+
+
+def _enumerate_steps() -> List[Step]:
+    from enumerate_odds import enumerate_all
+
+    def step():
+        standard, _, _ = enumerate_all(workers=1)
+        return sum(standard.values())
+
+    return [step]
+
+
+def _simulate_steps(num_players: int, variant: str, num_trials: int = 20000) -> List[Step]:
+    from texas_holdem_sim import simulate
+
+    def step():
+        with tempfile.TemporaryDirectory() as tmp:
+            simulate([num_players], num_trials, os.path.join(tmp, "b.csv"), None, variant=variant, seed=SIM_SEED)
+        return num_trials
+
+    return [step]
+
+
+BENCHMARKS = [
+    Benchmark("eval5_standard", "evaluate_5card_hand, (rank, suit) hands",
+              lambda: _steps_over(_as_tuples(_corpus(5)), evaluate_5card_hand)),
+    Benchmark("eval5_standard_ints", "evaluate_5card_strength, card ints",
+              lambda: _steps_over(_corpus(5), evaluate_5card_strength)),
+    Benchmark("eval5_worstcase", "classify_worst_case_hand, (rank, suit) hands",
+              lambda: _steps_over(_as_tuples(_corpus(5)), classify_worst_case_hand)),
+    Benchmark("eval5_worstcase_ints", "classify_worst_case_cards, card ints",
+              lambda: _steps_over(_corpus(5), classify_worst_case_cards)),
+    Benchmark("eval7_standard", "evaluate_7card_strength",
+              lambda: _steps_over(_corpus(7), evaluate_7card_strength)),
+    Benchmark("eval7_worstcase", "classify_worst_case_seven",
+              lambda: _steps_over(_corpus(7), classify_worst_case_seven)),
+    Benchmark("eval7_standard_on_board", "evaluate_on_board (board analysed once)",
+              lambda: _seven_on_board_steps(evaluate_on_board)),
+    Benchmark("eval7_worstcase_on_board", "classify_worst_case_on_board (board analysed once)",
+              lambda: _seven_on_board_steps(classify_worst_case_on_board)),
+    Benchmark("deal_9p", "Dealer('mt').deal of 23 cards", _deal_steps),
+    Benchmark("enumerate_5card", "all C(52,5) hands under both rankings (enumerate_odds, 1 worker)",
+              _enumerate_steps, passes=1),
+    Benchmark("simulate_2p_standard", "simulate(), 2 players, 20k deals", lambda: _simulate_steps(2, "standard"),
+              passes=3),
+    Benchmark("simulate_9p_standard", "simulate(), 9 players, 20k deals", lambda: _simulate_steps(9, "standard"),
+              passes=3),
+    Benchmark("simulate_2p_worstcase", "simulate(), 2 players, 20k deals", lambda: _simulate_steps(2, "worstcase"),
+              passes=3),
+    Benchmark("simulate_9p_worstcase", "simulate(), 9 players, 20k deals", lambda: _simulate_steps(9, "worstcase"),
+              passes=3),
+]
+BENCHMARKS_BY_NAME = {b.name: b for b in BENCHMARKS}
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(bench: Benchmark, passes: int | None = None) -> Dict[str, float]:
+    """Time one benchmark; returns its ops/s, latency percentiles (ns) and peak memory (bytes)."""
+
+    steps = bench.setup()
+    if len(steps) > 1:
+        steps[0]()  # warm caches and memo tables outside the timings
+
+    pass_rates = []
+    latencies = []
+    perf_counter = time.perf_counter
+    for _ in range(passes or bench.passes):
+        pass_ops = 0
+        pass_time = 0.0
+        for step in steps:
+            start = perf_counter()
+            ops = step()
+            elapsed = perf_counter() - start
+            pass_ops += ops
+            pass_time += elapsed
+            latencies.append(elapsed / ops * 1e9)
+        pass_rates.append(pass_ops / pass_time)
+
+    tracemalloc.start()
+    for step in steps:
+        step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "ops_per_sec": statistics.median(pass_rates),
+        "p50_ns": _percentile(latencies, 0.50),
+        "p90_ns": _percentile(latencies, 0.90),
+        "p99_ns": _percentile(latencies, 0.99),
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(names: List[str] | None = None, passes: int | None = None, out=sys.stdout) -> dict:
+    """Run the named benchmarks (default: all), printing a row as each finishes."""
+
+    results = {}
+    print(f"{'benchmark':<26} {'ops/s':>14} {'p50':>10} {'p90':>10} {'p99':>10} {'peak mem':>10}", file=out)
+    for name in names or list(BENCHMARKS_BY_NAME):
+        result = run_benchmark(BENCHMARKS_BY_NAME[name], passes)
+        results[name] = result
+        print(
+            f"{name:<26} {result['ops_per_sec']:>14,.0f} {_format_ns(result['p50_ns']):>10} "
+            f"{_format_ns(result['p90_ns']):>10} {_format_ns(result['p99_ns']):>10} "
+            f"{result['peak_bytes'] / 1024:>8.1f}KB",
+            file=out,
+            flush=True,
+        )
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "corpus_seed": CORPUS_SEED,
+        "sim_seed": SIM_SEED,
+        "results": results,
+    }
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f}us"
+    return f"{ns:.0f}ns"
+
+
+def compare_to_baseline(current: dict, baseline: dict, threshold: float = 0.10, out=sys.stdout) -> List[str]:
+    """Print the ops/s change of every benchmark in both runs; return the names that regressed."""
+
+    regressions = []
+    print(f"\n{'benchmark':<26} {'baseline':>14} {'current':>14} {'change':>8}", file=out)
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["ops_per_sec"]
+        change = result["ops_per_sec"] / before - 1
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<26} {before:>14,.0f} {result['ops_per_sec']:>14,.0f} {change * 100:>+7.1f}%{flag}", file=out)
+    return regressions
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the evaluators, dealing and simulate().")
+    parser.add_argument(
+        "-b", "--bench", nargs="+", choices=list(BENCHMARKS_BY_NAME), default=None,
+        help="Benchmarks to run (default: all)",
+    )
+    parser.add_argument("--passes", type=int, default=None, help="Timed passes per benchmark (default: per benchmark)")
+    parser.add_argument("--json", type=str, default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=str, default=None, help="Compare against results saved with --json")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10,
+        help="Fractional ops/s drop counted as a regression (default: 0.10)",
+    )
+    parser.add_argument("--list", action="store_true", help="List the benchmarks and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(f"{bench.name:<26} {bench.description}")
+        sys.exit(0)
+
+    current = run_benchmarks(args.bench, args.passes)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
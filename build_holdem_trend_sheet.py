@@ -18,9 +18,40 @@ SAFE_HAND_COL = {
 }
 
 
+def _count_store_rows(input_npz: str):
+    """Rows like the simulation CSV's, computed straight from a count_store file.
+
+    Every hand type of the variant gets a row, zero counts included, as in
+    texas_holdem_sim.write_results.
+    """
+
+    from count_store import load_counts
+    from standard_holdem import HAND_TYPES
+    from texas_holdem_sim import WORST_CASE_HAND_TYPES
+
+    counts = load_counts(input_npz)
+    hand_type_labels = HAND_TYPES if counts.variant == "standard" else WORST_CASE_HAND_TYPES
+    for n, tally in counts.to_tallies().items():
+        for hand_type in hand_type_labels:
+            count = tally.hero_type_counts[hand_type]
+            equity = tally.hero_type_equity_win_counts[hand_type]
+            yield {
+                "num_players": n,
+                "hand_type": hand_type,
+                "hero_hand_probability": count / tally.trials if count else 0.0,
+                "hero_win_given_type_probability": equity / count if count else 0.0,
+                "hero_hand_and_win_probability": equity / tally.trials if count else 0.0,
+                "hero_overall_win_probability": tally.hero_overall_equity_wins / tally.trials,
+            }
+
+
 def build_trend_sheet(input_csv: str, output_csv: str) -> None:
     """Read the long-format simulation CSV and write a wide-format CSV.
 
+    input_csv may also be a raw count file (.npz, see count_store), in which
+    case the probabilities are computed from the integer counts instead of
+    parsed from text.
+
     Output layout (one row per num_players):
       num_players,
       hero_overall_win_probability,
@@ -32,24 +63,28 @@ def build_trend_sheet(input_csv: str, output_csv: str) -> None:
     by_players = defaultdict(dict)
     overall_win_by_players = {}
 
-    with open(input_csv, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            n = int(row["num_players"])
-            hand_type = row["hand_type"]
-            hero_hand_prob = float(row["hero_hand_probability"])
-            hero_win_given = float(row["hero_win_given_type_probability"])
-            hero_hand_and_win = float(row["hero_hand_and_win_probability"])
-            hero_overall = float(row["hero_overall_win_probability"])
-
-            overall_win_by_players[n] = hero_overall
-
-            prefix = SAFE_HAND_COL.get(hand_type, hand_type.replace(" ", "_"))
-            rec = by_players[n]
-            rec["num_players"] = n
-            rec[f"{prefix}_freq"] = hero_hand_prob
-            rec[f"{prefix}_win_given"] = hero_win_given
-            rec[f"{prefix}_hand_and_win"] = hero_hand_and_win
+    if input_csv.endswith(".npz"):
+        rows = list(_count_store_rows(input_csv))
+    else:
+        with open(input_csv, newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    for row in rows:
+        n = int(row["num_players"])
+        hand_type = row["hand_type"]
+        hero_hand_prob = float(row["hero_hand_probability"])
+        hero_win_given = float(row["hero_win_given_type_probability"])
+        hero_hand_and_win = float(row["hero_hand_and_win_probability"])
+        hero_overall = float(row["hero_overall_win_probability"])
+
+        overall_win_by_players[n] = hero_overall
+
+        prefix = SAFE_HAND_COL.get(hand_type, hand_type.replace(" ", "_"))
+        rec = by_players[n]
+        rec["num_players"] = n
+        rec[f"{prefix}_freq"] = hero_hand_prob
+        rec[f"{prefix}_win_given"] = hero_win_given
+        rec[f"{prefix}_hand_and_win"] = hero_hand_and_win
 
     # Build a sorted list of player counts
     player_counts = sorted(by_players.keys())
@@ -90,7 +125,7 @@ if __name__ == "__main__":
         "--input",
         type=str,
         default="holdem_sim_results.csv",
-        help="Input long-format CSV (default: holdem_sim_results.csv)",
+        help="Input long-format CSV, or a raw count file (.npz) (default: holdem_sim_results.csv)",
     )
     parser.add_argument(
         "--output",
@@ -0,0 +1,205 @@
+"""Compact card encoding shared by the evaluators and simulators.
+
+A card is an int 0..51: ``(rank - 2) * 4 + suit``, which is also its index in
+DECK.  So ``card >> 2`` is the rank offset (0 = deuce .. 12 = ace) and
+``card & 3`` is the suit.  The (rank, suit) tuple form is kept for the public
+API; encode/decode convert at those edges.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+# ranks: 2-14 (where 14 = Ace)
+# suits: 0-3 (we don't care which is which, just equality)
+
+RANKS = list(range(2, 15))
+SUITS = list(range(4))
+DECK: List[Tuple[int, int]] = [(r, s) for r in RANKS for s in SUITS]
+
+NUM_CARDS = len(DECK)
+CARDS = list(range(NUM_CARDS))
+
+# Per-card lookup tables, indexed by card int.
+RANK_OF = [r for r, _ in DECK]                   # 2..14
+SUIT_OF = [s for _, s in DECK]                   # 0..3
+RANK_BIT = [1 << (r - 2) for r, _ in DECK]       # 13-bit rank mask
+CARD_BIT = [1 << c for c in CARDS]               # 52-bit card-set mask
+
+RANK_PRIMES = dict(zip(RANKS, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)))
+PRIME_OF = [RANK_PRIMES[r] for r, _ in DECK]
+
+
+def encode_card(card: Tuple[int, int]) -> int:
+    rank, suit = card
+    return (rank - 2) * 4 + suit
+
+
+def decode_card(card: int) -> Tuple[int, int]:
+    return DECK[card]
+
+
+def encode_cards(cards: Iterable[Tuple[int, int]]) -> List[int]:
+    return [(r - 2) * 4 + s for r, s in cards]
+
+
+def decode_cards(cards: Iterable[int]) -> List[Tuple[int, int]]:
+    return [DECK[c] for c in cards]
+
+
+def card_mask(cards: Sequence[int]) -> int:
+    """OR of CARD_BIT over cards: a set of cards as one 52-bit int."""
+
+    mask = 0
+    for c in cards:
+        mask |= CARD_BIT[c]
+    return mask
+
+
+def suit_isomorphism_classes(num_cards: int):
+    """Yield (suit_masks, count) for every suit-isomorphism class of hands.
+
+    Relabelling suits never changes a hand's category in either ranking, so
+    a hand can be reduced to the multiset of its four per-suit 13-bit rank
+    masks.  Each class is yielded once as a sorted 4-tuple of masks, with
+    count = the number of num_cards-card hands in it; the counts add up to
+    comb(52, num_cards).
+    """
+
+    subsets_by_size = [
+        [[s for s in SUITS if subset >> s & 1] for subset in range(16) if bin(subset).count("1") == k]
+        for k in range(5)
+    ]
+    end_bit = 1 << len(RANKS)
+
+    # Depth-first over ranks, deuce first, with an explicit stack: children
+    # are pushed in reverse so classes come out in the same order as from
+    # the recursive walk, without passing each one up through 13 generators.
+    stack = [(1, (0, 0, 0, 0), 1, num_cards)]
+    while stack:
+        rank_bit, masks, count, remaining = stack.pop()
+        if remaining == 0:
+            yield masks, count
+            continue
+        if rank_bit >= end_bit:
+            continue
+        next_bit = rank_bit << 1
+        pushed = []
+        for k in range(min(4, remaining) + 1):
+            # Group the C(4, k) suit choices by the class they lead to.
+            children: dict = {}
+            for suits in subsets_by_size[k]:
+                child = list(masks)
+                for s in suits:
+                    child[s] |= rank_bit
+                key = tuple(sorted(child))
+                children[key] = children.get(key, 0) + 1
+            for child, ways in children.items():
+                pushed.append((next_bit, child, count * ways, remaining - k))
+        pushed.reverse()
+        stack += pushed
+
+
+def cards_from_suit_masks(suit_masks: Sequence[int]) -> List[int]:
+    """Card ints of the hand whose suit s holds the ranks in suit_masks[s]."""
+
+    return [
+        (bit << 2) | s
+        for s, mask in enumerate(suit_masks)
+        for bit in range(len(RANKS))
+        if mask >> bit & 1
+    ]
+
+
+@dataclass(frozen=True)
+class BoardState:
+    """Rank/suit masks of the community cards, shared by every seat in a deal.
+
+    m1..m4 have a bit for every rank seen at least 1..4 times; flush_suit is
+    the one suit holding three or more board cards (the only suit a seat can
+    still make five of), or -1.
+    """
+
+    suit_masks: Tuple[int, int, int, int]
+    m1: int
+    m2: int
+    m3: int
+    m4: int
+    flush_suit: int
+
+
+def analyse_board(board: Sequence[int]) -> BoardState:
+    """Build the BoardState of the community cards (card ints)."""
+
+    s_masks = [0, 0, 0, 0]
+    m1 = m2 = m3 = m4 = 0
+    for c in board:
+        bit = RANK_BIT[c]
+        s_masks[c & 3] |= bit
+        m4 |= m3 & bit
+        m3 |= m2 & bit
+        m2 |= m1 & bit
+        m1 |= bit
+    flush_suit = -1
+    for s, s_mask in enumerate(s_masks):
+        if s_mask.bit_count() >= 3:
+            flush_suit = s
+    return BoardState(tuple(s_masks), m1, m2, m3, m4, flush_suit)
+
+
+@dataclass(frozen=True)
+class StartingHandClass:
+    """One of the 169 suit-isomorphism classes of hole-card pairs."""
+
+    label: str                # "AA", "AKs", "T9o", ...
+    cards: Tuple[int, int]    # a representative pair of card ints
+    combos: int               # pairs in the class: 6, 4 (suited) or 12 (offsuit)
+
+
+RANK_CHARS = "23456789TJQKA"
+
+
+def _starting_hand_classes() -> List[StartingHandClass]:
+    classes = []
+    for hi in range(len(RANKS) - 1, -1, -1):
+        for lo in range(hi, -1, -1):
+            if hi == lo:
+                classes.append(StartingHandClass(RANK_CHARS[hi] * 2, (hi << 2, (hi << 2) | 1), 6))
+            else:
+                name = RANK_CHARS[hi] + RANK_CHARS[lo]
+                classes.append(StartingHandClass(name + "s", (hi << 2, lo << 2), 4))
+                classes.append(StartingHandClass(name + "o", (hi << 2, (lo << 2) | 1), 12))
+    return classes
+
+
+# AA, AKs, AKo, AQs, ..., 22; the combos add up to comb(52, 2).
+STARTING_HAND_CLASSES = _starting_hand_classes()
+STARTING_HAND_INDEX = {cls.label: i for i, cls in enumerate(STARTING_HAND_CLASSES)}
+
+
+def starting_hand_label(c0: int, c1: int) -> str:
+    """Class label ("AKs", ...) of two hole card ints."""
+
+    hi, lo = max(c0 >> 2, c1 >> 2), min(c0 >> 2, c1 >> 2)
+    if hi == lo:
+        return RANK_CHARS[hi] * 2
+    return RANK_CHARS[hi] + RANK_CHARS[lo] + ("s" if c0 & 3 == c1 & 3 else "o")
+
+
+SUIT_CHARS = "cdhs"  # suit 0..3; only used for reading and printing cards
+
+
+def parse_cards(text: str) -> List[int]:
+    """Card ints of a string like "AsKd7c" (rank char + suit char per card)."""
+
+    text = text.replace(" ", "")
+    if len(text) % 2:
+        raise ValueError(f"not a card list: {text!r}")
+    cards = []
+    for i in range(0, len(text), 2):
+        rank, suit = text[i].upper(), text[i + 1].lower()
+        if rank not in RANK_CHARS or suit not in SUIT_CHARS:
+            raise ValueError(f"not a card: {text[i:i + 2]!r}")
+        cards.append((RANK_CHARS.index(rank) << 2) | SUIT_CHARS.index(suit))
+    return cards
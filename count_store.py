@@ -0,0 +1,262 @@
+"""Raw hero counts of simulate() runs, stored columnar so runs can be merged.
+
+The results CSV holds derived probabilities, which cannot be added up across
+runs.  A count file keeps what they are derived from, per player count:
+trials, and per hand type the deals, pure wins and split-pot equity.  Equity
+is stored in whole units of 1/EQUITY_SCALE of a pot: with at most nine
+seats every share 1/k is a whole number of units, so all columns are int64
+and merging files is exact integer addition.
+
+File layout (.npz, numpy.savez_compressed):
+
+  header          JSON string: format, version, variant, hand type labels and
+                  the runs ("sources") the counts came from
+  num_players     int64 [rows]
+  trials          int64 [rows]
+  type_counts     int64 [rows, labels]
+  win_counts      int64 [rows, labels]
+  equity_units    int64 [rows, labels]
+  overall_equity_units  int64 [rows]
+
+Usage:
+
+  python texas_holdem_sim.py --seed 1 --counts a.npz ...   (machine 1)
+  python texas_holdem_sim.py --seed 2 --counts b.npz ...   (machine 2)
+  python count_store.py merge a.npz b.npz -o all.npz --csv all.csv
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+FORMAT = "holdem-hero-counts"
+VERSION = 1
+EQUITY_SCALE = 2520  # lcm(1..9)
+
+
+def _labels(variant: str) -> List[str]:
+    from standard_holdem import HAND_TYPES
+    from texas_holdem_sim import WORST_CASE_HAND_TYPES
+
+    return list(HAND_TYPES if variant == "standard" else WORST_CASE_HAND_TYPES)
+
+
+def _whole(value: float, what: str) -> int:
+    rounded = round(value)
+    if abs(value - rounded) > 1e-6 * max(1.0, abs(value)):
+        raise ValueError(f"{what} is not a whole number ({value}); weighted (stratified) runs cannot be stored")
+    return int(rounded)
+
+
+@dataclass
+class HeroCounts:
+    """Integer hero counts for some player counts of one variant (see module docstring)."""
+
+    variant: str
+    num_players: np.ndarray
+    trials: np.ndarray
+    type_counts: np.ndarray
+    win_counts: np.ndarray
+    equity_units: np.ndarray
+    overall_equity_units: np.ndarray
+    sources: List[dict] = field(default_factory=list)
+
+    @classmethod
+    def from_tallies(cls, tallies, variant: str, source: dict | None = None) -> "HeroCounts":
+        """Counts of {num_players: HeroTally} (unweighted runs only)."""
+
+        labels = _labels(variant)
+        players = sorted(tallies)
+        rows = len(players)
+        counts = cls(
+            variant,
+            np.array(players, dtype=np.int64),
+            np.zeros(rows, dtype=np.int64),
+            np.zeros((rows, len(labels)), dtype=np.int64),
+            np.zeros((rows, len(labels)), dtype=np.int64),
+            np.zeros((rows, len(labels)), dtype=np.int64),
+            np.zeros(rows, dtype=np.int64),
+            [source] if source is not None else [],
+        )
+        for row, n in enumerate(players):
+            tally = tallies[n]
+            counts.trials[row] = _whole(tally.trials, "trials")
+            counts.overall_equity_units[row] = _whole(tally.hero_overall_equity_wins * EQUITY_SCALE, "equity")
+            for col, label in enumerate(labels):
+                counts.type_counts[row, col] = _whole(tally.hero_type_counts[label], "type count")
+                counts.win_counts[row, col] = _whole(tally.hero_type_win_counts[label], "win count")
+                counts.equity_units[row, col] = _whole(
+                    tally.hero_type_equity_win_counts[label] * EQUITY_SCALE, "equity"
+                )
+        return counts
+
+    def to_tallies(self) -> Dict[int, "HeroTally"]:
+        from texas_holdem_sim import HeroTally
+
+        labels = _labels(self.variant)
+        tallies = {}
+        for row, n in enumerate(self.num_players.tolist()):
+            tally = HeroTally(
+                trials=int(self.trials[row]),
+                hero_overall_equity_wins=int(self.overall_equity_units[row]) / EQUITY_SCALE,
+            )
+            for col, label in enumerate(labels):
+                if self.type_counts[row, col]:
+                    tally.hero_type_counts[label] = int(self.type_counts[row, col])
+                if self.win_counts[row, col]:
+                    tally.hero_type_win_counts[label] = int(self.win_counts[row, col])
+                if self.equity_units[row, col]:
+                    tally.hero_type_equity_win_counts[label] = int(self.equity_units[row, col]) / EQUITY_SCALE
+            tallies[n] = tally
+        return tallies
+
+
+def save_counts(counts: HeroCounts, path: str) -> None:
+    header = {
+        "format": FORMAT,
+        "version": VERSION,
+        "variant": counts.variant,
+        "labels": _labels(counts.variant),
+        "equity_scale": EQUITY_SCALE,
+        "sources": counts.sources,
+    }
+    # Write through a file object so numpy does not append ".npz" to other names.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            header=np.array(json.dumps(header)),
+            num_players=counts.num_players,
+            trials=counts.trials,
+            type_counts=counts.type_counts,
+            win_counts=counts.win_counts,
+            equity_units=counts.equity_units,
+            overall_equity_units=counts.overall_equity_units,
+        )
+    os.replace(tmp_path, path)
+
+
+def load_counts(path: str) -> HeroCounts:
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(str(data["header"]))
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} hero count file")
+        if header["labels"] != _labels(header["variant"]) or header["equity_scale"] != EQUITY_SCALE:
+            raise ValueError(f"{path} was written with different hand type labels or equity units")
+        return HeroCounts(
+            header["variant"],
+            data["num_players"],
+            data["trials"],
+            data["type_counts"],
+            data["win_counts"],
+            data["equity_units"],
+            data["overall_equity_units"],
+            header["sources"],
+        )
+
+
+def _stream_key(source: dict):
+    """What identifies a run's deals: runs sharing it sampled the same deals."""
+
+    return (source.get("seed"), source.get("engine"), source.get("rng_backend"), source.get("seat_prefix"))
+
+
+def merge_counts(parts: Sequence[HeroCounts], allow_duplicate_seeds: bool = False) -> HeroCounts:
+    """Add up count files of the same variant, over the union of their player counts.
+
+    Files from runs with the same seed, engine, rng and mode hold the same
+    deals, so merging them would count those deals twice; that is refused
+    unless allow_duplicate_seeds.  Exact enumerations cannot be merged with
+    anything.
+    """
+
+    if not parts:
+        raise ValueError("nothing to merge")
+    variant = parts[0].variant
+    if any(part.variant != variant for part in parts):
+        raise ValueError("cannot merge counts of different variants")
+    sources = [source for part in parts for source in part.sources]
+    if len(parts) > 1 and any(source.get("exact") for source in sources):
+        raise ValueError("exact enumeration counts are complete and cannot be merged with others")
+    if not allow_duplicate_seeds:
+        keys = [_stream_key(source) for source in sources]
+        if len(set(keys)) != len(keys):
+            raise ValueError("two of the runs used the same seed and settings, so they share their deals")
+
+    players = sorted({int(n) for part in parts for n in part.num_players.tolist()})
+    row_of = {n: row for row, n in enumerate(players)}
+    num_labels = parts[0].type_counts.shape[1]
+    merged = HeroCounts(
+        variant,
+        np.array(players, dtype=np.int64),
+        np.zeros(len(players), dtype=np.int64),
+        np.zeros((len(players), num_labels), dtype=np.int64),
+        np.zeros((len(players), num_labels), dtype=np.int64),
+        np.zeros((len(players), num_labels), dtype=np.int64),
+        np.zeros(len(players), dtype=np.int64),
+        sources,
+    )
+    for part in parts:
+        rows = [row_of[int(n)] for n in part.num_players.tolist()]
+        np.add.at(merged.trials, rows, part.trials)
+        np.add.at(merged.type_counts, rows, part.type_counts)
+        np.add.at(merged.win_counts, rows, part.win_counts)
+        np.add.at(merged.equity_units, rows, part.equity_units)
+        np.add.at(merged.overall_equity_units, rows, part.overall_equity_units)
+    return merged
+
+
+def write_merged_results(counts: HeroCounts, csv_filename: str, md_filename: str | None = None) -> None:
+    """Regenerate the usual results CSV (and markdown summary) from counts."""
+
+    from texas_holdem_sim import write_results
+
+    seeds = ", ".join(str(source.get("seed")) for source in counts.sources) or "unknown"
+    trials = ", ".join(f"{n}: {t}" for n, t in zip(counts.num_players.tolist(), counts.trials.tolist()))
+    run_notes = [f"Merged from {len(counts.sources)} run(s), seeds: {seeds}", f"Trials per player count: {trials}"]
+    exact = len(counts.sources) == 1 and bool(counts.sources[0].get("exact"))
+    write_results(
+        counts.to_tallies(), counts.num_players.tolist(), counts.variant, csv_filename, md_filename, run_notes,
+        exact=exact,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Merge raw hero count files and regenerate results.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    merge = sub.add_parser("merge", help="Add up count files and write the results CSV/markdown")
+    merge.add_argument("inputs", nargs="+", help="Count files written with texas_holdem_sim.py --counts")
+    merge.add_argument("-o", "--output", type=str, default=None, help="Also write the merged counts here")
+    merge.add_argument("--csv", type=str, default="holdem_sim_results.csv", help="Results CSV to write")
+    merge.add_argument("--md", type=str, default=None, help="Markdown summary (default: CSV name with .md)")
+    merge.add_argument(
+        "--allow-duplicate-seeds", action="store_true",
+        help="Merge runs that share a seed (their deals are then counted twice)",
+    )
+
+    show = sub.add_parser("show", help="Print a count file's header and trials")
+    show.add_argument("inputs", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "show":
+        for path in args.inputs:
+            counts = load_counts(path)
+            print(f"{path}: {counts.variant}, {len(counts.sources)} run(s)")
+            for n, trials in zip(counts.num_players.tolist(), counts.trials.tolist()):
+                print(f"  {n} players: {trials} trials")
+    else:
+        merged = merge_counts([load_counts(path) for path in args.inputs], args.allow_duplicate_seeds)
+        if args.output:
+            save_counts(merged, args.output)
+        md_filename = args.md or os.path.splitext(args.csv)[0] + ".md"
+        write_merged_results(merged, args.csv, md_filename)
+        print(f"Merged {len(args.inputs)} files; results written to {args.csv} and {md_filename}")
@@ -0,0 +1,167 @@
+"""Deal only the cards a hand needs, from a reusable deck buffer.
+
+Dealer keeps one 52-entry permutation of the card ints (see cards.py) and, for
+each deal, runs the first num_cards steps of a Fisher-Yates shuffle on it: step
+i swaps a uniformly chosen card from positions i..51 into position i.  The
+first num_cards entries are then a uniform random draw, whatever order the
+buffer was left in by the previous deal, so nothing is copied or reset.
+
+The random offsets come from a pluggable backend.  A backend has one method,
+``offsets(num_cards, first=0)``, returning num_cards ints with offsets[i] in
+[0, NUM_CARDS - first - i), i.e. the Fisher-Yates steps first..first+num_cards-1:
+
+  - "mt":       random.Random (Mersenne Twister), the stdlib default;
+  - "pcg64":    NumPy's PCG64, drawn a block of deals at a time;
+  - "philox":   NumPy's Philox, a counter-based generator, likewise blocked;
+  - "splitmix": a pure Python counter-based generator where deal d's cards
+                depend only on (seed, d), so any deal can be replayed alone.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import List, Sequence
+
+from cards import CARDS, NUM_CARDS
+
+RNG_BACKENDS = ("mt", "pcg64", "philox", "splitmix")
+
+_MASK64 = (1 << 64) - 1
+
+
+class MersenneTwisterOffsets:
+    """Offsets from random.Random, as random.shuffle draws them."""
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+        # random.shuffle uses the same unbiased bounded draw.
+        self._randbelow = self.rng._randbelow
+
+    def offsets(self, num_cards: int, first: int = 0) -> List[int]:
+        randbelow = self._randbelow
+        return [randbelow(NUM_CARDS - i) for i in range(first, first + num_cards)]
+
+
+class NumpyOffsets:
+    """Offsets from a NumPy bit generator, drawn block_size deals at a time."""
+
+    def __init__(self, bit_generator: str = "pcg64", seed: int | None = None, block_size: int = 4096):
+        import numpy as np
+
+        bit_generators = {"pcg64": np.random.PCG64, "philox": np.random.Philox}
+        self.rng = np.random.Generator(bit_generators[bit_generator](seed))
+        self.block_size = block_size
+        # Exclusive upper bound of each offset: NUM_CARDS, NUM_CARDS - 1, ...
+        self._bounds = NUM_CARDS - np.arange(NUM_CARDS)
+        self._block: List[List[int]] = []
+        self._block_steps = (0, 0)
+
+    def offsets(self, num_cards: int, first: int = 0) -> List[int]:
+        if not self._block or self._block_steps != (first, num_cards):
+            self._block = self.rng.integers(
+                0, self._bounds[first : first + num_cards], size=(self.block_size, num_cards)
+            ).tolist()
+            self._block_steps = (first, num_cards)
+        return self._block.pop()
+
+
+class SplitMixOffsets:
+    """Counter-based offsets: deal d uses splitmix64 outputs of (seed, d, i).
+
+    Each 64-bit output is mapped into [0, n) by multiply-shift, whose bias
+    (at most n / 2**64) is far below anything a simulation can detect.
+    """
+
+    def __init__(self, seed: int | None = None, deal_index: int = 0):
+        self.key = (random.randrange(1 << 64) if seed is None else seed) & _MASK64
+        self.deal_index = deal_index
+
+    def offsets(self, num_cards: int, first: int = 0) -> List[int]:
+        counter = (self.key + self.deal_index * 0x9E3779B97F4A7C15 * 64) & _MASK64
+        self.deal_index += 1
+        out = []
+        for i in range(first, first + num_cards):
+            z = (counter + (i + 1) * 0x9E3779B97F4A7C15) & _MASK64
+            z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+            z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+            z ^= z >> 31
+            out.append((z * (NUM_CARDS - i)) >> 64)
+        return out
+
+
+def make_offsets(backend: str = "mt", seed: int | None = None):
+    """Build the named RNG backend (one of RNG_BACKENDS)."""
+
+    if backend == "mt":
+        return MersenneTwisterOffsets(seed)
+    if backend in ("pcg64", "philox"):
+        return NumpyOffsets(backend, seed)
+    if backend == "splitmix":
+        return SplitMixOffsets(seed)
+    raise ValueError(f"rng backend must be one of {', '.join(RNG_BACKENDS)}")
+
+
+class Dealer:
+    """Partial Fisher-Yates dealing into one reusable deck buffer."""
+
+    def __init__(self, backend: str = "mt", seed: int | None = None):
+        self.deck = CARDS[:]
+        self.source = make_offsets(backend, seed)
+
+    def deal(self, num_cards: int) -> List[int]:
+        """Draw num_cards cards into deck[:num_cards] and return the deck buffer.
+
+        The buffer is reused by the next deal; copy what must outlive it.
+        """
+
+        deck = self.deck
+        for i, offset in enumerate(self.source.offsets(num_cards)):
+            j = i + offset
+            deck[i], deck[j] = deck[j], deck[i]
+        return deck
+
+    def deal_with(self, fixed: Sequence[int], num_cards: int) -> List[int]:
+        """deal() with the first len(fixed) cards given: deck[:k] == fixed, the rest drawn."""
+
+        deck = self.deck
+        k = len(fixed)
+        for i, card in enumerate(fixed):
+            j = deck.index(card, i)
+            deck[i], deck[j] = deck[j], deck[i]
+        for i, offset in enumerate(self.source.offsets(num_cards - k, k), k):
+            j = i + offset
+            deck[i], deck[j] = deck[j], deck[i]
+        return deck
+
+
+def measure_deal_rate(backend: str = "mt", num_players: int = 9, num_deals: int = 200000, seed: int = 0) -> float:
+    """Deals per second for dealing alone (2 * num_players + 5 cards each)."""
+
+    dealer = Dealer(backend, seed)
+    deal = dealer.deal
+    num_cards = 2 * num_players + 5
+    start = time.perf_counter()
+    for _ in range(num_deals):
+        deal(num_cards)
+    return num_deals / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure dealing throughput per RNG backend.")
+    parser.add_argument("-p", "--players", type=int, default=9, help="Players per deal (default: 9)")
+    parser.add_argument("-n", "--deals", type=int, default=200000, help="Deals to time (default: 200000)")
+    parser.add_argument(
+        "--rng",
+        nargs="+",
+        choices=RNG_BACKENDS,
+        default=list(RNG_BACKENDS),
+        help="Backends to time (default: all)",
+    )
+    args = parser.parse_args()
+
+    for backend in args.rng:
+        rate = measure_deal_rate(backend, args.players, args.deals)
+        print(f"{backend:>9}: {rate:,.0f} deals/s")
@@ -0,0 +1,154 @@
+"""Single-pass, multi-process enumeration of all 5-card hands.
+
+Walks the C(52,5) hands once, split into contiguous ranges of the colex hand
+index used by worst_case_table, and evaluates every hand under both rankings.
+Produces the standard counts, the Worst Case counts and a standard x Worst
+Case cross-tab, then writes standard_holdem_odds.md, worst_case_holdem_odds.md
+and the cross-tab markdown.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import List, Tuple
+
+from cards import NUM_CARDS
+from standard_holdem import HAND_TYPES, evaluate_5card_strength
+from standard_holdem_odds import write_standard_odds_markdown
+from worst_case_holdem import WorstCaseHandType, write_worst_case_odds_markdown
+from worst_case_table import NUM_HANDS, TABLE
+
+NUM_WC_VALUES = len(WorstCaseHandType) + 1  # table values are 1..10
+
+
+def unrank_colex(index: int) -> List[int]:
+    """Sorted 5 card ints whose colex hand index is index."""
+
+    cards = []
+    for k in range(5, 0, -1):
+        c = k - 1
+        while comb(c + 1, k) <= index:
+            c += 1
+        cards.append(c)
+        index -= comb(c, k)
+    return cards[::-1]
+
+
+def count_range(start: int, stop: int) -> Tuple[List[int], List[int], List[int]]:
+    """Evaluate hands with colex index in [start, stop).
+
+    Returns flat count lists: standard by HAND_TYPES index, Worst Case by
+    enum value, and the cross-tab as cross[std_idx * NUM_WC_VALUES + wc_value].
+    """
+
+    std_counts = [0] * len(HAND_TYPES)
+    wc_counts = [0] * NUM_WC_VALUES
+    cross = [0] * (len(HAND_TYPES) * NUM_WC_VALUES)
+    table = TABLE
+    combo = unrank_colex(start)
+    for index in range(start, stop):
+        _, std_idx = evaluate_5card_strength(combo)
+        wc_value = table[index]
+        std_counts[std_idx] += 1
+        wc_counts[wc_value] += 1
+        cross[std_idx * NUM_WC_VALUES + wc_value] += 1
+
+        # Colex successor: bump the lowest card that has room, reset the rest.
+        i = 0
+        while i < 4 and combo[i] + 1 == combo[i + 1]:
+            i += 1
+        combo[i] += 1
+        for j in range(i):
+            combo[j] = j
+    return std_counts, wc_counts, cross
+
+
+def enumerate_all(workers: int | None = None, chunks: int | None = None) -> Tuple[Counter, Counter, Counter]:
+    """Count every 5-card hand under both rankings in one pass over a process pool.
+
+    Returns (standard, worst_case, cross_tab) Counters keyed like
+    enumerate_standard_frequencies (hand type names),
+    enumerate_worst_case_frequencies (WorstCaseHandType) and
+    (hand type name, WorstCaseHandType) respectively.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or workers * 8
+    bounds = [NUM_HANDS * i // chunks for i in range(chunks + 1)]
+    ranges = [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+    std_totals = [0] * len(HAND_TYPES)
+    wc_totals = [0] * NUM_WC_VALUES
+    cross_totals = [0] * (len(HAND_TYPES) * NUM_WC_VALUES)
+    if workers == 1:
+        results = [count_range(lo, hi) for lo, hi in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(count_range, *zip(*ranges)))
+    for std_counts, wc_counts, cross in results:
+        for totals, part in ((std_totals, std_counts), (wc_totals, wc_counts), (cross_totals, cross)):
+            for i, n in enumerate(part):
+                totals[i] += n
+
+    standard = Counter({name: std_totals[i] for i, name in enumerate(HAND_TYPES)})
+    worst_case = Counter({wc_type: wc_totals[wc_type] for wc_type in WorstCaseHandType if wc_totals[wc_type]})
+    cross_tab = Counter()
+    for i, name in enumerate(HAND_TYPES):
+        for wc_type in WorstCaseHandType:
+            n = cross_totals[i * NUM_WC_VALUES + wc_type]
+            if n:
+                cross_tab[name, wc_type] = n
+    return standard, worst_case, cross_tab
+
+
+def write_cross_tab_markdown(cross_tab: Counter, md_path: str = "standard_vs_worst_case_odds.md") -> None:
+    """Write combination counts of every (standard, Worst Case) category pair."""
+
+    wc_types = sorted(WorstCaseHandType, reverse=True)
+    with open(md_path, "w", encoding="utf-8") as md:
+        md.write("# Standard vs Worst Case Hold'em – 5-Card Cross-Tab\n")
+        md.write(f"\nTotal distinct 5-card hands: {comb(NUM_CARDS, 5)}\n\n")
+        md.write("Rows: standard hand type. Columns: Worst Case hand type. Cells: combinations.\n\n")
+        md.write("| Standard \\ Worst Case | " + " | ".join(t.name.replace("_", " ") for t in wc_types) + " |\n")
+        md.write("|---" + "|---:" * len(wc_types) + "|\n")
+        for name in reversed(HAND_TYPES):
+            md.write(f"| {name} | " + " | ".join(str(cross_tab[name, t]) for t in wc_types) + " |\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Enumerate all 5-card hands once under both rankings and write the odds tables."
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--chunks",
+        type=int,
+        default=None,
+        help="Number of hand-index ranges to split the work into (default: 8 per worker)",
+    )
+    parser.add_argument(
+        "--cross-tab-md",
+        type=str,
+        default="standard_vs_worst_case_odds.md",
+        help="Output markdown for the cross-tab (default: standard_vs_worst_case_odds.md)",
+    )
+    args = parser.parse_args()
+
+    standard, worst_case, cross_tab = enumerate_all(args.workers, args.chunks)
+    write_standard_odds_markdown(standard)
+    write_worst_case_odds_markdown(worst_case)
+    write_cross_tab_markdown(cross_tab, args.cross_tab_md)
+    print(
+        "Markdown odds written to standard_holdem_odds.md, worst_case_holdem_odds.md "
+        f"and {args.cross_tab_md}"
+    )
@@ -0,0 +1,128 @@
+"""Exact heads-up hero statistics by enumerating every deal.
+
+A heads-up deal is a board plus two disjoint hole pairs, hero's and
+villain's.  Rather than walk those ~2.8e12 deals one by one:
+
+  - boards are reduced to suit-isomorphism classes (134,459 of them, see
+    cards.suit_isomorphism_classes), each weighted by the boards it stands for;
+  - on each board every one of the 1,081 live hole pairs is scored once, with
+    the shared-board evaluators (standard_holdem.evaluate_on_board,
+    worst_case_holdem.classify_worst_case_on_board);
+  - for a hero pair, the villain pairs below / level with it are counted by
+    bisecting the sorted scores of all live pairs and subtracting the pairs
+    that reuse one of hero's cards.
+
+Counts are exact integers; simulate(..., exact=True) turns them into the
+usual CSV/markdown rows.  Board classes are split into chunks over a process
+pool.
+"""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import comb
+from typing import List, Sequence, Tuple
+
+from cards import CARD_BIT, CARDS, NUM_CARDS, analyse_board, card_mask, cards_from_suit_masks, suit_isomorphism_classes
+from standard_holdem import evaluate_on_board
+from worst_case_holdem import classify_worst_case_on_board
+
+NUM_CATEGORIES = 10
+
+# Villain pairs disjoint from the board and from hero's pair.
+VILLAIN_PAIRS = comb(NUM_CARDS - 7, 2)
+TOTAL_DEALS = comb(NUM_CARDS, 5) * comb(NUM_CARDS - 5, 2) * VILLAIN_PAIRS
+
+HOLE_PAIRS = list(combinations(CARDS, 2))
+
+
+def count_boards(
+    board_classes: Sequence[Tuple[Tuple[int, int, int, int], int]], variant: str = "standard"
+) -> Tuple[List[int], List[int], List[int]]:
+    """Hero counts over the given (suit_masks, weight) board classes.
+
+    Returns per-category lists (indexed like HAND_TYPES /
+    WORST_CASE_HAND_TYPES) of deals, deals won or tied, and doubled equity
+    (2 per win, 1 per tie) so that every total stays an integer.
+    """
+
+    type_counts = [0] * NUM_CATEGORIES
+    win_counts = [0] * NUM_CATEGORIES
+    equity2_counts = [0] * NUM_CATEGORIES
+    standard = variant == "standard"
+
+    for suit_masks, weight in board_classes:
+        board = cards_from_suit_masks(suit_masks)
+        board_state = analyse_board(board)
+        board_bits = card_mask(board)
+
+        pairs = []  # (c0, c1, score, category)
+        by_card = [[] for _ in CARDS]
+        for c0, c1 in HOLE_PAIRS:
+            if (CARD_BIT[c0] | CARD_BIT[c1]) & board_bits:
+                continue
+            if standard:
+                score, category = evaluate_on_board(board_state, c0, c1)
+            else:
+                score = int(classify_worst_case_on_board(board_state, c0, c1))
+                category = score - 1
+            pairs.append((c0, c1, score, category))
+            by_card[c0].append(score)
+            by_card[c1].append(score)
+
+        all_scores = sorted(p[2] for p in pairs)
+        for scores in by_card:
+            scores.sort()
+
+        for c0, c1, score, category in pairs:
+            s0, s1 = by_card[c0], by_card[c1]
+            below0, below1 = bisect_left(s0, score), bisect_left(s1, score)
+            below = bisect_left(all_scores, score)
+            level = bisect_right(all_scores, score) - below
+            # Pairs sharing a card with hero's: those holding c0 or c1, with
+            # hero's own pair (level with itself) counted in both.
+            below -= below0 + below1
+            level -= (bisect_right(s0, score) - below0) + (bisect_right(s1, score) - below1) - 1
+
+            type_counts[category] += weight * VILLAIN_PAIRS
+            win_counts[category] += weight * (below + level)
+            equity2_counts[category] += weight * (2 * below + level)
+
+    return type_counts, win_counts, equity2_counts
+
+
+def enumerate_headsup(
+    variant: str = "standard", workers: int | None = None, chunks: int | None = None
+) -> Tuple[List[int], List[int], List[float]]:
+    """Exact hero (type_counts, win_counts, equity_sums) over all TOTAL_DEALS heads-up deals.
+
+    Same layout as numpy_engine.simulate_counts, with every deal counted once.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    chunks = chunks or workers * 8
+    board_classes = list(suit_isomorphism_classes(5))
+    bounds = [len(board_classes) * i // chunks for i in range(chunks + 1)]
+    parts = [board_classes[lo:hi] for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+    if workers == 1:
+        results = [count_boards(part, variant) for part in parts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(count_boards, parts, [variant] * len(parts)))
+
+    type_counts = [0] * NUM_CATEGORIES
+    win_counts = [0] * NUM_CATEGORIES
+    equity2_counts = [0] * NUM_CATEGORIES
+    for part_types, part_wins, part_equity2 in results:
+        for i in range(NUM_CATEGORIES):
+            type_counts[i] += part_types[i]
+            win_counts[i] += part_wins[i]
+            equity2_counts[i] += part_equity2[i]
+
+    assert sum(type_counts) == TOTAL_DEALS
+    # Halves of integers below 2**53 are exact as floats.
+    return type_counts, win_counts, [n / 2 for n in equity2_counts]
@@ -0,0 +1,253 @@
+"""Batched NumPy engine behind ``simulate(engine="numpy")``.
+
+Whole batches of deals are drawn as integer arrays (card ints, see cards.py)
+and every seat's 7-card hand is evaluated with array operations:
+
+  - standard: the same strengths as standard_holdem.evaluate_7card_strength,
+    built from "rank seen k times" masks and the 13-bit mask tables in
+    standard_holdem;
+  - worstcase: the highest WorstCaseHandType any 5-card subset reaches, decided
+    from 7-card rank and suit masks.
+
+Hero results come back as per-category count arrays so texas_holdem_sim can
+fold them into the same CSV/markdown tables as the pure Python path.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+import standard_holdem
+from cards import NUM_CARDS, RANK_PRIMES, RANKS
+
+NUM_CATEGORIES = 10
+
+_MASKS = 1 << 13
+_BIT_WEIGHTS = (1 << np.arange(13)).astype(np.int64)
+
+_POPCOUNT = np.array([bin(m).count("1") for m in range(_MASKS)], dtype=np.int64)
+# Mask with its highest bit cleared, and the rank prime of that bit (1 for 0).
+_CLEAR_TOP = np.array([m & ~(1 << (m.bit_length() - 1)) if m else 0 for m in range(_MASKS)], dtype=np.int64)
+_TOP_PRIME = np.array(
+    [RANK_PRIMES[RANKS[m.bit_length() - 1]] if m else 1 for m in range(_MASKS)], dtype=np.int64
+)
+
+_FLUSH7 = np.asarray(standard_holdem.FLUSH7_STRENGTH, dtype=np.int64)
+_STRAIGHT7 = np.asarray(standard_holdem.STRAIGHT7_STRENGTH, dtype=np.int64)
+_DISTINCT7 = np.asarray(standard_holdem.DISTINCT7_STRENGTH, dtype=np.int64)
+_PRODUCT_KEYS = np.array(sorted(standard_holdem.TABLES.product_strength), dtype=np.int64)
+_PRODUCT_VALUES = np.array([standard_holdem.TABLES.product_strength[k] for k in _PRODUCT_KEYS], dtype=np.int64)
+_CATEGORY = np.asarray(standard_holdem.TABLES.category_by_strength, dtype=np.int64)
+
+# Worst Case rank patterns, as 13-bit masks (bit 0 = deuce).
+_ROYAL = 0b11111 << 8                              # T J Q K A
+_GAPS = [0b101010101 << low for low in range(5)]   # r, r+2, ..., r+8
+_LOW = 0xFF                                        # ranks 2..9
+_SUIT_SUBSETS = [[s for s in range(4) if subset >> s & 1] for subset in range(1, 16)]
+
+
+def _rank_masks(ranks: np.ndarray, suits: np.ndarray):
+    """Masks over the last axis (the 7 cards) of rank offsets/suits.
+
+    Returns (m1, m2, m3, m4, suit_masks): mk has a bit for every rank seen at
+    least k times, suit_masks[s] has a bit for every rank held in suit s.
+    """
+
+    counts = (ranks[..., None] == np.arange(13)).sum(axis=-2)
+    m = [((counts >= k) * _BIT_WEIGHTS).sum(axis=-1) for k in (1, 2, 3, 4)]
+    bits = np.left_shift(1, ranks)
+    # Ranks within one suit are distinct, so a sum is the same as an OR.
+    suit_masks = [np.where(suits == s, bits, 0).sum(axis=-1) for s in range(4)]
+    return m[0], m[1], m[2], m[3], suit_masks
+
+
+def standard_strengths(ranks: np.ndarray, suits: np.ndarray) -> np.ndarray:
+    """Vectorised standard_holdem.evaluate_7card_strength."""
+
+    m1, m2, m3, m4, suit_masks = _rank_masks(ranks, suits)
+    top, clear = _TOP_PRIME, _CLEAR_TOP
+
+    # At most one suit can hold five of seven cards; other suits read 0.
+    flush = _FLUSH7[suit_masks[0]]
+    for s_mask in suit_masks[1:]:
+        flush = np.maximum(flush, _FLUSH7[s_mask])
+
+    trip_bit = m3 ^ clear[m3]
+    fh_pair = m2 & ~trip_bit
+    trip_kickers = m1 & ~trip_bit
+    second_pair = clear[m2]
+    pair_bits = (m2 ^ second_pair) | (second_pair ^ clear[second_pair])
+    singles = m1 & ~m2
+
+    is_full_house = (m3 != 0) & (fh_pair != 0)
+    is_two_pair = second_pair != 0
+    product = np.select(
+        [m4 != 0, is_full_house, m3 != 0, is_two_pair, m2 != 0],
+        [
+            top[m4] ** 4 * top[m1 & ~(m4 ^ clear[m4])],
+            top[m3] ** 3 * top[fh_pair] ** 2,
+            top[m3] ** 3 * top[trip_kickers] * top[clear[trip_kickers]],
+            top[m2] ** 2 * top[second_pair] ** 2 * top[m1 & ~pair_bits],
+            top[m2] ** 2 * top[singles] * top[clear[singles]] * top[clear[clear[singles]]],
+        ],
+        default=1,
+    )
+    idx = np.minimum(np.searchsorted(_PRODUCT_KEYS, product), len(_PRODUCT_KEYS) - 1)
+    paired = _PRODUCT_VALUES[idx]
+    straight = _STRAIGHT7[m1]
+
+    return np.select(
+        [flush > 0, m4 != 0, is_full_house, straight > 0, m2 != 0],
+        [flush, paired, paired, straight, paired],
+        default=_DISTINCT7[m1],
+    )
+
+
+def worst_case_categories(ranks: np.ndarray, suits: np.ndarray) -> np.ndarray:
+    """Highest WorstCaseHandType (as value - 1, i.e. 0..9) over the 5-card subsets."""
+
+    m1, m2, m3, _, suit_masks = _rank_masks(ranks, suits)
+    pop = _POPCOUNT
+    suit_counts = [pop[s_mask] for s_mask in suit_masks]
+
+    royal_flush = np.zeros(m1.shape, dtype=bool)
+    color_clash = np.zeros(m1.shape, dtype=bool)
+    faux_flush = np.zeros(m1.shape, dtype=bool)
+    for s in range(4):
+        others = 0
+        for t in range(4):
+            if t != s:
+                others = others | suit_masks[t]
+        royal_flush |= suit_masks[s] & _ROYAL == _ROYAL
+        four_plus = suit_counts[s] >= 4
+        # Four of suit s plus an off-suit card pairing one of them.
+        color_clash |= four_plus & (others & suit_masks[s] != 0)
+        faux_flush |= four_plus & (suit_counts[s] < 7)
+
+    gap = np.zeros(m1.shape, dtype=bool)
+    for gap_mask in _GAPS:
+        gap |= m1 & gap_mask == gap_mask
+
+    # Five distinct low ranks covering all four suits: at least five low
+    # ranks, and (Hall's condition) every set of k suits holds k low ranks.
+    color_disassociate = pop[m1 & _LOW] >= 5
+    for subset in _SUIT_SUBSETS:
+        covered = 0
+        for s in subset:
+            covered = covered | (suit_masks[s] & _LOW)
+        color_disassociate &= pop[covered] >= len(subset)
+
+    distinct = pop[m1]
+    return np.select(
+        [
+            royal_flush,
+            m1 & _ROYAL == _ROYAL,
+            color_clash,
+            (m3 != 0) & (distinct >= 3),
+            gap,
+            color_disassociate,
+            (pop[m2] >= 2) & (distinct >= 3),
+            faux_flush,
+            (m2 & _LOW != 0) & (distinct >= 4),
+        ],
+        [9, 8, 7, 6, 5, 4, 3, 2, 1],
+        default=0,
+    )
+
+
+def deal_batch(
+    rng: np.random.Generator, batch_size: int, num_players: int, hero: Sequence[int] | None = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Shuffle batch_size decks; return ranks and suits of every seat's 7 cards.
+
+    Both arrays have shape (batch_size, num_players, 7): two hole cards
+    followed by the five shared community cards.  If hero is given, seat 0
+    holds those two cards in every deal and only the rest are shuffled.
+    """
+
+    n_hole = 2 * num_players
+    if hero is None:
+        decks = rng.permuted(np.tile(np.arange(NUM_CARDS), (batch_size, 1)), axis=1)[:, : n_hole + 5]
+    else:
+        rest = np.setdiff1d(np.arange(NUM_CARDS), hero)
+        drawn = rng.permuted(np.tile(rest, (batch_size, 1)), axis=1)[:, : n_hole + 3]
+        decks = np.concatenate([np.tile(np.asarray(hero), (batch_size, 1)), drawn], axis=1)
+    hole = decks[:, :n_hole].reshape(batch_size, num_players, 2)
+    board = np.broadcast_to(decks[:, None, n_hole:], (batch_size, num_players, 5))
+    seven = np.concatenate([hole, board], axis=2)
+    return seven >> 2, seven & 3
+
+
+def simulate_counts(
+    num_players: int,
+    num_trials: int,
+    variant: str = "standard",
+    batch_size: int = 10000,
+    rng: np.random.Generator | None = None,
+    hero: Sequence[int] | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate num_trials deals in batches (hero's hole cards fixed if given).
+
+    Returns per-category arrays (length 10, indexed like HAND_TYPES /
+    WORST_CASE_HAND_TYPES) of hero hand counts, pure win counts and equity
+    sums (split pots count fractionally).
+    """
+
+    return simulate_prefix_counts([num_players], num_trials, variant, batch_size, rng, hero)[num_players]
+
+
+def simulate_prefix_counts(
+    num_players_list: Sequence[int],
+    num_trials: int,
+    variant: str = "standard",
+    batch_size: int = 10000,
+    rng: np.random.Generator | None = None,
+    hero: Sequence[int] | None = None,
+) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """simulate_counts for several player counts from the same deals.
+
+    Each deal seats max(num_players_list) players; the N-player result uses
+    the board and seats 0..N-1 of it (hero's hole cards fixed if given).
+    Returns {N: (type_counts, win_counts, equity_sums)}.
+    """
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    wanted = sorted(set(num_players_list))
+    counts = {
+        n: (
+            np.zeros(NUM_CATEGORIES, dtype=np.int64),
+            np.zeros(NUM_CATEGORIES, dtype=np.int64),
+            np.zeros(NUM_CATEGORIES, dtype=np.float64),
+        )
+        for n in wanted
+    }
+
+    done = 0
+    while done < num_trials:
+        size = min(batch_size, num_trials - done)
+        ranks, suits = deal_batch(rng, size, wanted[-1], hero)
+
+        if variant == "standard":
+            scores = standard_strengths(ranks, suits)
+            categories = _CATEGORY[scores]
+        else:
+            scores = categories = worst_case_categories(ranks, suits)
+
+        hero_category = categories[:, 0]
+        hero_type_counts = np.bincount(hero_category, minlength=NUM_CATEGORIES)
+        for n in wanted:
+            type_counts, win_counts, equity_sums = counts[n]
+            on_top = scores[:, :n] == scores[:, :n].max(axis=1, keepdims=True)
+            hero_wins = on_top[:, 0]
+            hero_equity = hero_wins / on_top.sum(axis=1)
+
+            type_counts += hero_type_counts
+            win_counts += np.bincount(hero_category[hero_wins], minlength=NUM_CATEGORIES)
+            equity_sums += np.bincount(hero_category, weights=hero_equity, minlength=NUM_CATEGORIES)
+        done += size
+
+    return counts
@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from preflop_equity import MAX_OPPONENTS, load_preflop_table
+from worst_case_holdem import WorstCaseHandType, enumerate_worst_case_frequencies
+
 # Toggle this to add/remove trendlines on all line plots
 ADD_TRENDLINES = True
 
@@ -376,17 +379,12 @@ worst_fivecard_hand_types = [
     "Low Card",
 ]
 
+# Exact counts under the current rules in worst_case_holdem.py (one
+# representative per suit-isomorphism class, a few seconds).
+worst_fivecard_freqs = enumerate_worst_case_frequencies()
 worst_fivecard_combos = [
-    4,        # Perfect Misdeal
-    1020,     # Dead Royal
-    34320,    # Color Clash
-    54912,    # Almost Full House
-    5120,     # Gap
-    13440,    # Color Disassociate
-    123552,   # Mirror Hand
-    76860,    # Faux Flush
-    654720,   # Broken Pair
-    1635012,  # Low Card
+    worst_fivecard_freqs[WorstCaseHandType[name.upper().replace(" ", "_")]]
+    for name in worst_fivecard_hand_types
 ]
 
 worst_fivecard_probs_percent = [
@@ -453,5 +451,31 @@ for i, n_players in enumerate(players):
     fig.tight_layout(rect=[0, 0.03, 1, 0.95])
     fig.savefig(f"per_player_{n_players}_pwin_given_hand_bars.png", dpi=150, bbox_inches="tight")
 
+# ----------------------------------------------------------------
+# 10. Preflop equity vs players for a few starting hands
+#     (from the cached table; build it with `preflop_equity.py build`)
+# ----------------------------------------------------------------
+PREFLOP_HANDS = ["AA", "KK", "AKs", "AKo", "JTs", "77", "T9o", "72o"]
+
+preflop_table = load_preflop_table()
+if preflop_table is not None and not preflop_table.missing_cells():
+    fig10, (ax10_w, ax10_s) = plt.subplots(1, 2, figsize=(14, 5), sharey=True)
+    preflop_players = [n + 1 for n in range(1, MAX_OPPONENTS + 1)]
+    for ax, variant, title in ((ax10_w, "worstcase", "Worst Case"), (ax10_s, "standard", "Standard")):
+        for hand in PREFLOP_HANDS:
+            y = [preflop_table.lookup(hand, n - 1, variant) * 100 for n in preflop_players]
+            ax.plot(preflop_players, y, marker="o", label=hand)
+        ax.set_title(f"{title} – Preflop Equity by Starting Hand")
+        ax.set_xlabel("Number of Players")
+        ax.set_xticks(preflop_players)
+        ax.grid(True, linestyle="--", alpha=0.5)
+    ax10_w.set_ylabel("Hero equity (%)")
+    ax10_s.legend(fontsize=8, ncol=2)
+    fig10.suptitle(f"Preflop Equity ({preflop_table.trials:,} deals per starting hand)", fontsize=12)
+    fig10.tight_layout(rect=[0, 0.03, 1, 0.95])
+    fig10.savefig("preflop_equity_vs_players.png", dpi=150, bbox_inches="tight")
+else:
+    print("No complete preflop equity table; run `python preflop_equity.py build` for the preflop plot.")
+
 # Show all figures interactively
 plt.show()
@@ -0,0 +1,243 @@
+"""Cached preflop equity of every starting hand against 1-8 random opponents.
+
+For each variant ("standard", "worstcase") and each of the 169 starting-hand
+classes (cards.STARTING_HAND_CLASSES), hero's equity (share of the pot, split
+pots counted fractionally) is estimated at tables of 2..9 players from one
+seat-prefix run with hero's cards fixed (texas_holdem_sim).  Cells are built
+in a process pool and the table file is rewritten after every finished cell,
+so an interrupted build resumes where it stopped.
+
+File layout (little-endian): a 40-byte header (magic, digest of the code
+behind the cells, trials per cell, signed 64-bit seed), then per (variant, class) the
+trials actually run as uint32 (0 = not built yet), then the equities as
+float32 indexed [variant][class][opponents - 1].
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from cards import RANK_CHARS, STARTING_HAND_CLASSES, STARTING_HAND_INDEX
+from dealing import Dealer
+from texas_holdem_sim import shard_seed, simulate_prefix_tallies_numpy, simulate_prefix_tallies_python, tally_from_counts
+
+VARIANTS = ("standard", "worstcase")
+MAX_OPPONENTS = 8
+NUM_CLASSES = len(STARTING_HAND_CLASSES)
+NUM_CELLS = len(VARIANTS) * NUM_CLASSES
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "preflop_equity.bin")
+_TABLE_MAGIC = b"PFQ2"
+_HEADER = struct.Struct("<4s20sQq")  # 40 bytes
+SEED_RANGE = range(-(2**63), 2**63)
+
+# Read as files so that building with the python engine never imports numpy.
+_RULES_MODULES = ("cards.py", "dealing.py", "standard_holdem.py", "worst_case_holdem.py", "numpy_engine.py")
+
+
+def rules_stamp() -> bytes:
+    """Digest of the code the cells come from; a change there makes the table stale.
+
+    Covers the evaluator, card and dealing modules whole (numpy_engine too,
+    for --engine numpy) and the source of the simulator functions
+    compute_cell runs.
+    """
+
+    digest = hashlib.sha1()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _RULES_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    for code in (shard_seed, simulate_prefix_tallies_python, simulate_prefix_tallies_numpy, tally_from_counts, compute_cell):
+        digest.update(inspect.getsource(code).encode("utf-8"))
+    return digest.digest()
+
+
+def hand_class_index(hand: str) -> int:
+    """Index into STARTING_HAND_CLASSES of a label like "AKs", "ak s", "KAo" or "TT"."""
+
+    text = hand.replace(" ", "").upper()
+    if len(text) == 3 and text[2] in "SO":
+        ranks, kind = text[:2], text[2].lower()
+    else:
+        ranks, kind = text, ""
+    if len(ranks) != 2 or any(r not in RANK_CHARS for r in ranks):
+        raise ValueError(f"not a starting hand: {hand!r}")
+    hi, lo = sorted(ranks, key=RANK_CHARS.index, reverse=True)
+    label = hi + lo + ("" if hi == lo else kind)
+    if label not in STARTING_HAND_INDEX:
+        raise ValueError(f"not a starting hand: {hand!r} (suited 's' or offsuit 'o' required)")
+    return STARTING_HAND_INDEX[label]
+
+
+class PreflopEquityTable:
+    """Preflop equities as loaded from (or being built into) the table file."""
+
+    def __init__(self, trials: int, seed: int, cell_trials: array | None = None, equity: array | None = None):
+        self.trials = trials
+        self.seed = seed
+        self.cell_trials = cell_trials if cell_trials is not None else array("I", [0]) * NUM_CELLS
+        self.equity = equity if equity is not None else array("f", [0.0]) * (NUM_CELLS * MAX_OPPONENTS)
+
+    def missing_cells(self) -> List[Tuple[str, int]]:
+        """(variant, class index) of every cell not built yet."""
+
+        return [
+            (variant, i)
+            for v, variant in enumerate(VARIANTS)
+            for i in range(NUM_CLASSES)
+            if not self.cell_trials[v * NUM_CLASSES + i]
+        ]
+
+    def store(self, variant: str, class_index: int, trials: int, equities: List[float]) -> None:
+        cell = VARIANTS.index(variant) * NUM_CLASSES + class_index
+        self.cell_trials[cell] = trials
+        self.equity[cell * MAX_OPPONENTS : (cell + 1) * MAX_OPPONENTS] = array("f", equities)
+
+    def lookup(self, hand: str, opponents: int, variant: str = "standard") -> float:
+        """Hero's equity (0..1) with hand against opponents random hands."""
+
+        if not 1 <= opponents <= MAX_OPPONENTS:
+            raise ValueError(f"opponents must be between 1 and {MAX_OPPONENTS}")
+        cell = VARIANTS.index(variant) * NUM_CLASSES + hand_class_index(hand)
+        if not self.cell_trials[cell]:
+            raise LookupError(f"{hand} ({variant}) is not built yet; run preflop_equity.py build")
+        return self.equity[cell * MAX_OPPONENTS + opponents - 1]
+
+
+def save_preflop_table(table: PreflopEquityTable, path: str = TABLE_PATH) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_TABLE_MAGIC, rules_stamp(), table.trials, table.seed))
+        table.cell_trials.tofile(f)
+        table.equity.tofile(f)
+    os.replace(tmp_path, path)
+
+
+def load_preflop_table(path: str = TABLE_PATH) -> PreflopEquityTable | None:
+    """Read a table written by save_preflop_table; None if missing or stale."""
+
+    try:
+        with open(path, "rb") as f:
+            magic, stamp, trials, seed = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _TABLE_MAGIC or stamp != rules_stamp():
+                return None
+            cell_trials = array("I")
+            cell_trials.fromfile(f, NUM_CELLS)
+            equity = array("f")
+            equity.fromfile(f, NUM_CELLS * MAX_OPPONENTS)
+    except (OSError, EOFError, struct.error):
+        return None
+    return PreflopEquityTable(trials, seed, cell_trials, equity)
+
+
+def compute_cell(variant: str, class_index: int, trials: int, seed: int, engine: str = "python") -> List[float]:
+    """Equity of one starting hand against 1..MAX_OPPONENTS opponents, from one seat-prefix run."""
+
+    hero = STARTING_HAND_CLASSES[class_index].cards
+    players = list(range(2, MAX_OPPONENTS + 2))
+    cell_seed = shard_seed(seed, f"preflop:{variant}:{STARTING_HAND_CLASSES[class_index].label}", 0)
+    if engine == "numpy":
+        import numpy as np
+
+        tallies = simulate_prefix_tallies_numpy(players, trials, variant, rng=np.random.default_rng(cell_seed), hero=hero)
+    else:
+        tallies = simulate_prefix_tallies_python(players, trials, variant, dealer=Dealer("mt", cell_seed), hero=hero)
+    return [tallies[n].hero_overall_equity_wins / trials for n in players]
+
+
+def build_preflop_table(
+    trials: int = 20000,
+    workers: int | None = None,
+    seed: int = 0,
+    engine: str = "python",
+    path: str = TABLE_PATH,
+) -> PreflopEquityTable:
+    """Fill in every missing cell of the table at path, saving after each one.
+
+    An existing table built with the same trials and seed is resumed; any
+    other one is started over.  seed must fit in a signed 64-bit int (it is
+    stored in the file header).
+    """
+
+    if seed not in SEED_RANGE:
+        raise ValueError(f"seed must be between {SEED_RANGE.start} and {SEED_RANGE.stop - 1}")
+    table = load_preflop_table(path)
+    if table is None or table.trials != trials or table.seed != seed:
+        table = PreflopEquityTable(trials, seed)
+    missing = table.missing_cells()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for n, (variant, i) in enumerate(missing, 1):
+            table.store(variant, i, trials, compute_cell(variant, i, trials, seed, engine))
+            save_preflop_table(table, path)
+            print(f"\r{n}/{len(missing)} cells", end="", file=sys.stderr)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(compute_cell, variant, i, trials, seed, engine): (variant, i) for variant, i in missing
+            }
+            for n, future in enumerate(as_completed(futures), 1):
+                variant, i = futures[future]
+                table.store(variant, i, trials, future.result())
+                save_preflop_table(table, path)
+                print(f"\r{n}/{len(missing)} cells", end="", file=sys.stderr)
+    if missing:
+        print(file=sys.stderr)
+    return table
+
+
+_loaded: Dict[str, PreflopEquityTable] = {}
+
+
+def preflop_equity(hand: str, opponents: int, variant: str = "standard", path: str = TABLE_PATH) -> float:
+    """Hero's equity with hand (e.g. "AKs") against opponents random hands, from the cached table."""
+
+    if path not in _loaded:
+        table = load_preflop_table(path)
+        if table is None:
+            raise LookupError(f"no up-to-date preflop table at {path}; run preflop_equity.py build")
+        _loaded[path] = table
+    return _loaded[path].lookup(hand, opponents, variant)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or query the cached preflop equity table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build (or resume building) the table")
+    build.add_argument("-t", "--trials", type=int, default=20000, help="Deals per starting hand (default: 20000)")
+    build.add_argument("-w", "--workers", type=int, default=None, help="Worker processes (default: number of CPUs)")
+    build.add_argument("--seed", type=int, default=0, help="Base seed (default: 0)")
+    build.add_argument("--engine", choices=["python", "numpy"], default="python", help="Simulation engine")
+
+    query = sub.add_parser("query", help="Look up equities")
+    query.add_argument("hands", nargs="+", help="Starting hands, e.g. AA AKs T9o")
+    query.add_argument(
+        "-o", "--opponents", type=int, nargs="+", default=list(range(1, MAX_OPPONENTS + 1)),
+        help="Opponent counts (default: 1..8)",
+    )
+    query.add_argument("--variant", choices=VARIANTS, default="standard")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.seed not in SEED_RANGE:
+            parser.error(f"--seed must be between {SEED_RANGE.start} and {SEED_RANGE.stop - 1}")
+        table = build_preflop_table(args.trials, args.workers, args.seed, args.engine)
+        print(f"Preflop equity table written to {TABLE_PATH}")
+    else:
+        print("hand  " + " ".join(f"{n:>6}" for n in args.opponents))
+        for hand in args.hands:
+            row = [preflop_equity(hand, n, args.variant) for n in args.opponents]
+            print(f"{hand:<5} " + " ".join(f"{e * 100:5.1f}%" for e in row))
@@ -0,0 +1,212 @@
+"""Opt-in per-stage profile of the Python simulation loop (simulate(..., profile=True)).
+
+profile_tally_python is simulate_tally_python's loop with stage timers added;
+simulate() picks it once per shard when profiling, so the normal loop carries
+no instrumentation.  test_profiling.py checks that both loops give the same
+tallies.  One trial in every `sample_every` reads time.perf_counter_ns()
+around each stage of the trial:
+
+  - deal:     drawing the hole cards and board (dealing.Dealer);
+  - board:    slicing out the board and analysing it once (cards.analyse_board);
+  - evaluate: scoring every seat's 7 cards against the analysed board;
+  - winners:  finding the top score and who holds it;
+  - tally:    the Counter and equity updates.
+
+The other trials run the same body without reading the clock.  Either way the
+tallies are exactly those of an unprofiled run.  Shard wall time not covered
+by the scaled stage estimates is reported as "other" (loop overhead, timer
+reads).  In Worst Case runs the seats of sampled trials are also classified
+again through worst_case_holdem.trace_worst_case_seven, outside the timers,
+to count how often each rule of the 7-card ladder is tried and fires.
+
+With profiling off none of this code runs.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List
+
+from cards import analyse_board
+from dealing import Dealer
+from standard_holdem import HAND_TYPES, evaluate_on_board
+from worst_case_holdem import classify_worst_case_on_board, trace_worst_case_seven
+
+STAGES = ("deal", "board", "evaluate", "winners", "tally")
+SAMPLE_EVERY = 64
+
+
+@dataclass
+class HotPathProfile:
+    """Sampled stage timings and rule counts, mergeable across shards."""
+
+    trials: int = 0
+    sampled_trials: int = 0
+    wall_ns: int = 0
+    stage_ns: Counter = field(default_factory=Counter)
+    stage_calls: Counter = field(default_factory=Counter)  # seats for "evaluate", trials otherwise
+    rule_tested: Counter = field(default_factory=Counter)
+    rule_fired: Counter = field(default_factory=Counter)
+    sample_every: int = SAMPLE_EVERY
+    untimed_ns: int = 0  # time spent tracing rules, kept out of wall_ns
+
+    def add_sample(self, t0: int, t1: int, t2: int, t3: int, t4: int, t5: int) -> None:
+        """Record one timed trial from its stage boundary clock readings."""
+
+        stage_ns = self.stage_ns
+        stage_ns["deal"] += t1 - t0
+        stage_ns["board"] += t2 - t1
+        stage_ns["evaluate"] += t3 - t2
+        stage_ns["winners"] += t4 - t3
+        stage_ns["tally"] += t5 - t4
+        self.sampled_trials += 1
+
+    def trace_rules(self, deck, num_players: int, scores) -> None:
+        """Count the Worst Case rules tried and fired for every seat of a sampled deal."""
+
+        start = time.perf_counter_ns()
+        board_cards = deck[2 * num_players : 2 * num_players + 5]
+        for i in range(num_players):
+            wc_type, checks = trace_worst_case_seven(deck[2 * i : 2 * i + 2] + board_cards)
+            assert int(wc_type) == scores[i], "trace_worst_case_seven disagrees with the deal's score"
+            self.rule_tested.update(checks)
+            self.rule_fired[checks[-1]] += 1
+        self.untimed_ns += time.perf_counter_ns() - start
+
+    def merge(self, other: "HotPathProfile") -> None:
+        self.trials += other.trials
+        self.sampled_trials += other.sampled_trials
+        self.wall_ns += other.wall_ns
+        self.stage_ns.update(other.stage_ns)
+        self.stage_calls.update(other.stage_calls)
+        self.rule_tested.update(other.rule_tested)
+        self.rule_fired.update(other.rule_fired)
+        self.untimed_ns += other.untimed_ns
+
+    def estimated_ns(self) -> dict:
+        """Estimated time per stage over every trial, plus "other" for the rest of the wall time."""
+
+        scale = self.trials / self.sampled_trials if self.sampled_trials else 0.0
+        estimates = {stage: self.stage_ns[stage] * scale for stage in STAGES}
+        estimates["other"] = max(0.0, self.wall_ns - sum(estimates.values()))
+        return estimates
+
+    def breakdown_table(self) -> str:
+        estimates = self.estimated_ns()
+        total = sum(estimates.values()) or 1.0
+        lines = [
+            f"Hot-path profile: {self.trials:,} trials, {self.sampled_trials:,} timed "
+            f"(wall {self.wall_ns / 1e9:.2f}s in shards)",
+            "",
+            f"{'stage':<10} {'est. time':>10} {'share':>7} {'sampled calls':>14} {'ns/call':>9}",
+        ]
+        for stage, ns in estimates.items():
+            calls = self.stage_calls[stage]
+            per_call = f"{self.stage_ns[stage] / calls:,.0f}" if calls else "-"
+            lines.append(
+                f"{stage:<10} {ns / 1e9:>9.2f}s {ns / total * 100:>6.1f}% {calls if calls else '-':>14} {per_call:>9}"
+            )
+        if self.rule_tested:
+            lines += ["", f"{'rule':<20} {'tried':>10} {'fired':>10} {'fire rate':>10}"]
+            for rule, tried in self.rule_tested.items():
+                fired = self.rule_fired[rule]
+                lines.append(f"{rule:<20} {tried:>10,} {fired:>10,} {fired / tried * 100:>9.2f}%")
+        return "\n".join(lines)
+
+    def collapsed_stacks(self, variant: str) -> List[str]:
+        """Folded stacks ("frame;frame weight", weights in microseconds) for flamegraph tools."""
+
+        evaluator = "evaluate_on_board" if variant == "standard" else "classify_worst_case_on_board"
+        frames = {
+            "deal": "simulate;deal;Dealer.deal",
+            "board": "simulate;board;analyse_board",
+            "evaluate": f"simulate;evaluate;{evaluator}",
+            "winners": "simulate;winners",
+            "tally": "simulate;tally",
+            "other": "simulate;other",
+        }
+        return [f"{frames[stage]} {round(ns / 1000)}" for stage, ns in self.estimated_ns().items() if ns >= 500]
+
+
+def profile_tally_python(num_players, num_trials, variant="standard", dealer=None, hero=None,
+                         sample_every=SAMPLE_EVERY):
+    """simulate_tally_python with sampled stage timers; returns (HeroTally, HotPathProfile).
+
+    The loop body is simulate_tally_python's, statement for statement, with
+    clock reads between the stages; keep the two in step.
+    """
+
+    from texas_holdem_sim import WORST_CASE_HAND_TYPES, HeroTally
+
+    if dealer is None:
+        dealer = Dealer()
+    clock = time.perf_counter_ns
+    profile = HotPathProfile(trials=num_trials, sample_every=sample_every)
+
+    tally = HeroTally()
+    hero_type_counts = tally.hero_type_counts
+    hero_type_win_counts = tally.hero_type_win_counts
+    hero_type_equity_win_counts = tally.hero_type_equity_win_counts
+    hero_overall_equity_wins = 0.0
+
+    n_hole = 2 * num_players
+    num_cards = n_hole + 5
+
+    start = clock()
+    for trial in range(num_trials):
+        sampled = trial % sample_every == sample_every - 1  # skip trial 0 and its warm-up costs
+        if sampled:
+            t0 = clock()
+        deck = dealer.deal(num_cards) if hero is None else dealer.deal_with(hero, num_cards)
+        if sampled:
+            t1 = clock()
+        board = analyse_board(deck[n_hole:num_cards])
+        if sampled:
+            t2 = clock()
+
+        scores = []
+        type_infos = []
+        for i in range(num_players):
+            if variant == "standard":
+                score, type_idx = evaluate_on_board(board, deck[2 * i], deck[2 * i + 1])
+                scores.append(score)
+                type_infos.append(type_idx)
+            else:
+                wc_type = classify_worst_case_on_board(board, deck[2 * i], deck[2 * i + 1])
+                scores.append(int(wc_type))
+                type_infos.append(wc_type)
+        if sampled:
+            t3 = clock()
+
+        best_score = max(scores)
+        winners = [i for i, s in enumerate(scores) if s == best_score]
+        if sampled:
+            t4 = clock()
+
+        if variant == "standard":
+            hero_type = HAND_TYPES[type_infos[0]]
+        else:
+            hero_type = WORST_CASE_HAND_TYPES[int(type_infos[0]) - 1]
+
+        hero_type_counts[hero_type] += 1
+        hero_equity = 0.0
+        if 0 in winners:
+            hero_equity = 1.0 / len(winners)
+        if hero_equity > 0:
+            hero_type_equity_win_counts[hero_type] += hero_equity
+        if 0 in winners:
+            hero_type_win_counts[hero_type] += 1
+        hero_overall_equity_wins += hero_equity
+        if sampled:
+            profile.add_sample(t0, t1, t2, t3, t4, clock())
+            if variant != "standard":
+                profile.trace_rules(deck, num_players, scores)
+    profile.wall_ns = clock() - start - profile.untimed_ns
+
+    for stage in STAGES:
+        profile.stage_calls[stage] = profile.sampled_trials * (num_players if stage == "evaluate" else 1)
+    tally.trials = num_trials
+    tally.hero_overall_equity_wins = hero_overall_equity_wins
+    return tally, profile
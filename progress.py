@@ -0,0 +1,102 @@
+"""Progress and throughput reports for long simulate() runs.
+
+ProgressReporter is fed by simulate_tallies in the parent process, once per
+finished shard (SHARD_SIZE deals), never per deal, so the cost of reporting is
+a few dict updates per shard plus one line every `interval` seconds.  Each
+report gives:
+
+  - deals done out of those planned so far, deals/s and hands/s since the
+    start (a hand is one seat scored: deals times table size, an upper bound
+    in seat-prefix mode, where scoring stops once hero is beaten);
+  - an ETA for the planned deals (adaptive runs plan one round at a time);
+  - hero's running overall win probability per player count.
+
+Reports are written as one line each to a text stream (stderr by default) and,
+optionally, appended as JSON objects to a JSON-lines metrics file.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from typing import Dict, TextIO
+
+
+class ProgressReporter:
+    """Throttled progress lines (and JSON-lines records) from shard completions."""
+
+    def __init__(self, interval: float = 5.0, stream: TextIO | None = sys.stderr, metrics_path: str | None = None):
+        self.interval = interval
+        self.stream = stream
+        self.metrics_file = open(metrics_path, "a", encoding="utf-8") if metrics_path else None
+        self.start_time = time.monotonic()
+        self._last_report = self.start_time
+        self.planned_deals = 0
+        self.deals = 0
+        self.hands = 0
+        self.trials: Dict[int, float] = {}       # per player count, weighted like the merged tallies
+        self.equity_wins: Dict[int, float] = {}
+
+    def plan(self, num_deals: int) -> None:
+        """Add deals about to be run to the planned total."""
+
+        self.planned_deals += num_deals
+
+    def restore(self, tallies) -> None:
+        """Count tallies that were not run here (e.g. loaded from a checkpoint) in the estimates only."""
+
+        for num_players, tally in tallies.items():
+            self.trials[num_players] = self.trials.get(num_players, 0) + tally.trials
+            self.equity_wins[num_players] = self.equity_wins.get(num_players, 0.0) + tally.hero_overall_equity_wins
+
+    def shard_done(self, shard_tallies, num_deals: int, seats: int, weight: float | None = None) -> None:
+        """Record one finished shard of num_deals deals at seats-player tables; report if due."""
+
+        self.deals += num_deals
+        self.hands += num_deals * seats
+        self.restore(shard_tallies if weight is None else {n: t.scaled(weight) for n, t in shard_tallies.items()})
+        if time.monotonic() - self._last_report >= self.interval:
+            self.report()
+
+    def snapshot(self) -> dict:
+        elapsed = time.monotonic() - self.start_time
+        deal_rate = self.deals / elapsed if elapsed > 0 else 0.0
+        remaining = self.planned_deals - self.deals
+        return {
+            "elapsed": round(elapsed, 3),
+            "deals": self.deals,
+            "planned_deals": self.planned_deals,
+            "deals_per_sec": round(deal_rate, 1),
+            "hands_per_sec": round(self.hands / elapsed, 1) if elapsed > 0 else 0.0,
+            "eta": round(remaining / deal_rate, 1) if deal_rate > 0 else None,
+            "hero_win": {
+                str(n): self.equity_wins[n] / self.trials[n] for n in sorted(self.trials) if self.trials[n]
+            },
+        }
+
+    def report(self, final: bool = False) -> None:
+        record = self.snapshot()
+        self._last_report = time.monotonic()
+        if self.stream is not None:
+            eta = "done" if final else ("?" if record["eta"] is None else f"{record['eta']:.0f}s")
+            estimates = " ".join(f"N={n}:{p * 100:.2f}%" for n, p in record["hero_win"].items())
+            print(
+                f"[{record['elapsed']:7.1f}s] {record['deals']:,}/{record['planned_deals']:,} deals  "
+                f"{record['deals_per_sec']:,.0f} deals/s  {record['hands_per_sec']:,.0f} hands/s  "
+                f"ETA {eta}  | {estimates}",
+                file=self.stream,
+                flush=True,
+            )
+        if self.metrics_file is not None:
+            record["final"] = final
+            self.metrics_file.write(json.dumps(record) + "\n")
+            self.metrics_file.flush()
+
+    def close(self) -> None:
+        """Write a final report and close the metrics file."""
+
+        self.report(final=True)
+        if self.metrics_file is not None:
+            self.metrics_file.close()
+            self.metrics_file = None
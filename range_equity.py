@@ -0,0 +1,207 @@
+"""Equity of seats holding weighted hole-card ranges, under either variant.
+
+A range is a list of (c0, c1, weight) combos, written as comma-separated items
+(see parse_range): "AA", "AKs", "AKo", "AK" (both), "TT+", "ATs+", "A5o+",
+explicit combos like "AsKd", each optionally ":weight"; "random" is all 1,326
+combos.  The target distribution of a deal gives seat hands a probability
+proportional to the product of their weights, over hands that share no card.
+
+Rejection sampling (draw every seat from its range, retry on a clash) gets
+very slow once ranges are narrow and overlap.  Instead seats are drawn in
+turn, each from the combos of its range still live given the cards already
+out, and the deal is weighted by the product of those live masses (divided by
+each range's full mass).  That is sequential importance sampling: every draw
+succeeds, and the weighted averages are unbiased for the target above.  Seats
+with a random range are dealt last, straight from the remaining deck, since
+their live mass is the same on every deal.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate, combinations
+from typing import List, Sequence, Tuple
+
+from cards import CARD_BIT, CARDS, RANK_CHARS, analyse_board, parse_cards
+from standard_holdem import evaluate_on_board
+from worst_case_holdem import classify_worst_case_on_board
+
+Combo = Tuple[int, int, float]
+
+ALL_COMBOS: List[Combo] = [(c0, c1, 1.0) for c0, c1 in combinations(CARDS, 2)]
+
+
+def _class_combos(hi: int, lo: int, kind: str) -> List[Tuple[int, int]]:
+    """Hole pairs of ranks hi >= lo (rank offsets); kind "s", "o" or "" for both."""
+
+    pairs = []
+    for s0 in range(4):
+        for s1 in range(4):
+            c0, c1 = (hi << 2) | s0, (lo << 2) | s1
+            if hi == lo and s1 <= s0:
+                continue
+            if hi != lo and (kind == "s" and s0 != s1 or kind == "o" and s0 == s1):
+                continue
+            pairs.append((c0, c1))
+    return pairs
+
+
+def _item_combos(item: str) -> List[Tuple[int, int]]:
+    if len(item) == 4 and item[1].lower() in "cdhs":
+        c0, c1 = parse_cards(item)
+        if c0 == c1:
+            raise ValueError(f"combo repeats a card: {item!r}")
+        return [(c0, c1)]
+
+    plus = item.endswith("+")
+    body = item[:-1] if plus else item
+    kind = body[2:].lower()
+    if len(body) not in (2, 3) or kind not in ("", "s", "o") or any(r not in RANK_CHARS for r in body[:2].upper()):
+        raise ValueError(f"not a range item: {item!r}")
+    hi, lo = sorted((RANK_CHARS.index(r) for r in body[:2].upper()), reverse=True)
+    if hi == lo:
+        if kind:
+            raise ValueError(f"pairs are neither suited nor offsuit: {item!r}")
+        tops = range(hi, len(RANK_CHARS)) if plus else [hi]
+        return [pair for rank in tops for pair in _class_combos(rank, rank, "")]
+    kickers = range(lo, hi) if plus else [lo]
+    return [pair for kicker in kickers for pair in _class_combos(hi, kicker, kind)]
+
+
+def parse_range(text: str) -> List[Combo]:
+    """Weighted combos of a range string such as "QQ+,AKs,AJs:0.5" or "random".
+
+    A combo listed twice keeps its last weight.
+    """
+
+    if text.strip().lower() in ("random", "*"):
+        return list(ALL_COMBOS)
+    weights = {}
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, weight = item.partition(":")
+        for c0, c1 in _item_combos(name.strip()):
+            weights[min(c0, c1), max(c0, c1)] = float(weight) if weight else 1.0
+    combos = [(c0, c1, w) for (c0, c1), w in weights.items() if w > 0]
+    if not combos:
+        raise ValueError(f"empty range: {text!r}")
+    return combos
+
+
+def _is_random(combos: Sequence[Combo]) -> bool:
+    return len(combos) == len(ALL_COMBOS) and len({w for _, _, w in combos}) == 1
+
+
+@dataclass
+class RangeEquityResult:
+    equities: List[float]       # per seat, in the order given
+    trials: int
+    effective_trials: float     # Kish effective sample size of the deal weights
+
+
+def range_equity(
+    ranges: Sequence[Sequence[Combo] | str],
+    board: Sequence[int] | str = (),
+    trials: int = 100000,
+    variant: str = "standard",
+    seed: int | None = None,
+) -> RangeEquityResult:
+    """Monte Carlo equity of each seat's range, with an optional fixed partial board."""
+
+    if variant not in ("standard", "worstcase"):
+        raise ValueError("variant must be 'standard' or 'worstcase'")
+    ranges = [parse_range(r) if isinstance(r, str) else list(r) for r in ranges]
+    if len(ranges) < 2:
+        raise ValueError("need at least two seats")
+    board = parse_cards(board) if isinstance(board, str) else list(board)
+    if len(board) > 5 or len(set(board)) != len(board):
+        raise ValueError("board must be up to five distinct cards")
+
+    board_bits = 0
+    for c in board:
+        board_bits |= CARD_BIT[c]
+
+    # Ranged seats narrowest first (lower weight variance); random seats last.
+    ranged = sorted((i for i, r in enumerate(ranges) if not _is_random(r)), key=lambda i: len(ranges[i]))
+    random_seats = [i for i, r in enumerate(ranges) if _is_random(r)]
+    seat_combos = []
+    for i in ranged:
+        combos = [
+            (c0, c1, w, CARD_BIT[c0] | CARD_BIT[c1])
+            for c0, c1, w in ranges[i]
+            if not (CARD_BIT[c0] | CARD_BIT[c1]) & board_bits
+        ]
+        if not combos:
+            raise ValueError(f"seat {i}'s range is blocked by the board")
+        seat_combos.append((i, combos, sum(w for _, _, w in ranges[i])))
+
+    rng = random.Random(seed)
+    num_seats = len(ranges)
+    standard = variant == "standard"
+    equity_sums = [0.0] * num_seats
+    weight_sum = weight_sq_sum = 0.0
+    holes = [(0, 0)] * num_seats
+
+    for _ in range(trials):
+        dead = board_bits
+        weight = 1.0
+        for seat, combos, full_mass in seat_combos:
+            live = [combo for combo in combos if not combo[3] & dead]
+            if not live:
+                weight = 0.0
+                break
+            cumulative = list(accumulate(combo[2] for combo in live))
+            mass = cumulative[-1]
+            c0, c1, _, bits = live[min(bisect_right(cumulative, rng.random() * mass), len(live) - 1)]
+            holes[seat] = (c0, c1)
+            dead |= bits
+            weight *= mass / full_mass
+        if weight == 0.0:
+            continue
+
+        deck = [c for c in CARDS if not CARD_BIT[c] & dead]
+        drawn = rng.sample(deck, 2 * len(random_seats) + 5 - len(board))
+        for k, seat in enumerate(random_seats):
+            holes[seat] = (drawn[2 * k], drawn[2 * k + 1])
+        board_state = analyse_board(board + drawn[2 * len(random_seats) :])
+
+        if standard:
+            scores = [evaluate_on_board(board_state, c0, c1)[0] for c0, c1 in holes]
+        else:
+            scores = [classify_worst_case_on_board(board_state, c0, c1) for c0, c1 in holes]
+        best = max(scores)
+        winners = [i for i, s in enumerate(scores) if s == best]
+        share = weight / len(winners)
+        for i in winners:
+            equity_sums[i] += share
+        weight_sum += weight
+        weight_sq_sum += weight * weight
+
+    if weight_sum == 0.0:
+        raise ValueError("the ranges can never be dealt together")
+    return RangeEquityResult(
+        [e / weight_sum for e in equity_sums],
+        trials,
+        weight_sum * weight_sum / weight_sq_sum,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Equity of hole-card ranges against each other.")
+    parser.add_argument("ranges", nargs="+", help='One range per seat, e.g. "QQ+,AKs" "random" "JTs:0.5,99"')
+    parser.add_argument("--board", type=str, default="", help="Fixed board cards, e.g. AhKd7c (default: none)")
+    parser.add_argument("-t", "--trials", type=int, default=100000, help="Deals to sample (default: 100000)")
+    parser.add_argument("--variant", choices=["standard", "worstcase"], default="standard")
+    parser.add_argument("--seed", type=int, default=None, help="RNG seed (default: random)")
+    args = parser.parse_args()
+
+    result = range_equity(args.ranges, args.board, args.trials, args.variant, args.seed)
+    for text, equity in zip(args.ranges, result.equities):
+        print(f"{equity * 100:6.2f}%  {text}")
+    print(f"({result.trials} deals, effective sample size {result.effective_trials:,.0f})")
@@ -0,0 +1,150 @@
+"""Local cache of simulated shard tallies, addressed by what determines them.
+
+simulate() runs every player count as shards of SHARD_SIZE deals, each on its
+own RNG stream (texas_holdem_sim.shard_seed).  A shard's tallies are fully
+determined by its job: player counts, deal count, variant, engine (and NumPy
+batch size), shard seed, rng backend, seat-prefix mode and fixed hero cards,
+plus the code that deals and scores the cards.  ResultCache stores each
+shard's tallies in a JSON file named by the SHA-256 of that job and of
+rules_digest(), so:
+
+  - re-running a configuration reads every shard back and simulates nothing;
+  - raising the trial count reuses the shards already run and simulates only
+    the new ones (a partial last shard has a different deal count, so it is
+    re-run at full size);
+  - editing the evaluator, dealing or NumPy engine sources, or the tally
+    loops and types in texas_holdem_sim, changes every key, and stale
+    entries age out of the cache.
+
+The merged tallies are those of an uncached run, bit for bit, because
+simulate_tallies merges cached and fresh shards in the same job order.
+
+The cache is bounded by max_bytes: hits refresh an entry's modification time,
+and evict() removes the least recently used entries until it fits.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+from typing import Dict, Sequence
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".holdem_cache")
+CACHE_MAX_BYTES = 256 * 2**20
+CACHE_VERSION = 1  # bump when the layout of a cache entry changes
+
+_RULES_MODULES = ("cards.py", "dealing.py", "standard_holdem.py", "worst_case_holdem.py", "numpy_engine.py")
+
+
+def rules_digest(tally_code: Sequence = ()) -> str:
+    """Digest of the code that decides a shard's tallies.
+
+    Covers the dealing and scoring modules whole, plus tally_code: the
+    functions and classes that turn a shard job into tallies (their source is
+    hashed) and any constants they read (by repr).  texas_holdem_sim passes
+    its tally loops and types, rather than the whole module, so that editing
+    the CLI or the output writers keeps the cache.
+    """
+
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _RULES_MODULES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    for code in tally_code:
+        source = inspect.getsource(code) if callable(code) else repr(code)
+        digest.update(source.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Shard tallies on disk, keyed by shard job (see module docstring)."""
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, tally_code: Sequence = ()):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rules = rules_digest(tally_code)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job: dict) -> str:
+        key = json.dumps({"rules": self.rules, **job}, sort_keys=True)
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def get(self, job: dict, tally_type):
+        """{num_players: tally} stored for job, or None."""
+
+        path = self._path(job)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        if entry["job"] != job:  # a hash collision, in theory
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return {int(n): tally_type.from_dict(t) for n, t in entry["tallies"].items()}
+
+    def put(self, job: dict, shard_tallies: Dict) -> None:
+        path = self._path(job)
+        entry = {"job": job, "tallies": {n: t.to_dict() for n, t in shard_tallies.items()}}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes; returns how many."""
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or empty the simulate() shard cache.")
+    parser.add_argument("command", choices=("info", "clear"))
+    parser.add_argument("--dir", type=str, default=CACHE_DIR, help=f"Cache directory (default: {CACHE_DIR})")
+    args = parser.parse_args()
+
+    cache = ResultCache(args.dir)
+    if args.command == "clear":
+        cache.clear()
+        print(f"Emptied {args.dir}")
+    else:
+        sizes = [os.path.getsize(os.path.join(args.dir, n)) for n in os.listdir(args.dir) if n.endswith(".json")]
+        print(f"{args.dir}: {len(sizes)} shard entries, {sum(sizes) / 2**20:.1f} MB")
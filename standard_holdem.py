@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import struct
+from array import array
+from collections import Counter
+from itertools import combinations_with_replacement
+from typing import Dict, List, Sequence, Tuple
+
+from cards import PRIME_OF, RANK_BIT, RANK_PRIMES, RANKS, BoardState
+
+# evaluate_5card_hand takes (rank, suit) tuples, see cards.py; the table-driven
+# evaluators below take card ints.
+
+HAND_TYPES = [
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+    "Royal Flush",
+]
+
+
+def evaluate_5card_hand(cards):
+    """Evaluate a 5-card hand, return (score_tuple, hand_type_idx).
+
+    Score tuple scheme:
+    (category, primary ranks..., kicker ranks...)
+    where category 9 = Royal Flush (strongest), 0 = High Card (weakest).
+    """
+    assert len(cards) == 5
+    ranks = sorted((r for r, _ in cards), reverse=True)
+    suits = [s for _, s in cards]
+
+    # Count ranks
+    counts = Counter(ranks)
+    # Sort by (count, rank) descending for grouping
+    counts_sorted = sorted(counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
+
+    is_flush = len(set(suits)) == 1
+
+    # Straight detection including wheel A-2-3-4-5
+    uniq_ranks = sorted(set(ranks), reverse=True)
+    is_straight = False
+    high_in_straight = None
+
+    if len(uniq_ranks) == 5 and uniq_ranks[0] - uniq_ranks[4] == 4:
+        is_straight = True
+        high_in_straight = uniq_ranks[0]
+    else:
+        # Wheel: A-2-3-4-5 as 5-high straight
+        if set(uniq_ranks) == {14, 5, 4, 3, 2}:
+            is_straight = True
+            high_in_straight = 5
+
+    # Determine hand category
+    # counts_sorted structure examples:
+    # Four of a kind: [(rank4, 4), (kicker,1)]
+    # Full house: [(rank3,3),(rank2,2)]
+    # Trips: [(rank3,3),(k1,1),(k2,1)]
+    # Two pair: [(r2a,2),(r2b,2),(k,1)]
+    # One pair: [(rp,2),(k1,1),(k2,1),(k3,1)]
+
+    if is_straight and is_flush:
+        if high_in_straight == 14:
+            # Royal flush
+            category = 9
+            hand_type_idx = HAND_TYPES.index("Royal Flush")
+        else:
+            category = 8
+            hand_type_idx = HAND_TYPES.index("Straight Flush")
+        score = (category, high_in_straight)
+        return score, hand_type_idx
+
+    if counts_sorted[0][1] == 4:
+        # Four of a kind
+        four_rank = counts_sorted[0][0]
+        kicker = counts_sorted[1][0]
+        category = 7
+        hand_type_idx = HAND_TYPES.index("Four of a Kind")
+        score = (category, four_rank, kicker)
+        return score, hand_type_idx
+
+    if counts_sorted[0][1] == 3 and counts_sorted[1][1] == 2:
+        # Full house
+        trip_rank = counts_sorted[0][0]
+        pair_rank = counts_sorted[1][0]
+        category = 6
+        hand_type_idx = HAND_TYPES.index("Full House")
+        score = (category, trip_rank, pair_rank)
+        return score, hand_type_idx
+
+    if is_flush:
+        # Flush
+        category = 5
+        hand_type_idx = HAND_TYPES.index("Flush")
+        score = (category,) + tuple(sorted(ranks, reverse=True))
+        return score, hand_type_idx
+
+    if is_straight:
+        # Straight
+        category = 4
+        hand_type_idx = HAND_TYPES.index("Straight")
+        score = (category, high_in_straight)
+        return score, hand_type_idx
+
+    if counts_sorted[0][1] == 3:
+        # Three of a kind
+        trip_rank = counts_sorted[0][0]
+        kickers = [r for r, c in counts_sorted[1:] if c == 1]
+        kickers_sorted = sorted(kickers, reverse=True)
+        category = 3
+        hand_type_idx = HAND_TYPES.index("Three of a Kind")
+        score = (category, trip_rank) + tuple(kickers_sorted)
+        return score, hand_type_idx
+
+    if counts_sorted[0][1] == 2 and counts_sorted[1][1] == 2:
+        # Two pair
+        high_pair = counts_sorted[0][0]
+        low_pair = counts_sorted[1][0]
+        kicker = counts_sorted[2][0]
+        category = 2
+        hand_type_idx = HAND_TYPES.index("Two Pair")
+        score = (category, high_pair, low_pair, kicker)
+        return score, hand_type_idx
+
+    if counts_sorted[0][1] == 2:
+        # One pair
+        pair_rank = counts_sorted[0][0]
+        kickers = [r for r, c in counts_sorted[1:] if c == 1]
+        kickers_sorted = sorted(kickers, reverse=True)
+        category = 1
+        hand_type_idx = HAND_TYPES.index("One Pair")
+        score = (category, pair_rank) + tuple(kickers_sorted)
+        return score, hand_type_idx
+
+    # High card
+    category = 0
+    hand_type_idx = HAND_TYPES.index("High Card")
+    score = (category,) + tuple(sorted(ranks, reverse=True))
+    return score, hand_type_idx
+
+
+# ---------------------------------------------------------------------------
+# Lookup-table evaluator
+# ---------------------------------------------------------------------------
+#
+# There are only 7,462 distinct 5-card strengths.  Every hand maps to one of
+# them through one of two keys:
+#   - flushes: the 13-bit mask of the ranks present (a perfect hash into an
+#     8,192-entry array),
+#   - everything else: the product of one prime per rank, which is unique for
+#     each rank multiset.
+# The tables are derived from evaluate_5card_hand itself, so the integer
+# strengths sort exactly like its score tuples.
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "standard_5card_table.bin")
+_TABLE_MAGIC = b"STD5"
+_HEADER = struct.Struct("<4s20sII")
+
+FLUSH_MASKS = 1 << 13
+
+
+class StandardTables:
+    """Loaded lookup tables for the standard 5-card evaluator.
+
+    strength values run 1..7462 (higher is better); category_by_strength maps
+    a strength back to its HAND_TYPES index.
+    """
+
+    def __init__(self, flush_strength: array, product_strength: Dict[int, int], category_by_strength: array):
+        self.flush_strength = flush_strength
+        self.product_strength = product_strength
+        self.category_by_strength = category_by_strength
+
+
+def _rank_mask(ranks: Sequence[int]) -> int:
+    mask = 0
+    for r in ranks:
+        mask |= 1 << (r - 2)
+    return mask
+
+
+def _prime_product(ranks: Sequence[int]) -> int:
+    product = 1
+    for r in ranks:
+        product *= RANK_PRIMES[r]
+    return product
+
+
+def _table_stamp() -> bytes:
+    """Digest of the reference evaluator; a changed evaluator forces a rebuild."""
+
+    return hashlib.sha1(inspect.getsource(evaluate_5card_hand).encode("utf-8")).digest()
+
+
+def build_standard_tables() -> StandardTables:
+    """Score one representative of every rank multiset and rank the results."""
+
+    entries: List[Tuple[tuple, int, bool, int]] = []  # (score, type_idx, is_flush, key)
+    for ranks in combinations_with_replacement(RANKS, 5):
+        counts = Counter(ranks)
+        if max(counts.values()) > 4:
+            continue
+
+        # Non-flush representative: copies of a rank take distinct suits, and
+        # five distinct ranks get one off-suit card.
+        if len(counts) == 5:
+            cards = [(r, 0) for r in ranks[:4]] + [(ranks[4], 1)]
+        else:
+            cards = []
+            for r, c in counts.items():
+                cards.extend((r, s) for s in range(c))
+        score, type_idx = evaluate_5card_hand(cards)
+        entries.append((score, type_idx, False, _prime_product(ranks)))
+
+        if len(counts) == 5:
+            score, type_idx = evaluate_5card_hand([(r, 0) for r in ranks])
+            entries.append((score, type_idx, True, _rank_mask(ranks)))
+
+    ordered_scores = sorted({e[0] for e in entries})
+    strength_of = {score: i + 1 for i, score in enumerate(ordered_scores)}
+
+    flush_strength = array("H", [0]) * FLUSH_MASKS
+    product_strength: Dict[int, int] = {}
+    category_by_strength = array("B", [0]) * (len(ordered_scores) + 1)
+    for score, type_idx, is_flush, key in entries:
+        strength = strength_of[score]
+        category_by_strength[strength] = type_idx
+        if is_flush:
+            flush_strength[key] = strength
+        else:
+            product_strength[key] = strength
+
+    return StandardTables(flush_strength, product_strength, category_by_strength)
+
+
+def save_standard_tables(tables: StandardTables, path: str = TABLE_PATH) -> None:
+    keys = array("I", sorted(tables.product_strength))
+    values = array("H", (tables.product_strength[k] for k in keys))
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_TABLE_MAGIC, _table_stamp(), len(keys), len(tables.category_by_strength)))
+        tables.flush_strength.tofile(f)
+        keys.tofile(f)
+        values.tofile(f)
+        tables.category_by_strength.tofile(f)
+    os.replace(tmp_path, path)
+
+
+def load_standard_tables(path: str = TABLE_PATH) -> StandardTables | None:
+    """Read tables written by save_standard_tables; None if missing or stale."""
+
+    try:
+        with open(path, "rb") as f:
+            magic, stamp, n_keys, n_strengths = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _TABLE_MAGIC or stamp != _table_stamp():
+                return None
+            flush_strength = array("H")
+            flush_strength.fromfile(f, FLUSH_MASKS)
+            keys = array("I")
+            keys.fromfile(f, n_keys)
+            values = array("H")
+            values.fromfile(f, n_keys)
+            category_by_strength = array("B")
+            category_by_strength.fromfile(f, n_strengths)
+    except (OSError, EOFError, struct.error):
+        return None
+    return StandardTables(flush_strength, dict(zip(keys, values)), category_by_strength)
+
+
+def load_or_build_standard_tables(path: str = TABLE_PATH) -> StandardTables:
+    tables = load_standard_tables(path)
+    if tables is None:
+        tables = build_standard_tables()
+        try:
+            save_standard_tables(tables, path)
+        except OSError:
+            pass  # read-only checkout: keep the in-memory tables
+    return tables
+
+
+TABLES = load_or_build_standard_tables()
+_FLUSH_STRENGTH = TABLES.flush_strength
+_PRODUCT_STRENGTH = TABLES.product_strength
+_CATEGORY_BY_STRENGTH = TABLES.category_by_strength
+
+
+def evaluate_5card_strength(cards) -> Tuple[int, int]:
+    """Table-driven replacement for evaluate_5card_hand, on card ints.
+
+    Returns (strength, hand_type_idx) where strength is an int in 1..7462 that
+    orders hands exactly like evaluate_5card_hand's score tuples.
+    """
+
+    c0, c1, c2, c3, c4 = cards
+    if (c0 & 3) == (c1 & 3) == (c2 & 3) == (c3 & 3) == (c4 & 3):
+        b = RANK_BIT
+        strength = _FLUSH_STRENGTH[b[c0] | b[c1] | b[c2] | b[c3] | b[c4]]
+    else:
+        p = PRIME_OF
+        strength = _PRODUCT_STRENGTH[p[c0] * p[c1] * p[c2] * p[c3] * p[c4]]
+    return strength, _CATEGORY_BY_STRENGTH[strength]
+
+
+# ---------------------------------------------------------------------------
+# Direct 7-card evaluator
+# ---------------------------------------------------------------------------
+#
+# Instead of scoring all 21 five-card subsets, one pass over the cards builds
+# a rank mask per suit plus "rank seen at least k times" masks (k = 1..4).
+# Those masks determine the best five cards directly, which are then looked
+# up in the same strength tables as above.
+
+_PRIME_BY_BIT = [RANK_PRIMES[r] for r in RANKS]
+
+# Straight rank masks from ace-high down to the wheel (A-2-3-4-5).
+_STRAIGHT_MASKS = [0b11111 << (high - 6) for high in range(14, 5, -1)] + [(1 << 12) | 0b1111]
+
+
+def _top_bits(mask: int, n: int) -> List[int]:
+    """Bit positions of the n highest set bits in mask, highest first."""
+
+    bits = []
+    while len(bits) < n:
+        bit = mask.bit_length() - 1
+        bits.append(bit)
+        mask ^= 1 << bit
+    return bits
+
+
+def _best_distinct_strength(mask: int, flush: bool) -> int:
+    """Best strength using five distinct ranks from mask (straight or top five)."""
+
+    for straight in _STRAIGHT_MASKS:
+        if mask & straight == straight:
+            five = straight
+            break
+    else:
+        five = 0
+        for bit in _top_bits(mask, 5):
+            five |= 1 << bit
+    if flush:
+        return _FLUSH_STRENGTH[five]
+    product = 1
+    for bit in _top_bits(five, 5):
+        product *= _PRIME_BY_BIT[bit]
+    return _PRODUCT_STRENGTH[product]
+
+
+# Best flush / best non-paired strength for every rank mask holding 5+ ranks.
+FLUSH7_STRENGTH = array("H", [0]) * FLUSH_MASKS
+DISTINCT7_STRENGTH = array("H", [0]) * FLUSH_MASKS
+STRAIGHT7_STRENGTH = array("H", [0]) * FLUSH_MASKS
+for _mask in range(FLUSH_MASKS):
+    if bin(_mask).count("1") >= 5:
+        FLUSH7_STRENGTH[_mask] = _best_distinct_strength(_mask, True)
+        DISTINCT7_STRENGTH[_mask] = _best_distinct_strength(_mask, False)
+        if _CATEGORY_BY_STRENGTH[DISTINCT7_STRENGTH[_mask]] == HAND_TYPES.index("Straight"):
+            STRAIGHT7_STRENGTH[_mask] = DISTINCT7_STRENGTH[_mask]
+del _mask
+
+
+def evaluate_7card_strength(cards) -> Tuple[int, int]:
+    """Evaluate the best standard hand in 7 card ints without enumerating subsets.
+
+    Returns (strength, hand_type_idx) on the same scale as
+    evaluate_5card_strength, i.e. the strength of the best 5-card subset.
+    """
+
+    s_masks = [0, 0, 0, 0]
+    m1 = m2 = m3 = m4 = 0
+    rank_bit = RANK_BIT
+    for c in cards:
+        bit = rank_bit[c]
+        s_masks[c & 3] |= bit
+        m4 |= m3 & bit
+        m3 |= m2 & bit
+        m2 |= m1 & bit
+        m1 |= bit
+
+    # A flush rules out quads and full houses with only seven cards.
+    for s_mask in s_masks:
+        if s_mask.bit_count() >= 5:
+            strength = FLUSH7_STRENGTH[s_mask]
+            return strength, _CATEGORY_BY_STRENGTH[strength]
+
+    return _unsuited_strength(m1, m2, m3, m4)
+
+
+def _unsuited_strength(m1: int, m2: int, m3: int, m4: int) -> Tuple[int, int]:
+    """Best non-flush hand from "rank seen at least k times" masks."""
+
+    p = _PRIME_BY_BIT
+    if m4:
+        quad = m4.bit_length() - 1
+        kicker = (m1 & ~(1 << quad)).bit_length() - 1
+        strength = _PRODUCT_STRENGTH[p[quad] ** 4 * p[kicker]]
+    elif m3 and m2 & ~(1 << (m3.bit_length() - 1)):
+        trip = m3.bit_length() - 1
+        pair = (m2 & ~(1 << trip)).bit_length() - 1
+        strength = _PRODUCT_STRENGTH[p[trip] ** 3 * p[pair] ** 2]
+    elif STRAIGHT7_STRENGTH[m1]:
+        strength = STRAIGHT7_STRENGTH[m1]
+    elif m3:
+        trip = m3.bit_length() - 1
+        k1, k2 = _top_bits(m1 & ~(1 << trip), 2)
+        strength = _PRODUCT_STRENGTH[p[trip] ** 3 * p[k1] * p[k2]]
+    elif m2:
+        if m2 & (m2 - 1):
+            hi, lo = _top_bits(m2, 2)
+            kicker = (m1 & ~((1 << hi) | (1 << lo))).bit_length() - 1
+            strength = _PRODUCT_STRENGTH[p[hi] ** 2 * p[lo] ** 2 * p[kicker]]
+        else:
+            pair = m2.bit_length() - 1
+            k1, k2, k3 = _top_bits(m1 & ~m2, 3)
+            strength = _PRODUCT_STRENGTH[p[pair] ** 2 * p[k1] * p[k2] * p[k3]]
+    else:
+        strength = DISTINCT7_STRENGTH[m1]
+    return strength, _CATEGORY_BY_STRENGTH[strength]
+
+
+def evaluate_on_board(board: BoardState, c0: int, c1: int) -> Tuple[int, int]:
+    """evaluate_7card_strength of two hole cards plus an analysed board.
+
+    Only the board's flush_suit can give a flush, so a seat costs two mask
+    updates and one table decision instead of a pass over seven cards.
+    """
+
+    b0 = RANK_BIT[c0]
+    b1 = RANK_BIT[c1]
+    suit = board.flush_suit
+    if suit >= 0:
+        s_mask = board.suit_masks[suit]
+        if c0 & 3 == suit:
+            s_mask |= b0
+        if c1 & 3 == suit:
+            s_mask |= b1
+        if s_mask.bit_count() >= 5:
+            strength = FLUSH7_STRENGTH[s_mask]
+            return strength, _CATEGORY_BY_STRENGTH[strength]
+
+    m1, m2, m3, m4 = board.m1, board.m2, board.m3, board.m4
+    m4 |= m3 & b0
+    m3 |= m2 & b0
+    m2 |= m1 & b0
+    m1 |= b0
+    m4 |= m3 & b1
+    m3 |= m2 & b1
+    m2 |= m1 & b1
+    m1 |= b1
+    return _unsuited_strength(m1, m2, m3, m4)
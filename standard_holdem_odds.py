@@ -4,32 +4,25 @@ from collections import Counter
 from itertools import combinations
 from math import comb
 
-from texas_holdem_sim import DECK, HAND_TYPES, evaluate_5card_hand
+from cards import CARDS
+from standard_holdem import HAND_TYPES, evaluate_5card_strength
 
 
 def enumerate_standard_frequencies() -> Counter:
     """Enumerate all 5-card hands and count standard Texas Hold'em categories."""
 
     counts: Counter = Counter()
-    for combo in combinations(DECK, 5):
-        _, type_idx = evaluate_5card_hand(combo)
+    for combo in combinations(CARDS, 5):
+        _, type_idx = evaluate_5card_strength(combo)
         hand_type = HAND_TYPES[type_idx]
         counts[hand_type] += 1
     return counts
 
 
-if __name__ == "__main__":
-    total = comb(52, 5)
-    freqs = enumerate_standard_frequencies()
+def write_standard_odds_markdown(freqs: Counter, md_path: str = "standard_holdem_odds.md") -> None:
+    """Write the standard 5-card probability table for enumerate_standard_frequencies output."""
 
-    print(f"Total 5-card hands: {total}")
-    for name in HAND_TYPES:
-        count = freqs[name]
-        prob = count / total
-        print(f"{name:15s} {count:10d} {prob:8.6f}")
-
-    # Also write markdown table for side-by-side comparison with Worst Case odds.
-    md_path = "standard_holdem_odds.md"
+    total = comb(52, 5)
     with open(md_path, "w", encoding="utf-8") as md:
         md.write("# Standard Texas Hold'em – 5-Card Hand Probabilities\n")
         md.write(f"\nTotal distinct 5-card hands: {total}\n\n")
@@ -46,4 +39,19 @@ if __name__ == "__main__":
         for rank, name, count, prob in rows:
             md.write(f"| {rank:2d} | {name:16s} | {count:11d} | {prob*100:10.4f}% |\n")
 
+
+if __name__ == "__main__":
+    total = comb(52, 5)
+    freqs = enumerate_standard_frequencies()
+
+    print(f"Total 5-card hands: {total}")
+    for name in HAND_TYPES:
+        count = freqs[name]
+        prob = count / total
+        print(f"{name:15s} {count:10d} {prob:8.6f}")
+
+    # Also write markdown table for side-by-side comparison with Worst Case odds.
+    md_path = "standard_holdem_odds.md"
+    write_standard_odds_markdown(freqs, md_path)
+
     print(f"Markdown odds written to {md_path}")
@@ -0,0 +1,32 @@
+import csv
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from build_holdem_trend_sheet import build_trend_sheet
+from texas_holdem_sim import simulate
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("variant", ["standard", "worstcase"])
+def test_npz_and_csv_inputs_give_the_same_sheet(tmp_path, variant):
+    # Few enough deals that the rarest hand types are never dealt.
+    results_csv = str(tmp_path / "results.csv")
+    counts_npz = str(tmp_path / "counts.npz")
+    simulate([2, 5, 9], 2000, results_csv, None, variant=variant, seed=3, counts_path=counts_npz)
+
+    build_trend_sheet(results_csv, str(tmp_path / "from_csv.csv"))
+    build_trend_sheet(counts_npz, str(tmp_path / "from_npz.csv"))
+    from_csv = _read(tmp_path / "from_csv.csv")
+    from_npz = _read(tmp_path / "from_npz.csv")
+
+    assert list(from_npz[0]) == list(from_csv[0])
+    assert len(from_npz) == len(from_csv)
+    for csv_row, npz_row in zip(from_csv, from_npz):
+        for column, value in csv_row.items():
+            assert float(npz_row[column]) == pytest.approx(float(value), rel=1e-12, abs=1e-15), column
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from dealing import Dealer
+from profiling import HotPathProfile, profile_tally_python
+from texas_holdem_sim import simulate_tally_python
+from worst_case_holdem import _SEVEN_CARD_RULES, WorstCaseHandType, classify_worst_case_seven, trace_worst_case_seven
+
+
+@pytest.mark.parametrize("variant", ["standard", "worstcase"])
+@pytest.mark.parametrize("num_players", [2, 9])
+def test_profiled_loop_gives_the_same_tally(variant, num_players):
+    plain = simulate_tally_python(num_players, 3000, variant, Dealer("mt", 11))
+    profiled, profile = profile_tally_python(num_players, 3000, variant, Dealer("mt", 11), sample_every=16)
+    assert profiled.to_dict() == plain.to_dict()
+    assert profile.sampled_trials == 3000 // 16
+
+
+def test_seven_card_rules_cover_every_type_from_the_top():
+    types = [hand_type for _, returns in _SEVEN_CARD_RULES for hand_type in returns]
+    assert types == sorted(WorstCaseHandType, reverse=True)
+
+
+def test_trace_ends_on_the_deciding_rule():
+    rng = random.Random(5)
+    for _ in range(20000):
+        cards = rng.sample(range(52), 7)
+        hand_type, checks = trace_worst_case_seven(cards)
+        assert hand_type == classify_worst_case_seven(cards)
+        assert hand_type in dict(_SEVEN_CARD_RULES)[checks[-1]]
+
+
+def test_merge_keeps_untimed_time():
+    a = HotPathProfile(trials=10, wall_ns=100, untimed_ns=7)
+    a.merge(HotPathProfile(trials=10, wall_ns=50, untimed_ns=3))
+    assert (a.trials, a.wall_ns, a.untimed_ns) == (20, 150, 10)
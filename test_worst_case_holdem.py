@@ -0,0 +1,7 @@
+from worst_case_holdem import enumerate_worst_case_frequencies
+
+
+def test_isomorphism_counts_equal_brute_force():
+    isomorphism = enumerate_worst_case_frequencies("isomorphism")
+    assert isomorphism == enumerate_worst_case_frequencies("brute_force")
+    assert sum(isomorphism.values()) == 2598960
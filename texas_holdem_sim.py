@@ -1,30 +1,31 @@
 import random
 import csv
 import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from fractions import Fraction
+from math import comb
 from collections import Counter
-
-from worst_case_holdem import classify_worst_case_hand, WorstCaseHandType
-
-# Card representation: (rank, suit)
-# ranks: 2-14 (where 14 = Ace)
-# suits: 0-3 (we don't care which is which, just equality)
-
-RANKS = list(range(2, 15))
-SUITS = list(range(4))
-DECK = [(r, s) for r in RANKS for s in SUITS]
-
-HAND_TYPES = [
-    "High Card",
-    "One Pair",
-    "Two Pair",
-    "Three of a Kind",
-    "Straight",
-    "Flush",
-    "Full House",
-    "Four of a Kind",
-    "Straight Flush",
-    "Royal Flush",
-]
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from cards import DECK, NUM_CARDS, RANKS, STARTING_HAND_CLASSES, SUITS, analyse_board, encode_cards
+from dealing import RNG_BACKENDS, Dealer
+from progress import ProgressReporter
+from standard_holdem import HAND_TYPES, evaluate_5card_hand, evaluate_7card_strength, evaluate_on_board
+from worst_case_holdem import (
+    classify_worst_case_hand,
+    classify_worst_case_on_board,
+    classify_worst_case_seven,
+    WorstCaseHandType,
+)
+
+# Card representation: (rank, suit) tuples at the API edges (best_five_of_seven*),
+# card ints 0..51 inside simulate(); see cards.py.
 
 # Worst Case Hold'em labels ordered by WorstCaseHandType (1..10)
 WORST_CASE_HAND_TYPES = [
@@ -40,27 +41,29 @@ WORST_CASE_HAND_TYPES = [
     "Perfect Misdeal",      # 10: PERFECT_MISDEAL
 ]
 
+# Trials per shard. Each shard of each player count gets its own RNG stream
+# derived from the run seed, so results depend on the seed and SHARD_SIZE only,
+# never on how many worker processes run the shards.
+SHARD_SIZE = 10000
+
+# z for the 95% Wilson intervals written next to each estimate.
+CI_Z = 1.96
+
+# Default seconds between checkpoint saves (see SimulationCheckpoint).
+CHECKPOINT_INTERVAL = 60.0
+
 
 def best_five_of_seven(cards):
     """Return best 5-card *standard* hand score and hand type index from 7 cards.
 
-    Score is a tuple where higher is better and comparable between hands.
+    Score is the lookup-table strength of the best 5-card subset: an int where
+    higher is better and comparable between hands. evaluate_7card_strength
+    reads it straight off the 7 cards' rank/suit bitmasks instead of scoring
+    all 21 subsets.
     """
     assert len(cards) == 7
 
-    best_score = None
-    best_type_idx = None
-
-    # Choose all 5-card combinations from 7 (21 combos)
-    from itertools import combinations
-
-    for combo in combinations(cards, 5):
-        score, type_idx = evaluate_5card_hand(combo)
-        if best_score is None or score > best_score:
-            best_score = score
-            best_type_idx = type_idx
-
-    return best_score, best_type_idx
+    return evaluate_7card_strength(encode_cards(cards))
 
 
 def best_five_of_seven_worstcase(cards):
@@ -71,172 +74,782 @@ def best_five_of_seven_worstcase(cards):
     """
     assert len(cards) == 7
 
-    from itertools import combinations
+    best_type = best_worst_case_of_seven_cards(encode_cards(cards))
 
-    best_type: WorstCaseHandType | None = None
+    # Score is just the enum value; used only for comparing between players.
+    return (int(best_type),), best_type
 
-    for combo in combinations(cards, 5):
-        eval_result = classify_worst_case_hand(combo)
-        wc_type = eval_result.hand_type
-        if wc_type is None:
-            continue
-        if best_type is None or wc_type > best_type:
-            best_type = wc_type
 
-    if best_type is None:
-        # If nothing matched any explicit pattern, treat as LOW_CARD.
-        best_type = WorstCaseHandType.LOW_CARD
+def best_worst_case_of_seven_cards(cards) -> WorstCaseHandType:
+    """Highest WorstCaseHandType over the 21 5-card subsets of 7 card ints.
+
+    classify_worst_case_seven decides it from the 7 cards at once, without
+    visiting the subsets (see worst_case_table.verify_seven_card_classifier).
+    """
+
+    return classify_worst_case_seven(cards)
 
-    # Score is just the enum value; used only for comparing between players.
-    return (int(best_type),), best_type
 
+@dataclass
+class HeroTally:
+    """Raw hero counters for one player count, as accumulated by simulate().
 
-def evaluate_5card_hand(cards):
-    """Evaluate a 5-card hand, return (score_tuple, hand_type_idx).
+    Keys of the Counters are hand type labels (HAND_TYPES or
+    WORST_CASE_HAND_TYPES); hero_type_equity_win_counts and
+    hero_overall_equity_wins account for split pots.
+    """
 
-    Score tuple scheme:
-    (category, primary ranks..., kicker ranks...)
-    where category 9 = Royal Flush (strongest), 0 = High Card (weakest).
+    trials: int = 0
+    hero_type_counts: Counter = field(default_factory=Counter)
+    hero_type_win_counts: Counter = field(default_factory=Counter)
+    hero_type_equity_win_counts: Counter = field(default_factory=Counter)
+    hero_overall_equity_wins: float = 0.0
+
+    def merge(self, other: "HeroTally") -> None:
+        """Add another tally's counters into this one."""
+
+        self.trials += other.trials
+        self.hero_type_counts.update(other.hero_type_counts)
+        self.hero_type_win_counts.update(other.hero_type_win_counts)
+        self.hero_type_equity_win_counts.update(other.hero_type_equity_win_counts)
+        self.hero_overall_equity_wins += other.hero_overall_equity_wins
+
+    def scaled(self, factor: float) -> "HeroTally":
+        """Copy with trials and every counter multiplied by factor (stratum reweighting)."""
+
+        return HeroTally(
+            trials=self.trials * factor,
+            hero_type_counts=Counter({k: v * factor for k, v in self.hero_type_counts.items()}),
+            hero_type_win_counts=Counter({k: v * factor for k, v in self.hero_type_win_counts.items()}),
+            hero_type_equity_win_counts=Counter(
+                {k: v * factor for k, v in self.hero_type_equity_win_counts.items()}
+            ),
+            hero_overall_equity_wins=self.hero_overall_equity_wins * factor,
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-ready copy of the counters (floats round-trip exactly through json)."""
+
+        return {
+            "trials": self.trials,
+            "hero_type_counts": dict(self.hero_type_counts),
+            "hero_type_win_counts": dict(self.hero_type_win_counts),
+            "hero_type_equity_win_counts": dict(self.hero_type_equity_win_counts),
+            "hero_overall_equity_wins": self.hero_overall_equity_wins,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HeroTally":
+        return cls(
+            trials=data["trials"],
+            hero_type_counts=Counter(data["hero_type_counts"]),
+            hero_type_win_counts=Counter(data["hero_type_win_counts"]),
+            hero_type_equity_win_counts=Counter(data["hero_type_equity_win_counts"]),
+            hero_overall_equity_wins=data["hero_overall_equity_wins"],
+        )
+
+
+@dataclass
+class PairedTally:
+    """Hero counters of one paired run (variant "both"): every deal under both rankings.
+
+    cross counts deals by (standard hand type, Worst Case hand type, standard
+    outcome, Worst Case outcome), outcomes being "win", "split" or "loss".
+    trials and hero_overall_equity_wins are the standard half's, so code that
+    only reads those (progress reports) sees one consistent tally.
     """
-    assert len(cards) == 5
-    ranks = sorted((r for r, _ in cards), reverse=True)
-    suits = [s for _, s in cards]
 
-    # Count ranks
-    counts = Counter(ranks)
-    # Sort by (count, rank) descending for grouping
-    counts_sorted = sorted(counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
+    standard: HeroTally = field(default_factory=HeroTally)
+    worstcase: HeroTally = field(default_factory=HeroTally)
+    cross: Counter = field(default_factory=Counter)
+
+    @property
+    def trials(self):
+        return self.standard.trials
+
+    @trials.setter
+    def trials(self, value) -> None:
+        self.standard.trials = value
+        self.worstcase.trials = value
+
+    @property
+    def hero_overall_equity_wins(self) -> float:
+        return self.standard.hero_overall_equity_wins
+
+    def merge(self, other: "PairedTally") -> None:
+        self.standard.merge(other.standard)
+        self.worstcase.merge(other.worstcase)
+        self.cross.update(other.cross)
+
+    def scaled(self, factor: float) -> "PairedTally":
+        return PairedTally(
+            self.standard.scaled(factor),
+            self.worstcase.scaled(factor),
+            Counter({k: v * factor for k, v in self.cross.items()}),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "standard": self.standard.to_dict(),
+            "worstcase": self.worstcase.to_dict(),
+            "cross": [[*key, n] for key, n in self.cross.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PairedTally":
+        return cls(
+            HeroTally.from_dict(data["standard"]),
+            HeroTally.from_dict(data["worstcase"]),
+            Counter({tuple(row[:4]): row[4] for row in data["cross"]}),
+        )
+
+
+class SimulationCheckpoint:
+    """Crash-safe progress of a sampled simulate() run, kept in a JSON file.
+
+    A shard's RNG state is fully given by (seed, stream, shard index), so the
+    checkpoint records the run configuration, the merged tallies of finished
+    adaptive batches (with the player counts still pending and the time used)
+    and the raw tallies of every shard finished in the current batch.  A
+    resumed run skips those shards and merges in the same job order as an
+    uninterrupted one, so its results are identical.
+
+    Saves go through a temporary file and os.replace, so a crash mid-save
+    leaves the previous checkpoint intact.
+    """
 
-    is_flush = len(set(suits)) == 1
+    def __init__(self, path: str, config: dict, interval: float = CHECKPOINT_INTERVAL):
+        self.path = path
+        self.config = config
+        self.interval = interval
+        self.next_shard = 0      # shard index the next adaptive batch starts at
+        self.tallies = {}        # {num_players: HeroTally} over finished batches
+        self.pending = None      # player counts still receiving trials (None: all)
+        self.elapsed = 0.0       # seconds used by finished batches
+        self.stop_reason = None  # set once the run has stopped
+        self.shards = {}         # {job index: {num_players: HeroTally}} of the current batch
+        self.batch_shards = None # shards per stream in the current adaptive batch
+        self._last_save = time.monotonic()
+
+    @staticmethod
+    def read_config(path: str):
+        """Configuration stored in the checkpoint at path, or None if there is none."""
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)["config"]
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> bool:
+        """Restore progress from self.path; False if there is no checkpoint yet.
+
+        Raises ValueError if the checkpoint was written for another configuration.
+        """
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        if state["config"] != self.config or "next_shard" not in state:
+            raise ValueError(f"checkpoint {self.path} was written by a run with different settings")
+        self.next_shard = state["next_shard"]
+        tally_type = PairedTally if self.config["variant"] == "both" else HeroTally
+        self.tallies = {int(n): tally_type.from_dict(t) for n, t in state["tallies"].items()}
+        self.pending = state["pending"]
+        self.elapsed = state["elapsed"]
+        self.stop_reason = state["stop_reason"]
+        self.shards = {
+            int(i): {int(n): tally_type.from_dict(t) for n, t in shard.items()} for i, shard in state["shards"].items()
+        }
+        self.batch_shards = state["batch_shards"]
+        return True
+
+    def save(self) -> None:
+        state = {
+            "config": self.config,
+            "next_shard": self.next_shard,
+            "tallies": {n: t.to_dict() for n, t in self.tallies.items()},
+            "pending": self.pending,
+            "elapsed": self.elapsed,
+            "stop_reason": self.stop_reason,
+            "shards": {i: {n: t.to_dict() for n, t in shard.items()} for i, shard in self.shards.items()},
+            "batch_shards": self.batch_shards,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_save = time.monotonic()
+
+    def shard_done(self, job_index: int, shard_tallies) -> None:
+        """Record a finished shard; saves if interval seconds have passed since the last save."""
+
+        self.shards[job_index] = shard_tallies
+        if time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def batch_done(self, next_shard, tallies, pending, elapsed, stop_reason=None) -> None:
+        """Fold a finished adaptive batch into the checkpoint and save it."""
+
+        self.next_shard = next_shard
+        self.tallies = tallies
+        self.pending = pending
+        self.elapsed = elapsed
+        self.stop_reason = stop_reason
+        self.shards = {}
+        self.save()
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def wilson_interval(successes: float, trials: float, z: float = CI_Z):
+    """Wilson score interval (low, high) for successes out of trials.
+
+    successes may be fractional (split-pot equity).  With no trials the
+    interval is the whole of [0, 1].
+    """
 
-    # Straight detection including wheel A-2-3-4-5
-    uniq_ranks = sorted(set(ranks), reverse=True)
-    is_straight = False
-    high_in_straight = None
+    if trials <= 0:
+        return 0.0, 1.0
+    p = successes / trials
+    z2 = z * z
+    centre = (p + z2 / (2 * trials)) / (1 + z2 / trials)
+    half = z / (1 + z2 / trials) * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials))
+    return max(0.0, centre - half), min(1.0, centre + half)
 
-    if len(uniq_ranks) == 5 and uniq_ranks[0] - uniq_ranks[4] == 4:
-        is_straight = True
-        high_in_straight = uniq_ranks[0]
-    else:
-        # Wheel: A-2-3-4-5 as 5-high straight
-        if set(uniq_ranks) == {14, 5, 4, 3, 2}:
-            is_straight = True
-            high_in_straight = 5
-
-    # Determine hand category
-    # counts_sorted structure examples:
-    # Four of a kind: [(rank4, 4), (kicker,1)]
-    # Full house: [(rank3,3),(rank2,2)]
-    # Trips: [(rank3,3),(k1,1),(k2,1)]
-    # Two pair: [(r2a,2),(r2b,2),(k,1)]
-    # One pair: [(rp,2),(k1,1),(k2,1),(k3,1)]
-
-    if is_straight and is_flush:
-        if high_in_straight == 14:
-            # Royal flush
-            category = 9
-            hand_type_idx = HAND_TYPES.index("Royal Flush")
+
+def max_ci_half_width(tally: HeroTally, hand_type_labels) -> float:
+    """Widest Wilson half-width over every P(hand) and P(win | hand) of a tally."""
+
+    widest = 0.0
+    for hand_type in hand_type_labels:
+        count = tally.hero_type_counts[hand_type]
+        for successes, trials in (
+            (count, tally.trials),
+            (tally.hero_type_equity_win_counts[hand_type], count),
+        ):
+            low, high = wilson_interval(successes, trials)
+            widest = max(widest, (high - low) / 2)
+    return widest
+
+
+def stratified_allocation(num_trials: int):
+    """Trials per STARTING_HAND_CLASSES entry: one each, the rest split by combos.
+
+    The split is proportional to each class's share of the comb(52, 2) hole
+    pairs, rounded by largest remainder so the total is exactly num_trials.
+    """
+
+    num_classes = len(STARTING_HAND_CLASSES)
+    if num_trials < num_classes:
+        raise ValueError(f"stratified sampling needs at least {num_classes} trials")
+    spare = num_trials - num_classes
+    shares = [spare * cls.combos / comb(NUM_CARDS, 2) for cls in STARTING_HAND_CLASSES]
+    allocation = [1 + int(share) for share in shares]
+    by_remainder = sorted(range(num_classes), key=lambda i: shares[i] - int(shares[i]), reverse=True)
+    for i in by_remainder[: num_trials - sum(allocation)]:
+        allocation[i] += 1
+    return allocation
+
+
+def shard_seed(seed: int, stream, shard_index: int) -> int:
+    """64-bit seed of one shard's RNG stream, derived from the run seed.
+
+    stream names the job family: a player count, or "prefix" for seat-prefix runs.
+    """
+
+    digest = hashlib.sha256(f"{seed}:{stream}:{shard_index}".encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def simulate_tally_python(num_players, num_trials, variant="standard", dealer=None, hero=None):
+    """Deal and evaluate num_trials hands one at a time; return a HeroTally.
+
+    dealer is a dealing.Dealer (default: Mersenne Twister, unseeded).  If
+    hero is a pair of card ints, seat 0 holds them in every deal.
+    """
+
+    if dealer is None:
+        dealer = Dealer()
+
+    tally = HeroTally()
+    hero_type_counts = tally.hero_type_counts
+    hero_type_win_counts = tally.hero_type_win_counts
+    hero_type_equity_win_counts = tally.hero_type_equity_win_counts
+    hero_overall_equity_wins = 0.0
+
+    n_hole = 2 * num_players
+    num_cards = n_hole + 5
+
+    for _ in range(num_trials):
+        # Draw only the cards in play: deck[2i:2i+2] for seat i, then the board
+        deck = dealer.deal(num_cards) if hero is None else dealer.deal_with(hero, num_cards)
+
+        # Analyse the shared board once; each seat only adds its hole cards
+        board = analyse_board(deck[n_hole:num_cards])
+
+        # Evaluate each player's best hand
+        scores = []
+        type_infos = []  # standard: type index; worstcase: WorstCaseHandType
+        for i in range(num_players):
+            if variant == "standard":
+                score, type_idx = evaluate_on_board(board, deck[2 * i], deck[2 * i + 1])
+                scores.append(score)
+                type_infos.append(type_idx)
+            else:
+                wc_type = classify_worst_case_on_board(board, deck[2 * i], deck[2 * i + 1])
+                scores.append(int(wc_type))
+                type_infos.append(wc_type)
+
+        # Determine winner(s)
+        best_score = max(scores)
+        winners = [i for i, s in enumerate(scores) if s == best_score]
+
+        if variant == "standard":
+            base_type_idx = type_infos[0]
+            hero_type = HAND_TYPES[base_type_idx]
         else:
-            category = 8
-            hand_type_idx = HAND_TYPES.index("Straight Flush")
-        score = (category, high_in_straight)
-        return score, hand_type_idx
-
-    if counts_sorted[0][1] == 4:
-        # Four of a kind
-        four_rank = counts_sorted[0][0]
-        kicker = counts_sorted[1][0]
-        category = 7
-        hand_type_idx = HAND_TYPES.index("Four of a Kind")
-        score = (category, four_rank, kicker)
-        return score, hand_type_idx
-
-    if counts_sorted[0][1] == 3 and counts_sorted[1][1] == 2:
-        # Full house
-        trip_rank = counts_sorted[0][0]
-        pair_rank = counts_sorted[1][0]
-        category = 6
-        hand_type_idx = HAND_TYPES.index("Full House")
-        score = (category, trip_rank, pair_rank)
-        return score, hand_type_idx
-
-    if is_flush:
-        # Flush
-        category = 5
-        hand_type_idx = HAND_TYPES.index("Flush")
-        score = (category,) + tuple(sorted(ranks, reverse=True))
-        return score, hand_type_idx
-
-    if is_straight:
-        # Straight
-        category = 4
-        hand_type_idx = HAND_TYPES.index("Straight")
-        score = (category, high_in_straight)
-        return score, hand_type_idx
-
-    if counts_sorted[0][1] == 3:
-        # Three of a kind
-        trip_rank = counts_sorted[0][0]
-        kickers = [r for r, c in counts_sorted[1:] if c == 1]
-        kickers_sorted = sorted(kickers, reverse=True)
-        category = 3
-        hand_type_idx = HAND_TYPES.index("Three of a Kind")
-        score = (category, trip_rank) + tuple(kickers_sorted)
-        return score, hand_type_idx
-
-    if counts_sorted[0][1] == 2 and counts_sorted[1][1] == 2:
-        # Two pair
-        high_pair = counts_sorted[0][0]
-        low_pair = counts_sorted[1][0]
-        kicker = counts_sorted[2][0]
-        category = 2
-        hand_type_idx = HAND_TYPES.index("Two Pair")
-        score = (category, high_pair, low_pair, kicker)
-        return score, hand_type_idx
-
-    if counts_sorted[0][1] == 2:
-        # One pair
-        pair_rank = counts_sorted[0][0]
-        kickers = [r for r, c in counts_sorted[1:] if c == 1]
-        kickers_sorted = sorted(kickers, reverse=True)
-        category = 1
-        hand_type_idx = HAND_TYPES.index("One Pair")
-        score = (category, pair_rank) + tuple(kickers_sorted)
-        return score, hand_type_idx
-
-    # High card
-    category = 0
-    hand_type_idx = HAND_TYPES.index("High Card")
-    score = (category,) + tuple(sorted(ranks, reverse=True))
-    return score, hand_type_idx
+            hero_wc_type: WorstCaseHandType = type_infos[0]
+            # Enum values start at 1 and are in the same logical order as
+            # WORST_CASE_HAND_TYPES.
+            hero_type = WORST_CASE_HAND_TYPES[int(hero_wc_type) - 1]
 
+        hero_type_counts[hero_type] += 1
 
-def simulate(
-    num_players_list,
-    num_trials_per_player_count=50000,
-    csv_filename="holdem_sim_results.csv",
-    md_filename=None,
-    variant="standard",
-):
-    """Run simulations for given list of player counts and write CSV (and optional markdown) with results.
+        # Hero equity for this deal (1 if sole winner, fractional if tie on top, 0 if loses)
+        hero_equity = 0.0
+        if 0 in winners:
+            hero_equity = 1.0 / len(winners)
 
-    For each number of players N and focal player (seat 0):
-      - Estimate probability of each final hand type for hero
-      - Estimate probability hero wins given that hand type
-      - Estimate overall hero win probability
+        if hero_equity > 0:
+            hero_type_equity_win_counts[hero_type] += hero_equity
 
-    Parameters
-    ----------
-    variant : {"standard", "worstcase"}
-        - "standard": use normal Texas Hold'em hand detection and names
-          (High Card, One Pair, ..., Royal Flush).
-        - "worstcase": use the custom Worst Case Hold'em 5-card evaluator
-          (Gap, Color Associate, Broken Pair, Faux Flush, ..., Perfect Misdeal)
-          both for ranking hands and for naming them.
+        if 0 in winners:
+            hero_type_win_counts[hero_type] += 1  # pure win count
+
+        hero_overall_equity_wins += hero_equity
+
+    tally.trials = num_trials
+    tally.hero_overall_equity_wins = hero_overall_equity_wins
+    return tally
+
+
+def _record_hero_result(tally, hero_type, scores):
+    """Add one deal's hero result to tally as simulate_tally_python does; returns the outcome."""
+
+    best_score = max(scores)
+    if scores[0] < best_score:
+        tally.hero_type_counts[hero_type] += 1
+        return "loss"
+    num_winners = scores.count(best_score)
+    hero_equity = 1.0 / num_winners
+    tally.hero_type_counts[hero_type] += 1
+    tally.hero_type_equity_win_counts[hero_type] += hero_equity
+    tally.hero_type_win_counts[hero_type] += 1
+    tally.hero_overall_equity_wins += hero_equity
+    return "win" if num_winners == 1 else "split"
+
+
+def simulate_paired_tally_python(num_players, num_trials, dealer=None, hero=None):
+    """Score every deal under both rankings in one pass; returns a PairedTally.
+
+    Deals are drawn exactly as in simulate_tally_python, so on the same
+    stream each half equals the tally of a single-variant run, but both
+    halves now describe the same deals and their differences are paired.
     """
 
-    if variant not in ("standard", "worstcase"):
-        raise ValueError("variant must be 'standard' or 'worstcase'")
+    if dealer is None:
+        dealer = Dealer()
+
+    paired = PairedTally(HeroTally(trials=num_trials), HeroTally(trials=num_trials))
+    cross = paired.cross
+    n_hole = 2 * num_players
+    num_cards = n_hole + 5
+
+    for _ in range(num_trials):
+        deck = dealer.deal(num_cards) if hero is None else dealer.deal_with(hero, num_cards)
+        board = analyse_board(deck[n_hole:num_cards])
+
+        std_scores = []
+        wc_scores = []
+        for i in range(num_players):
+            c0, c1 = deck[2 * i], deck[2 * i + 1]
+            score, type_idx = evaluate_on_board(board, c0, c1)
+            if not i:
+                std_type = HAND_TYPES[type_idx]
+            std_scores.append(score)
+            wc_scores.append(int(classify_worst_case_on_board(board, c0, c1)))
+        wc_type = WORST_CASE_HAND_TYPES[wc_scores[0] - 1]
+
+        std_outcome = _record_hero_result(paired.standard, std_type, std_scores)
+        wc_outcome = _record_hero_result(paired.worstcase, wc_type, wc_scores)
+        cross[std_type, wc_type, std_outcome, wc_outcome] += 1
+
+    return paired
+
+
+def simulate_prefix_tallies_python(num_players_list, num_trials, variant="standard", dealer=None, hero=None):
+    """Seat-prefix mode: one deal per trial serves every player count.
+
+    Each trial seats max(num_players_list) players around one board; the
+    N-player result is hero (seat 0) against seats 1..N-1 of that deal.
+    Seats are evaluated in order and only until hero has lost, since hero
+    then loses at every larger table too.  hero fixes seat 0's hole cards as
+    in simulate_tally_python.  Returns {num_players: HeroTally}.
+    """
+
+    if dealer is None:
+        dealer = Dealer()
+
+    wanted = sorted(set(num_players_list))
+    tallies = {n: HeroTally(trials=num_trials) for n in wanted}
+    n_hole = 2 * wanted[-1]
+    num_cards = n_hole + 5
+
+    for _ in range(num_trials):
+        deck = dealer.deal(num_cards) if hero is None else dealer.deal_with(hero, num_cards)
+        board = analyse_board(deck[n_hole:num_cards])
+
+        if variant == "standard":
+            hero_score, type_idx = evaluate_on_board(board, deck[0], deck[1])
+            hero_type = HAND_TYPES[type_idx]
+        else:
+            hero_score = int(classify_worst_case_on_board(board, deck[0], deck[1]))
+            hero_type = WORST_CASE_HAND_TYPES[hero_score - 1]
+
+        num_tied = 1  # seats so far sharing hero's score
+        seat = 1
+        for num_players in wanted:
+            tally = tallies[num_players]
+            tally.hero_type_counts[hero_type] += 1
+
+            while num_tied and seat < num_players:
+                if variant == "standard":
+                    score = evaluate_on_board(board, deck[2 * seat], deck[2 * seat + 1])[0]
+                else:
+                    score = classify_worst_case_on_board(board, deck[2 * seat], deck[2 * seat + 1])
+                if score > hero_score:
+                    num_tied = 0
+                elif score == hero_score:
+                    num_tied += 1
+                seat += 1
+
+            if num_tied:
+                hero_equity = 1.0 / num_tied
+                tally.hero_type_win_counts[hero_type] += 1
+                tally.hero_type_equity_win_counts[hero_type] += hero_equity
+                tally.hero_overall_equity_wins += hero_equity
+
+    return tallies
+
+
+def tally_from_counts(variant, num_trials, type_counts, win_counts, equity_sums):
+    """Fold per-category count arrays (numpy_engine, exact_headsup) into a HeroTally."""
+
+    labels = HAND_TYPES if variant == "standard" else WORST_CASE_HAND_TYPES
+    tally = HeroTally(trials=num_trials)
+    for i, label in enumerate(labels):
+        if type_counts[i]:
+            tally.hero_type_counts[label] = int(type_counts[i])
+        if win_counts[i]:
+            tally.hero_type_win_counts[label] = int(win_counts[i])
+        if equity_sums[i]:
+            tally.hero_type_equity_win_counts[label] = float(equity_sums[i])
+    tally.hero_overall_equity_wins = float(sum(equity_sums))
+    return tally
+
+
+def simulate_tally_numpy(num_players, num_trials, variant="standard", batch_size=10000, rng=None, hero=None):
+    """Run numpy_engine.simulate_counts and fold its arrays into a HeroTally."""
+
+    from numpy_engine import simulate_counts
+
+    counts = simulate_counts(num_players, num_trials, variant, batch_size=batch_size, rng=rng, hero=hero)
+    return tally_from_counts(variant, num_trials, *counts)
+
+
+def exact_headsup_tally(variant="standard", workers=1):
+    """HeroTally of every heads-up deal, counted exactly by exact_headsup."""
+
+    from exact_headsup import TOTAL_DEALS, enumerate_headsup
+
+    counts = enumerate_headsup(variant, workers=workers)
+    return tally_from_counts(variant, TOTAL_DEALS, *counts)
+
+
+def simulate_prefix_tallies_numpy(num_players_list, num_trials, variant="standard", batch_size=10000, rng=None,
+                                  hero=None):
+    """Seat-prefix mode on numpy_engine; returns {num_players: HeroTally}."""
+
+    from numpy_engine import simulate_prefix_counts
+
+    counts = simulate_prefix_counts(num_players_list, num_trials, variant, batch_size=batch_size, rng=rng, hero=hero)
+    return {n: tally_from_counts(variant, num_trials, *arrays) for n, arrays in counts.items()}
+
+
+def run_shard(players, num_trials, variant, engine, batch_size, seed, rng_backend="mt", seat_prefix=False,
+              hero=None, profile=False):
+    """Simulate one shard on its own seeded stream (top level so worker processes can pickle it).
+
+    players is the tuple of player counts this shard covers: one count, or
+    all of them in seat-prefix mode.  hero optionally fixes seat 0's hole
+    cards (stratified runs).  Returns {num_players: HeroTally} (PairedTally
+    for variant "both", python engine only), or with profile=True ({num_players: HeroTally}, profiling.HotPathProfile).
+    """
+
+    if profile:
+        from profiling import profile_tally_python
+
+        tally, shard_profile = profile_tally_python(players[0], num_trials, variant, Dealer(rng_backend, seed), hero)
+        return {players[0]: tally}, shard_profile
+
+    if engine == "numpy":
+        import numpy as np
+
+        bit_generators = {"mt": np.random.MT19937, "pcg64": np.random.PCG64, "philox": np.random.Philox}
+        if rng_backend not in bit_generators:
+            raise ValueError(f"engine 'numpy' supports rng backends {', '.join(bit_generators)}")
+        rng = np.random.Generator(bit_generators[rng_backend](seed))
+        if seat_prefix:
+            return simulate_prefix_tallies_numpy(players, num_trials, variant, batch_size, rng=rng, hero=hero)
+        return {players[0]: simulate_tally_numpy(players[0], num_trials, variant, batch_size, rng=rng, hero=hero)}
+
+    dealer = Dealer(rng_backend, seed)
+    if variant == "both":
+        return {players[0]: simulate_paired_tally_python(players[0], num_trials, dealer=dealer, hero=hero)}
+    if seat_prefix:
+        return simulate_prefix_tallies_python(players, num_trials, variant, dealer=dealer, hero=hero)
+    return {players[0]: simulate_tally_python(players[0], num_trials, variant, dealer=dealer, hero=hero)}
+
+
+def _cache_job(job) -> dict:
+    """What determines a run_shard job's tallies, as a result_cache key."""
+
+    players, num_trials, variant, engine, batch_size, seed, rng_backend, seat_prefix, hero = job[:9]
+    return {
+        "players": list(players),
+        "trials": num_trials,
+        "variant": variant,
+        "engine": engine,
+        "batch_size": batch_size if engine == "numpy" else None,
+        "seed": seed,
+        "rng_backend": rng_backend,
+        "seat_prefix": seat_prefix,
+        "hero": list(hero) if hero is not None else None,
+    }
+
+
+def simulate_tallies(num_players_list, num_trials, variant="standard", engine="python", batch_size=10000,
+                     workers=1, seed=0, rng_backend="mt", seat_prefix=False, first_shard=0, stratified=False,
+                     checkpoint=None, progress=None, profile=None, cache=None):
+    """Run every shard job and merge shards in order; return {num_players: HeroTally}.
+
+    Jobs are (player count, shard) pairs, or just shards covering all player
+    counts at once in seat-prefix mode.  Shards are numbered from first_shard,
+    so a later call can extend a run with fresh streams.
+
+    With stratified=True each of those streams is further split by hero's
+    starting-hand class (see stratified_allocation): hero holds a fixed
+    representative of the class, which is exact because no rule depends on
+    which suit is which, and each class's counts are reweighted by
+    P(class) * num_trials / class trials.  The merged tallies then estimate
+    the same quantities as a plain run, with weighted (float) counts.
+
+    With a SimulationCheckpoint, shards already in checkpoint.shards are not
+    run again and each newly finished shard is handed to it.  A
+    progress.ProgressReporter is likewise told about every finished shard.
+    With a profiling.HotPathProfile, shards run the profiled loop and their
+    profiles are merged into it.  With a result_cache.ResultCache, shards
+    found there are read instead of run and newly run shards are stored.
+    """
+
+    num_players_list = list(dict.fromkeys(num_players_list))
+    if seat_prefix:
+        streams = [("prefix", tuple(num_players_list))]
+    else:
+        streams = [(num_players, (num_players,)) for num_players in num_players_list]
+
+    if stratified:
+        strata = [
+            (f":{cls.label}", cls.cards, class_trials, cls.combos / comb(NUM_CARDS, 2) * num_trials / class_trials)
+            for cls, class_trials in zip(STARTING_HAND_CLASSES, stratified_allocation(num_trials))
+        ]
+    else:
+        strata = [("", None, num_trials, None)]
+
+    jobs = []
+    weights = []
+    for stream, players in streams:
+        for suffix, hero, stratum_trials, weight in strata:
+            for shard_index, start in enumerate(range(0, stratum_trials, SHARD_SIZE), first_shard):
+                shard_trials = min(SHARD_SIZE, stratum_trials - start)
+                jobs.append((players, shard_trials, variant, engine, batch_size,
+                             shard_seed(seed, f"{stream}{suffix}", shard_index), rng_backend, seat_prefix, hero,
+                             profile is not None))
+                weights.append(weight)
+
+    tally_type = PairedTally if variant == "both" else HeroTally
+    results = dict(checkpoint.shards) if checkpoint is not None else {}
+    if cache is not None:
+        for i in range(len(jobs)):
+            if i not in results:
+                cached = cache.get(_cache_job(jobs[i]), tally_type)
+                if cached is not None:
+                    results[i] = cached
+    todo = [i for i in range(len(jobs)) if i not in results]
+
+    def shard_done(i):
+        if profile is not None:
+            results[i], shard_profile = results[i]
+            profile.merge(shard_profile)
+        if cache is not None:
+            cache.put(_cache_job(jobs[i]), results[i])
+        if checkpoint is not None:
+            checkpoint.shard_done(i, results[i])
+        if progress is not None:
+            players, shard_trials = jobs[i][:2]
+            progress.shard_done(results[i], shard_trials, max(players), weights[i])
+
+    if progress is not None:
+        for i in results:
+            progress.restore(results[i] if weights[i] is None else
+                             {n: t.scaled(weights[i]) for n, t in results[i].items()})
+        progress.plan(sum(jobs[i][1] for i in todo))
+
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_shard, *jobs[i]): i for i in todo}
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                shard_done(i)
+    else:
+        for i in todo:
+            results[i] = run_shard(*jobs[i])
+            shard_done(i)
+
+    # Merging in job order keeps the float sums identical for any worker count,
+    # and for a run resumed from a checkpoint or read from the cache.
+    tallies = {num_players: tally_type() for num_players in num_players_list}
+    for weight, shard_tallies in zip(weights, (results[i] for i in range(len(jobs)))):
+        for num_players, shard_tally in shard_tallies.items():
+            tallies[num_players].merge(shard_tally if weight is None else shard_tally.scaled(weight))
+    if stratified:
+        for tally in tallies.values():
+            tally.trials = num_trials  # the weights sum to this, up to rounding
+    return tallies
+
+
+def simulate_tallies_adaptive(num_players_list, num_trials, variant="standard", engine="python",
+                              batch_size=10000, workers=1, seed=0, rng_backend="mt", seat_prefix=False,
+                              target_ci=None, time_budget=None, stratified=False, checkpoint=None,
+                              progress=None, profile=None, cache=None):
+    """simulate_tallies in rounds of num_trials until the estimates are tight enough.
+
+    After each round, player counts whose every P(hand) and P(win | hand) has
+    a Wilson half-width of at most target_ci stop receiving trials.
+
+    With a time_budget, rounds run as batches of a few shards per stream (one
+    per worker, or a single SHARD_SIZE stratified round with stratified=True)
+    and the run stops once time_budget seconds have passed, checked after
+    every batch, so the budget is overrun by about one shard's time at most.
+    Batches use the same shard streams as whole rounds, so without
+    stratification the results still do not depend on the worker count.
+    Returns ({num_players: HeroTally}, stop reason).
+
+    With a SimulationCheckpoint the run starts from its saved batches and
+    shards (time already spent counts against time_budget) and records each
+    finished batch in it.
+    """
+
+    def widest_ci(tally):
+        if variant == "both":
+            return max(max_ci_half_width(tally.standard, HAND_TYPES),
+                       max_ci_half_width(tally.worstcase, WORST_CASE_HAND_TYPES))
+        return max_ci_half_width(tally, HAND_TYPES if variant == "standard" else WORST_CASE_HAND_TYPES)
+
+    shards_per_round = -(-num_trials // SHARD_SIZE)
+    if time_budget is None:
+        shards_per_batch = shards_per_round
+    else:
+        shards_per_batch = 1 if stratified else min(shards_per_round, max(1, workers))
+    start_time = time.monotonic()
+
+    pending = list(dict.fromkeys(num_players_list))
+    tallies = {num_players: PairedTally() if variant == "both" else HeroTally() for num_players in pending}
+    next_shard = 0
+    if checkpoint is not None and checkpoint.next_shard:
+        tallies, pending, next_shard = checkpoint.tallies, checkpoint.pending, checkpoint.next_shard
+        start_time -= checkpoint.elapsed
+        if checkpoint.stop_reason is not None:
+            return tallies, checkpoint.stop_reason
+        if progress is not None:
+            progress.restore(tallies)
+
+    while True:
+        shard_in_round = next_shard % shards_per_round
+        if checkpoint is not None and checkpoint.shards:
+            batch_shards = checkpoint.batch_shards  # keep the interrupted batch's job indices
+        else:
+            batch_shards = min(shards_per_batch, shards_per_round - shard_in_round)
+        if checkpoint is not None:
+            checkpoint.batch_shards = batch_shards
+        batch_trials = min(batch_shards * SHARD_SIZE, num_trials - shard_in_round * SHARD_SIZE)
+        batch_tallies = simulate_tallies(
+            pending,
+            batch_trials,
+            variant,
+            engine,
+            batch_size,
+            workers=workers,
+            seed=seed,
+            rng_backend=rng_backend,
+            seat_prefix=seat_prefix,
+            first_shard=next_shard,
+            stratified=stratified,
+            checkpoint=checkpoint,
+            progress=progress,
+            profile=profile,
+            cache=cache,
+        )
+        for num_players, batch_tally in batch_tallies.items():
+            tallies[num_players].merge(batch_tally)
+        next_shard += batch_shards
+
+        stop_reason = None
+        if next_shard % shards_per_round == 0:
+            if target_ci is not None:
+                pending = [n for n in pending if widest_ci(tallies[n]) > target_ci]
+                if not pending:
+                    stop_reason = f"every interval within +/-{target_ci}"
+            if target_ci is None and time_budget is None:
+                stop_reason = "fixed trial count"
+        if stop_reason is None and time_budget is not None and time.monotonic() - start_time >= time_budget:
+            stop_reason = f"time budget of {time_budget:g}s"
+        if checkpoint is not None:
+            checkpoint.batch_done(next_shard, tallies, pending, time.monotonic() - start_time, stop_reason)
+        if stop_reason is not None:
+            return tallies, stop_reason
+
+
+def write_results(tallies, num_players_list, variant, csv_filename, md_filename=None, run_notes=(), exact=False,
+                  adaptive=False):
+    """Write the per-hand-type CSV (and optional markdown summary) of {num_players: HeroTally}.
+
+    run_notes are the markdown summary's bullet lines under the player counts
+    (trials, seed, modes); adaptive adds each player count's trial count.
+    Exact runs also get *_exact columns holding each probability as a
+    reduced fraction ("numerator/denominator"), since the float columns
+    round the enumerated counts.
+    """
 
     hand_type_labels = HAND_TYPES if variant == "standard" else WORST_CASE_HAND_TYPES
 
@@ -247,7 +860,18 @@ def simulate(
         "hero_win_given_type_probability",
         "hero_hand_and_win_probability",
         "hero_overall_win_probability",  # same per num_players per row (repeated)
+        "hero_hand_probability_ci_low",
+        "hero_hand_probability_ci_high",
+        "hero_win_given_type_ci_low",
+        "hero_win_given_type_ci_high",
     ]
+    if exact:
+        fieldnames += [
+            "hero_hand_probability_exact",
+            "hero_win_given_type_probability_exact",
+            "hero_hand_and_win_probability_exact",
+            "hero_overall_win_probability_exact",
+        ]
 
     # For markdown summary: collect per-player, per-hand stats in memory
     md_summary = {}
@@ -257,73 +881,18 @@ def simulate(
         writer.writeheader()
 
         for num_players in num_players_list:
-            if num_players < 2 or num_players > 9:
-                raise ValueError("num_players must be between 2 and 9 for this sim")
-
-            hero_type_counts = Counter()
-            hero_type_win_counts = Counter()
-            hero_type_equity_win_counts = Counter()  # accounts for split pots
-            hero_overall_equity_wins = 0.0
-
-            for _ in range(num_trials_per_player_count):
-                # Shuffle deck
-                deck = DECK[:]
-                random.shuffle(deck)
-
-                # Deal 2 cards to each player
-                hands = [deck[2 * i : 2 * i + 2] for i in range(num_players)]
-
-                # Deal 5 community cards
-                community = deck[2 * num_players : 2 * num_players + 5]
-
-                # Evaluate each player's best hand
-                scores = []
-                type_infos = []  # standard: type index; worstcase: WorstCaseHandType
-                for i in range(num_players):
-                    seven_cards = hands[i] + community
-                    if variant == "standard":
-                        score, type_idx = best_five_of_seven(seven_cards)
-                        scores.append(score)
-                        type_infos.append(type_idx)
-                    else:
-                        score, wc_type = best_five_of_seven_worstcase(seven_cards)
-                        scores.append(score)
-                        type_infos.append(wc_type)
-
-                # Determine winner(s)
-                best_score = max(scores)
-                winners = [i for i, s in enumerate(scores) if s == best_score]
-
-                if variant == "standard":
-                    base_type_idx = type_infos[0]
-                    hero_type = hand_type_labels[base_type_idx]
-                else:
-                    hero_wc_type: WorstCaseHandType = type_infos[0]
-                    # Enum values start at 1 and are in the same logical order as
-                    # WORST_CASE_HAND_TYPES.
-                    hero_type = WORST_CASE_HAND_TYPES[int(hero_wc_type) - 1]
+            tally = tallies[num_players]
+            hero_type_counts = tally.hero_type_counts
+            hero_type_equity_win_counts = tally.hero_type_equity_win_counts
+            hero_overall_equity_wins = tally.hero_overall_equity_wins
 
-                hero_type_counts[hero_type] += 1
-
-                # Hero equity for this deal (1 if sole winner, fractional if tie on top, 0 if loses)
-                hero_equity = 0.0
-                if 0 in winners:
-                    hero_equity = 1.0 / len(winners)
-
-                if hero_equity > 0:
-                    hero_type_equity_win_counts[hero_type] += hero_equity
-
-                if 0 in winners:
-                    hero_type_win_counts[hero_type] += 1  # pure win count
-
-                hero_overall_equity_wins += hero_equity
-
-            total_deals = float(num_trials_per_player_count)
+            total_deals = float(tally.trials)
             hero_overall_win_prob = hero_overall_equity_wins / total_deals
 
             # Initialize markdown summary record for this player count
             md_summary[num_players] = {
                 "hero_overall_win_probability": hero_overall_win_prob,
+                "trials": tally.trials,
                 "hands": {},
             }
 
@@ -339,19 +908,42 @@ def simulate(
                     win_given_type_prob = 0.0
                     hand_and_win_prob = 0.0
 
-                writer.writerow({
+                if exact:
+                    hand_ci = (hand_prob, hand_prob)
+                    win_ci = (win_given_type_prob, win_given_type_prob)
+                else:
+                    hand_ci = wilson_interval(count, total_deals)
+                    win_ci = wilson_interval(hero_type_equity_win_counts[hand_type], count)
+
+                row = {
                     "num_players": num_players,
                     "hand_type": hand_type,
                     "hero_hand_probability": hand_prob,
                     "hero_win_given_type_probability": win_given_type_prob,
                     "hero_hand_and_win_probability": hand_and_win_prob,
                     "hero_overall_win_probability": hero_overall_win_prob,
-                })
+                    "hero_hand_probability_ci_low": hand_ci[0],
+                    "hero_hand_probability_ci_high": hand_ci[1],
+                    "hero_win_given_type_ci_low": win_ci[0],
+                    "hero_win_given_type_ci_high": win_ci[1],
+                }
+                if exact:
+                    # Exact counts are integers and equity sums half-integers, so
+                    # Fraction(float) recovers them without rounding.
+                    type_count = hero_type_counts[hand_type]
+                    type_equity = Fraction(hero_type_equity_win_counts[hand_type])
+                    row["hero_hand_probability_exact"] = Fraction(type_count, tally.trials)
+                    row["hero_win_given_type_probability_exact"] = type_equity / type_count if type_count else Fraction(0)
+                    row["hero_hand_and_win_probability_exact"] = type_equity / tally.trials
+                    row["hero_overall_win_probability_exact"] = Fraction(hero_overall_equity_wins) / tally.trials
+                writer.writerow(row)
 
                 md_summary[num_players]["hands"][hand_type] = {
                     "hand_prob": hand_prob,
                     "win_given_type_prob": win_given_type_prob,
                     "hand_and_win_prob": hand_and_win_prob,
+                    "hand_ci": hand_ci,
+                    "win_ci": win_ci,
                 }
 
     # Optionally write markdown summary file
@@ -360,27 +952,406 @@ def simulate(
             title_variant = "Texas Hold'em" if variant == "standard" else "Worst Case Hold'em"
             md.write(f"# {title_variant} Simulation Summary\n")
             md.write(f"\n- Player counts simulated: {', '.join(str(n) for n in sorted(num_players_list))}\n")
-            md.write(f"- Trials per player count: {num_trials_per_player_count}\n\n")
+            for note in run_notes:
+                md.write(f"- {note}\n")
+            md.write("\n")
 
             for num_players in sorted(md_summary.keys()):
                 overall = md_summary[num_players]["hero_overall_win_probability"]
                 md.write(f"## {num_players} Players\n\n")
-                md.write(f"- Hero overall win probability: {overall * 100:.2f}%\n\n")
+                md.write(f"- Hero overall win probability: {overall * 100:.2f}%\n")
+                if adaptive:
+                    md.write(f"- Trials: {md_summary[num_players]['trials']}\n")
+                md.write("\n")
 
-                md.write("| Hand Type | P(hand) | P(win | hand) | P(hand & win) |\n")
-                md.write("|----------|---------|--------------|----------------|\n")
+                md.write("| Hand Type | P(hand) | P(hand) 95% CI | P(win | hand) | P(win | hand) 95% CI | P(hand & win) |\n")
+                md.write("|----------|---------|----------------|--------------|----------------------|----------------|\n")
 
                 for hand_type in hand_type_labels:
                     stats = md_summary[num_players]["hands"][hand_type]
+                    hand_low, hand_high = stats["hand_ci"]
+                    win_low, win_high = stats["win_ci"]
                     md.write(
                         f"| {hand_type} | {stats['hand_prob'] * 100:.3f}% | "
+                        f"{hand_low * 100:.3f}–{hand_high * 100:.3f}% | "
                         f"{stats['win_given_type_prob'] * 100:.2f}% | "
+                        f"{win_low * 100:.2f}–{win_high * 100:.2f}% | "
                         f"{stats['hand_and_win_prob'] * 100:.3f}% |\n"
                     )
 
                 md.write("\n")
 
 
+OUTCOMES = ("win", "split", "loss")
+
+
+def paired_filename(filename: str, part: str) -> str:
+    """results.csv -> results_<part>.csv: the files a variant "both" run writes."""
+
+    root, ext = os.path.splitext(filename)
+    return f"{root}_{part}{ext}"
+
+
+def write_cross_tab(tallies, num_players_list, csv_filename, md_filename=None, run_notes=()) -> None:
+    """Write the hero cross-tab of a paired run ({num_players: PairedTally}).
+
+    The CSV has one row per non-empty (standard type, Worst Case type,
+    standard outcome, Worst Case outcome) cell with its deal count and
+    probability; the markdown shows, per player count, the hand type
+    cross-tab and the outcome cross-tab.
+    """
+
+    with open(csv_filename, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "num_players", "standard_hand_type", "worstcase_hand_type",
+            "standard_outcome", "worstcase_outcome", "deals", "probability",
+        ])
+        for num_players in num_players_list:
+            tally = tallies[num_players]
+            for std_type in HAND_TYPES:
+                for wc_type in WORST_CASE_HAND_TYPES:
+                    for std_outcome in OUTCOMES:
+                        for wc_outcome in OUTCOMES:
+                            n = tally.cross[std_type, wc_type, std_outcome, wc_outcome]
+                            if n:
+                                writer.writerow([num_players, std_type, wc_type, std_outcome, wc_outcome, n,
+                                                 n / tally.trials])
+
+    if not md_filename:
+        return
+    with open(md_filename, "w", encoding="utf-8") as md:
+        md.write("# Standard vs Worst Case Hold'em – Paired Hero Cross-Tab\n")
+        md.write(f"\n- Player counts simulated: {', '.join(str(n) for n in sorted(num_players_list))}\n")
+        for note in run_notes:
+            md.write(f"- {note}\n")
+        md.write("- Every deal is scored under both rankings, so the two variants are compared on the same deals\n\n")
+
+        for num_players in sorted(num_players_list):
+            tally = tallies[num_players]
+            by_types = Counter()
+            by_outcomes = Counter()
+            for (std_type, wc_type, std_outcome, wc_outcome), n in tally.cross.items():
+                by_types[std_type, wc_type] += n
+                by_outcomes[std_outcome, wc_outcome] += n
+            total = tally.trials
+
+            md.write(f"## {num_players} Players\n\n")
+            md.write("P(standard type & Worst Case type), rows: standard hand type, columns: Worst Case hand type.\n\n")
+            md.write("| Standard \\ Worst Case | " + " | ".join(WORST_CASE_HAND_TYPES) + " |\n")
+            md.write("|---" + "|---:" * len(WORST_CASE_HAND_TYPES) + "|\n")
+            for std_type in HAND_TYPES:
+                cells = [f"{by_types[std_type, wc_type] / total * 100:.3f}%" for wc_type in WORST_CASE_HAND_TYPES]
+                md.write(f"| {std_type} | " + " | ".join(cells) + " |\n")
+
+            md.write("\nHero outcome, rows: standard, columns: Worst Case.\n\n")
+            md.write("| Standard \\ Worst Case | " + " | ".join(OUTCOMES) + " |\n")
+            md.write("|---" + "|---:" * len(OUTCOMES) + "|\n")
+            for std_outcome in OUTCOMES:
+                cells = [f"{by_outcomes[std_outcome, wc_outcome] / total * 100:.2f}%" for wc_outcome in OUTCOMES]
+                md.write(f"| {std_outcome} | " + " | ".join(cells) + " |\n")
+            md.write("\n")
+
+
+def simulate(
+    num_players_list,
+    num_trials_per_player_count=50000,
+    csv_filename="holdem_sim_results.csv",
+    md_filename=None,
+    variant="standard",
+    engine="python",
+    batch_size=10000,
+    workers=1,
+    seed=None,
+    rng_backend="mt",
+    seat_prefix=False,
+    exact=False,
+    target_ci=None,
+    time_budget=None,
+    stratified=False,
+    checkpoint_path=None,
+    resume=False,
+    checkpoint_interval=CHECKPOINT_INTERVAL,
+    progress_interval=None,
+    metrics_path=None,
+    profile_path=None,
+    counts_path=None,
+    cache_dir=None,
+    cache_max_bytes=None,
+):
+    """Run simulations for given list of player counts and write CSV (and optional markdown) with results.
+
+    For each number of players N and focal player (seat 0):
+      - Estimate probability of each final hand type for hero
+      - Estimate probability hero wins given that hand type
+      - Estimate overall hero win probability
+
+    Parameters
+    ----------
+    variant : {"standard", "worstcase", "both"}
+        - "standard": use normal Texas Hold'em hand detection and names
+          (High Card, One Pair, ..., Royal Flush).
+        - "worstcase": use the custom Worst Case Hold'em 5-card evaluator
+          (Gap, Color Associate, Broken Pair, Faux Flush, ..., Perfect Misdeal)
+          both for ranking hands and for naming them.
+        - "both": deal once and score each deal under both rankings
+          (simulate_paired_tally_python; python engine, no seat-prefix or
+          exact mode).  Writes paired_filename(csv_filename, "standard"),
+          (..., "worstcase") and a hero cross-tab (..., "crosstab"), likewise
+          for md_filename.  Each variant's file equals that of a
+          single-variant run with the same seed.
+    engine : {"python", "numpy"}
+        - "python": deal and evaluate one hand at a time.
+        - "numpy": deal and evaluate batch_size hands at a time with
+          numpy_engine (requires NumPy). Same outputs, much faster.
+    workers : int
+        Number of processes running trial shards (see SHARD_SIZE).
+    seed : int or None
+        Run seed; every shard's RNG stream is derived from it, so the same
+        seed gives identical output for any number of workers. None draws a
+        fresh seed, which is recorded in the markdown summary.
+    rng_backend : {"mt", "pcg64", "philox", "splitmix"}
+        Random stream behind each shard (see dealing.RNG_BACKENDS); the numpy
+        engine maps the first three onto NumPy bit generators.
+    seat_prefix : bool
+        Deal max(num_players_list) seats once per trial and read every
+        requested N off seats 0..N-1 of the same deal (see
+        simulate_prefix_tallies_python), instead of separate deals per N.
+        Estimates for different N then share their deals.
+    exact : bool
+        Heads-up only: count every deal exactly (exact_headsup, over
+        `workers` processes) instead of sampling; trials, engine, seed and
+        rng settings are then unused.
+    target_ci, time_budget : float or None
+        Adaptive stopping (see simulate_tallies_adaptive): keep adding rounds
+        of num_trials_per_player_count deals to each player count until all
+        its 95% Wilson half-widths are <= target_ci, or until time_budget
+        seconds have run.  Rare hand types converge slowly, so a target_ci
+        alone can run for a long time.
+    stratified : bool
+        Split each player count's trials over hero's 169 starting-hand
+        classes and reweight by class probability (see simulate_tallies).
+        Unbiased, and P(hand) no longer varies with how many of each start
+        hero happened to be dealt; the Wilson intervals treat the weighted
+        counts as plain counts, so they are approximate.
+    checkpoint_path : str or None
+        Save the run's progress there every checkpoint_interval seconds and
+        after every adaptive batch (see SimulationCheckpoint); the file is
+        removed once the results are written.  Not used with exact.
+    resume : bool
+        Continue from the checkpoint at checkpoint_path, if there is one.  It
+        must come from a run with the same settings (the worker count may
+        differ; seed None takes the checkpoint's seed); the results are the
+        same as those of an uninterrupted run.
+    progress_interval, metrics_path : float, str or None
+        Report deals/s, hands/s, ETA and hero's running win probability
+        per player count to stderr every progress_interval seconds, and/or
+        append the same reports to the JSON-lines file metrics_path (see
+        progress.ProgressReporter).  Reports are made between shards, never
+        per deal.  Not used with exact.
+    profile_path : str or None
+        Run the shards through profiling.profile_tally_python (python
+        engine, one deal per player count), print its per-stage breakdown to
+        stderr and write folded stacks for flamegraph tools to profile_path.
+        The results are unchanged; with profile_path None the profiler code
+        is never reached.
+    counts_path : str or None
+        Also save the raw integer counts behind the results to this .npz
+        file (see count_store; requires NumPy), so that runs with different
+        seeds can be merged with `count_store.py merge`.  Variant "both"
+        writes paired_filename(counts_path, "standard") and (..., "worstcase").
+        Not available for stratified runs, whose counts are weighted.
+    cache_dir, cache_max_bytes : str, int or None
+        Keep every shard's tallies in a result_cache.ResultCache in
+        cache_dir (at most cache_max_bytes, default
+        result_cache.CACHE_MAX_BYTES, least recently used entries evicted).
+        A repeated run then reads its shards back instead of simulating
+        them, and a run with more trials only simulates the shards it adds;
+        the results are the same as without the cache.  Not used with exact
+        or profile mode.
+
+    Every row also carries the 95% Wilson interval of P(hand) and
+    P(win | hand) (degenerate, i.e. the value itself, for exact runs).
+    """
+
+    if variant not in ("standard", "worstcase", "both"):
+        raise ValueError("variant must be 'standard', 'worstcase' or 'both'")
+    if engine not in ("python", "numpy"):
+        raise ValueError("engine must be 'python' or 'numpy'")
+    if variant == "both" and (engine != "python" or seat_prefix or exact or profile_path):
+        raise ValueError("variant 'both' runs on the python engine without seat-prefix, exact or profile mode")
+    if rng_backend not in RNG_BACKENDS:
+        raise ValueError(f"rng_backend must be one of {', '.join(RNG_BACKENDS)}")
+    for num_players in num_players_list:
+        if num_players < 2 or num_players > 9:
+            raise ValueError("num_players must be between 2 and 9 for this sim")
+    if exact and set(num_players_list) != {2}:
+        raise ValueError("exact enumeration is only available for 2 players")
+    if exact and checkpoint_path:
+        raise ValueError("checkpoints are not available with exact enumeration")
+    if counts_path and stratified:
+        raise ValueError("stratified runs have weighted counts, which cannot be stored as raw counts")
+    if resume and not checkpoint_path:
+        raise ValueError("resume needs a checkpoint_path")
+    if cache_dir and (exact or profile_path):
+        raise ValueError("the result cache is not used with exact or profile mode")
+    if seed is None and resume:
+        seed = (SimulationCheckpoint.read_config(checkpoint_path) or {}).get("seed")
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    checkpoint = None
+    if checkpoint_path:
+        config = {
+            "players": list(num_players_list),
+            "trials": num_trials_per_player_count,
+            "variant": variant,
+            "engine": engine,
+            "batch_size": batch_size,
+            "seed": seed,
+            "rng_backend": rng_backend,
+            "seat_prefix": seat_prefix,
+            "target_ci": target_ci,
+            "time_budget": time_budget,
+            "stratified": stratified,
+        }
+        checkpoint = SimulationCheckpoint(checkpoint_path, config, checkpoint_interval)
+        if resume:
+            checkpoint.load()
+
+    profile = None
+    if profile_path:
+        if engine != "python" or seat_prefix or exact:
+            raise ValueError("profiling covers the python engine without seat-prefix or exact mode")
+        from profiling import HotPathProfile
+
+        profile = HotPathProfile()
+
+    cache = None
+    if cache_dir:
+        from result_cache import CACHE_MAX_BYTES, ResultCache
+
+        tally_code = (
+            HeroTally,
+            PairedTally,
+            run_shard,
+            simulate_tally_python,
+            _record_hero_result,
+            simulate_paired_tally_python,
+            simulate_prefix_tallies_python,
+            tally_from_counts,
+            simulate_tally_numpy,
+            simulate_prefix_tallies_numpy,
+            WORST_CASE_HAND_TYPES,
+        )
+        cache = ResultCache(
+            cache_dir, cache_max_bytes if cache_max_bytes is not None else CACHE_MAX_BYTES, tally_code
+        )
+
+    progress = None
+    if (progress_interval is not None or metrics_path) and not exact:
+        progress = ProgressReporter(
+            progress_interval if progress_interval is not None else 5.0,
+            sys.stderr if progress_interval is not None else None,
+            metrics_path,
+        )
+
+    adaptive = target_ci is not None or time_budget is not None
+    if exact:
+        tallies = {2: exact_headsup_tally(variant, workers)}
+    else:
+        try:
+            tallies, stop_reason = simulate_tallies_adaptive(
+                num_players_list,
+                num_trials_per_player_count,
+                variant,
+                engine,
+                batch_size,
+                workers=workers,
+                seed=seed,
+                rng_backend=rng_backend,
+                seat_prefix=seat_prefix,
+                target_ci=target_ci,
+                time_budget=time_budget,
+                stratified=stratified,
+                checkpoint=checkpoint,
+                progress=progress,
+                profile=profile,
+                cache=cache,
+            )
+        except KeyboardInterrupt:
+            if checkpoint is not None:
+                checkpoint.save()
+            raise
+        finally:
+            if progress is not None:
+                progress.close()
+            if cache is not None:
+                cache.evict()
+
+    if exact:
+        run_notes = [f"Exact enumeration of all {tallies[2].trials} heads-up deals"]
+    else:
+        if adaptive:
+            run_notes = [
+                f"Trials per player count: adaptive, in rounds of {num_trials_per_player_count}",
+                f"Stopped on: {stop_reason}",
+            ]
+        else:
+            run_notes = [f"Trials per player count: {num_trials_per_player_count}"]
+        run_notes.append(f"Seed: {seed} (rng: {rng_backend})")
+        if seat_prefix:
+            run_notes.append("Seat-prefix mode: every player count reads the same deals")
+        if stratified:
+            run_notes.append("Stratified by hero's 169 starting-hand classes, reweighted by class probability")
+        if cache is not None and cache.hits:
+            run_notes.append(f"Shards read from the result cache: {cache.hits} of {cache.hits + cache.misses}")
+    if counts_path:
+        from count_store import HeroCounts, save_counts
+
+        source = {
+            "seed": None if exact else seed,
+            "engine": engine,
+            "rng_backend": rng_backend,
+            "seat_prefix": seat_prefix,
+            "exact": exact,
+            "trials": num_trials_per_player_count,
+            "target_ci": target_ci,
+            "time_budget": time_budget,
+        }
+        if variant == "both":
+            for part in ("standard", "worstcase"):
+                part_tallies = {n: getattr(tally, part) for n, tally in tallies.items()}
+                save_counts(HeroCounts.from_tallies(part_tallies, part, source), paired_filename(counts_path, part))
+        else:
+            save_counts(HeroCounts.from_tallies(tallies, variant, source), counts_path)
+
+    if variant == "both":
+        md_name = (lambda part: paired_filename(md_filename, part)) if md_filename else (lambda part: None)
+        for part in ("standard", "worstcase"):
+            write_results(
+                {n: getattr(tally, part) for n, tally in tallies.items()},
+                num_players_list,
+                part,
+                paired_filename(csv_filename, part),
+                md_name(part),
+                run_notes + ["Paired run: the same deals were scored under both rankings"],
+                adaptive=adaptive,
+            )
+        write_cross_tab(tallies, num_players_list, paired_filename(csv_filename, "crosstab"), md_name("crosstab"),
+                        run_notes)
+    else:
+        write_results(tallies, num_players_list, variant, csv_filename, md_filename, run_notes, exact, adaptive)
+
+    if profile is not None:
+        print(profile.breakdown_table(), file=sys.stderr)
+        with open(profile_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(profile.collapsed_stacks(variant)) + "\n")
+
+    if checkpoint is not None:
+        checkpoint.remove()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Simulate Hold'em hand odds vs number of players.")
     parser.add_argument(
@@ -395,8 +1366,8 @@ if __name__ == "__main__":
         "--players",
         type=int,
         nargs="+",
-        default=[2, 3, 4, 5, 6, 7, 8, 9],
-        help="List of player counts to simulate (e.g. -p 2 6 9)",
+        default=None,
+        help="List of player counts to simulate (e.g. -p 2 6 9; default: 2..9, or 2 with --exact)",
     )
     parser.add_argument(
         "--csv",
@@ -413,9 +1384,140 @@ if __name__ == "__main__":
     parser.add_argument(
         "--variant",
         type=str,
-        choices=["standard", "worstcase"],
+        choices=["standard", "worstcase", "both"],
         default="standard",
-        help="Hand evaluation variant: 'standard' Texas Hold'em or 'worstcase' Worst Case Hold'em labels.",
+        help="Hand evaluation variant: 'standard' Texas Hold'em, 'worstcase' Worst Case Hold'em labels, or "
+             "'both' (each deal scored under both; writes <csv>_standard, <csv>_worstcase and <csv>_crosstab)",
+    )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        choices=["python", "numpy"],
+        default="python",
+        help="Simulation engine: 'python' (one deal at a time) or 'numpy' (batched, requires NumPy).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10000,
+        help="Deals per batch for --engine numpy (default: 10000)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for trial shards (default: 1)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Run seed; the same seed gives identical results for any --workers (default: random)",
+    )
+    parser.add_argument(
+        "--rng",
+        type=str,
+        choices=list(RNG_BACKENDS),
+        default="mt",
+        help="Random stream per shard: mt, pcg64, philox or splitmix (python engine only) (default: mt)",
+    )
+    parser.add_argument(
+        "--exact",
+        action="store_true",
+        help="Heads-up only: enumerate every deal exactly instead of sampling (uses --workers)",
+    )
+    parser.add_argument(
+        "--target-ci",
+        type=float,
+        default=None,
+        help="Keep adding --trials rounds until every P(hand) and P(win | hand) 95%% Wilson half-width is at most this",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Stop adding trials after this many seconds (checked after every batch of shards)",
+    )
+    parser.add_argument(
+        "--stratified",
+        action="store_true",
+        help="Spread trials over hero's 169 starting-hand classes and reweight by class probability",
+    )
+    parser.add_argument(
+        "--seat-prefix",
+        action="store_true",
+        help="Deal the largest table once per trial and score every player count from its seat prefixes",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        help="Save progress periodically to this file (default path: CSV name + .ckpt); removed when the run finishes",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=float,
+        default=CHECKPOINT_INTERVAL,
+        help=f"Seconds between checkpoint saves (default: {CHECKPOINT_INTERVAL:g})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the --checkpoint file (implies --checkpoint) with the same settings",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        nargs="?",
+        const="",
+        default=None,
+        metavar="DIR",
+        help="Reuse shards of earlier runs from this result cache directory, and add this run's "
+             "(default path: .holdem_cache next to this script)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Evict least recently used cache entries beyond this many megabytes (default: 256)",
+    )
+
+    parser.add_argument(
+        "--progress",
+        type=float,
+        nargs="?",
+        const=5.0,
+        default=None,
+        metavar="SECONDS",
+        help="Report throughput, ETA and running estimates to stderr every SECONDS (default when given: 5)",
+    )
+    parser.add_argument(
+        "--metrics-jsonl",
+        type=str,
+        default=None,
+        help="Append progress reports to this JSON-lines file (at the --progress interval, default 5s)",
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="holdem_profile.folded",
+        default=None,
+        metavar="FOLDED",
+        help="Time the stages of the python loop (sampled), print a breakdown and write folded stacks "
+             "for flamegraph tools to FOLDED (default: holdem_profile.folded)",
+    )
+
+    parser.add_argument(
+        "--counts",
+        type=str,
+        default=None,
+        help="Also save the raw integer counts to this .npz file, for count_store.py merge (requires NumPy)",
     )
 
     args = parser.parse_args()
@@ -427,5 +1529,47 @@ if __name__ == "__main__":
         else:
             md_filename = args.csv + ".md"
 
-    simulate(args.players, args.trials, args.csv, md_filename, variant=args.variant)
-    print(f"Simulation complete. Results written to {args.csv} and {md_filename}")
+    players = args.players or ([2] if args.exact else [2, 3, 4, 5, 6, 7, 8, 9])
+
+    checkpoint_path = args.checkpoint
+    if checkpoint_path == "" or (checkpoint_path is None and args.resume):
+        checkpoint_path = args.csv + ".ckpt"
+
+    cache_dir = args.cache
+    if cache_dir == "":
+        from result_cache import CACHE_DIR
+
+        cache_dir = CACHE_DIR
+
+    simulate(
+        players,
+        args.trials,
+        args.csv,
+        md_filename,
+        variant=args.variant,
+        engine=args.engine,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        seed=args.seed,
+        rng_backend=args.rng,
+        seat_prefix=args.seat_prefix,
+        exact=args.exact,
+        target_ci=args.target_ci,
+        time_budget=args.time_budget,
+        stratified=args.stratified,
+        checkpoint_path=checkpoint_path,
+        resume=args.resume,
+        checkpoint_interval=args.checkpoint_interval,
+        progress_interval=args.progress,
+        metrics_path=args.metrics_jsonl,
+        profile_path=args.profile,
+        counts_path=args.counts,
+        cache_dir=cache_dir,
+        cache_max_bytes=int(args.cache_size * 2**20) if args.cache_size is not None else None,
+    )
+    if args.variant == "both":
+        outputs = [paired_filename(name, part) for part in ("standard", "worstcase", "crosstab")
+                   for name in (args.csv, md_filename)]
+        print(f"Simulation complete. Results written to {', '.join(outputs)}")
+    else:
+        print(f"Simulation complete. Results written to {args.csv} and {md_filename}")
@@ -3,16 +3,15 @@ from __future__ import annotations
 from collections import Counter
 from dataclasses import dataclass
 from enum import IntEnum
+from functools import lru_cache
 from itertools import combinations
-from typing import List, Sequence, Tuple
+from math import comb
+from typing import Dict, List, Sequence, Tuple
 
-# Card representation matches texas_holdem_sim: (rank, suit)
-# ranks: 2-14 (where 14 = Ace)
-# suits: 0-3
+from cards import CARDS, DECK, RANK_OF, RANKS, SUITS, BoardState, cards_from_suit_masks, suit_isomorphism_classes
 
-RANKS = list(range(2, 15))
-SUITS = list(range(4))
-DECK: List[Tuple[int, int]] = [(r, s) for r in RANKS for s in SUITS]
+# Cards are (rank, suit) tuples at the public API (classify_worst_case_hand)
+# and card ints internally (classify_worst_case_cards); see cards.py.
 
 
 class WorstCaseHandType(IntEnum):
@@ -47,9 +46,8 @@ def _suit_to_color(suit: int) -> int:
     return 0 if suit in (0, 1) else 1
 
 
-def _is_faux_flush(suits: Sequence[int]) -> bool:
-    counts = Counter(suits)
-    return sorted(counts.values()) == [1, 4]
+def _is_faux_flush(suit_counts: Counter) -> bool:
+    return sorted(suit_counts.values()) == [1, 4]
 
 
 def _is_low_card(ranks: Sequence[int]) -> bool:
@@ -100,12 +98,11 @@ def _is_color_disassociate(ranks: Sequence[int], suits: Sequence[int]) -> bool:
     return max(ranks) <= 9
 
 
-def _is_color_clash(ranks: Sequence[int], suits: Sequence[int]) -> bool:
+def _is_color_clash(ranks: Sequence[int], suits: Sequence[int], suit_counts: Counter) -> bool:
     # Faux flush + a pair whose two cards are split across the main suit and the off-suit.
-    if not _is_faux_flush(suits):
+    if not _is_faux_flush(suit_counts):
         return False
 
-    suit_counts = Counter(suits)
     main_suit, _ = max(suit_counts.items(), key=lambda x: x[1])
     off_suit = next(s for s in suit_counts if s != main_suit)
 
@@ -123,7 +120,7 @@ def _is_color_clash(ranks: Sequence[int], suits: Sequence[int]) -> bool:
     return False
 
 
-def _is_broken_pair(ranks: Sequence[int]) -> bool:
+def _is_broken_pair(rank_counts: Counter) -> bool:
     """Broken Pair: a true low pair (<= 9) and three distinct kickers.
 
     This makes Broken Pair behave more like "One Pair" in standard poker odds,
@@ -131,9 +128,8 @@ def _is_broken_pair(ranks: Sequence[int]) -> bool:
     other patterns or by the LOW_CARD catch-all.
     """
 
-    counts = Counter(ranks)
     # Exactly one pair and three singletons.
-    pair_ranks = [r for r, c in counts.items() if c == 2]
+    pair_ranks = [r for r, c in rank_counts.items() if c == 2]
     if len(pair_ranks) != 1:
         return False
 
@@ -143,7 +139,7 @@ def _is_broken_pair(ranks: Sequence[int]) -> bool:
         return False
 
     # Ensure the remaining three cards are all different ranks.
-    if sorted(counts.values(), reverse=True) != [2, 1, 1, 1]:
+    if sorted(rank_counts.values(), reverse=True) != [2, 1, 1, 1]:
         return False
 
     return True
@@ -182,8 +178,111 @@ def classify_worst_case_hand(cards: Sequence[Tuple[int, int]]) -> WorstCaseHandE
     if len(cards) != 5:
         raise ValueError("Worst Case evaluation expects exactly 5 cards")
 
-    ranks = [r for r, _ in cards]
-    suits = [s for _, s in cards]
+    masks = [0, 0, 0, 0]
+    for r, s in cards:
+        masks[s] |= 1 << (r - 2)
+    if sum(m.bit_count() for m in masks) != 5:
+        # Repeated cards can't be told apart by suit masks; skip the memo.
+        ranks = [r for r, _ in cards]
+        suits = [s for _, s in cards]
+        return WorstCaseHandEval(_classify_ranks_suits(ranks, suits))
+    masks.sort()
+    return WorstCaseHandEval(_classify_five_by_pattern(tuple(masks)))
+
+
+def classify_worst_case_cards(cards: Sequence[int]) -> WorstCaseHandType:
+    """classify_worst_case_hand for 5 card ints, returning the type directly."""
+
+    return _classify_five_by_pattern(suit_pattern_key(cards))
+
+
+# ---------------------------------------------------------------------------
+# Suit-pattern memo
+# ---------------------------------------------------------------------------
+#
+# Every rule looks only at the ranks and at which cards share a suit, never at
+# the suit itself (_suit_to_color is unused).  So a hand can be memoised under
+# its per-suit rank masks in sorted order: suits are relabelled away and the
+# ~2.6M five-card hands collapse to 134,459 keys.  If a rule ever starts to
+# depend on colour, suit_pattern_key must only sort within each colour.
+
+# The 5-card memo holds every pattern.  The 7-card one is off by default:
+# random deals spread over 6,009,159 patterns, so a 1M-entry memo only hit
+# ~8% of 1M simulated hands while holding ~260 MB, and a miss costs more
+# than classifying directly.  Turn it on (set_worst_case_memo_sizes) for
+# workloads that repeat hands, e.g. exhaustive or range-restricted runs.
+FIVE_CARD_MEMO_SIZE = 1 << 18
+SEVEN_CARD_MEMO_SIZE = 0
+_seven_memo_on = SEVEN_CARD_MEMO_SIZE != 0
+
+
+def suit_pattern_key(cards: Sequence[int]) -> Tuple[int, int, int, int]:
+    """Canonical memo key of card ints: the four per-suit rank masks, sorted."""
+
+    masks = [0, 0, 0, 0]
+    for c in cards:
+        masks[c & 3] |= 1 << (c >> 2)
+    masks.sort()
+    return tuple(masks)
+
+
+@lru_cache(maxsize=FIVE_CARD_MEMO_SIZE)
+def _classify_five_by_pattern(suit_masks: Tuple[int, int, int, int]) -> WorstCaseHandType:
+    cards = cards_from_suit_masks(suit_masks)
+    return _classify_ranks_suits([RANK_OF[c] for c in cards], [c & 3 for c in cards])
+
+
+def worst_case_memo_stats() -> Dict[str, Dict[str, float]]:
+    """Hit/miss counts, hit rate and fill level of the 5- and 7-card memos."""
+
+    stats = {}
+    for name, memo in (("five", _classify_five_by_pattern), ("seven", _classify_seven_by_pattern)):
+        info = memo.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def set_worst_case_memo_sizes(five: int | None = None, seven: int | None = None) -> None:
+    """Resize (and empty) the 5- and/or 7-card memos; 0 disables caching."""
+
+    global _classify_five_by_pattern, _classify_seven_by_pattern, _seven_memo_on
+    if five is not None:
+        _classify_five_by_pattern = lru_cache(maxsize=five)(_classify_five_by_pattern.__wrapped__)
+    if seven is not None:
+        _classify_seven_by_pattern = lru_cache(maxsize=seven)(_classify_seven_by_pattern.__wrapped__)
+        _seven_memo_on = seven != 0
+
+
+def prewarm_worst_case_memo(num_cards: int = 5) -> int:
+    """Fill the 5- or 7-card memo with every suit pattern; returns keys visited.
+
+    The 5-card memo takes about a second.  The 7-card one walks 6M patterns
+    and keeps as many as its current size allows.
+    """
+
+    if num_cards not in (5, 7):
+        raise ValueError("num_cards must be 5 or 7")
+    memo = _classify_five_by_pattern if num_cards == 5 else _classify_seven_by_pattern
+    visited = 0
+    for suit_masks, _ in suit_isomorphism_classes(num_cards):
+        memo(suit_masks)
+        visited += 1
+    return visited
+
+
+def _classify_ranks_suits(ranks: Sequence[int], suits: Sequence[int]) -> WorstCaseHandType:
+    """Worst Case category of the 5 cards given by parallel rank/suit lists.
+
+    The rank and suit Counters are built once here and shared by the rules.
+    """
+
     rank_counts = Counter(ranks)
     suits_counter = Counter(suits)
 
@@ -193,89 +292,250 @@ def classify_worst_case_hand(cards: Sequence[Tuple[int, int]]) -> WorstCaseHandE
 
     # PERFECT_MISDEAL: true Royal Flush (A,K,Q,J,10 all same suit) – the "peak" bad beat.
     if set(ranks) == {10, 11, 12, 13, 14} and is_flush:
-        wc_type = WorstCaseHandType.PERFECT_MISDEAL
-        return WorstCaseHandEval(wc_type)
+        return WorstCaseHandType.PERFECT_MISDEAL
 
     # DEAD_ROYAL: A,K,Q,J,10 with *mixed* suits (not a flush).
     if _is_dead_royal(ranks, suits):
-        wc_type = WorstCaseHandType.DEAD_ROYAL
-        return WorstCaseHandEval(wc_type)
+        return WorstCaseHandType.DEAD_ROYAL
 
     # COLOR_CLASH: faux-flush style pattern where the odd card clashes
     # with the main suit on rank.
-    if _is_color_clash(ranks, suits):
-        wc_type = WorstCaseHandType.COLOR_CLASH
-        return WorstCaseHandEval(wc_type)
+    if _is_color_clash(ranks, suits, suits_counter):
+        return WorstCaseHandType.COLOR_CLASH
 
     # ALMOST_FULL_HOUSE: 3-of-a-kind plus two different kickers.
     # (i.e. rank multiplicities 3,1,1 and *not* an actual full house).
     if sorted(rank_counts.values(), reverse=True) == [3, 1, 1]:
-        wc_type = WorstCaseHandType.ALMOST_FULL_HOUSE
-        return WorstCaseHandEval(wc_type)
+        return WorstCaseHandType.ALMOST_FULL_HOUSE
 
     # GAP: five distinct ranks forming a +2 arithmetic progression.
-    if _is_gap(sorted(set(ranks))):
-        wc_type = WorstCaseHandType.GAP
-        return WorstCaseHandEval(wc_type)
+    if _is_gap(uniq_ranks_sorted):
+        return WorstCaseHandType.GAP
 
     # COLOR_DISASSOCIATE: rainbow low hand meeting the stricter definition.
     if _is_color_disassociate(ranks, suits):
-        wc_type = WorstCaseHandType.COLOR_DISASSOCIATE
-        return WorstCaseHandEval(wc_type)
+        return WorstCaseHandType.COLOR_DISASSOCIATE
 
     # MIRROR_HAND: counts pattern 2,2,1 (our earlier helper) – a kind of
     # "fake" two-pair shape.
     if _is_mirror_hand(rank_counts):
-        wc_type = WorstCaseHandType.MIRROR_HAND
-        return WorstCaseHandEval(wc_type)
+        return WorstCaseHandType.MIRROR_HAND
 
     # FAUX_FLUSH: four cards in one suit, one in another.
-    if _is_faux_flush(suits):
-        wc_type = WorstCaseHandType.FAUX_FLUSH
-        return WorstCaseHandEval(wc_type)
+    if _is_faux_flush(suits_counter):
+        return WorstCaseHandType.FAUX_FLUSH
 
     # BROKEN_PAIR: a true low pair, handled by _is_broken_pair.
-    if _is_broken_pair(ranks):
-        wc_type = WorstCaseHandType.BROKEN_PAIR
-        return WorstCaseHandEval(wc_type)
+    if _is_broken_pair(rank_counts):
+        return WorstCaseHandType.BROKEN_PAIR
 
     # LOW_CARD: catch-all for hands that don't satisfy any special Worst Case
     # pattern. This soaks up the majority of garbage hands, similar to High
     # Card in standard poker odds.
-    wc_type = WorstCaseHandType.LOW_CARD
-    return WorstCaseHandEval(wc_type)
+    return WorstCaseHandType.LOW_CARD
 
 
-def enumerate_worst_case_frequencies() -> Counter:
+# Rank masks for the 7-card classifier (bit 0 = deuce ... bit 12 = ace).
+_ROYAL_MASK = 0b11111 << 8                              # 10, J, Q, K, A
+_LOW_MASK = 0xFF                                        # ranks 2..9
+_GAP_MASKS = [0b101010101 << low for low in range(5)]   # r, r+2, ..., r+8
+_SUIT_SUBSETS = [[s for s in SUITS if subset >> s & 1] for subset in range(1, 16)]
+
+
+def _low_rainbow_possible(suit_masks: Sequence[int]) -> bool:
+    """Can each suit be given its own low rank (Hall's condition on suits)?"""
+
+    for subset in _SUIT_SUBSETS:
+        covered = 0
+        for s in subset:
+            covered |= suit_masks[s] & _LOW_MASK
+        if covered.bit_count() < len(subset):
+            return False
+    return True
+
+
+def classify_worst_case_seven(cards: Sequence[int]) -> WorstCaseHandType:
+    """Highest WorstCaseHandType reachable by any 5 of 7 card ints.
+
+    Equivalent to taking the max of classify_worst_case_cards over all 21
+    subsets, but decided directly from the 7 cards' rank and suit masks
+    (memoised by suit pattern, see suit_pattern_key).
+    """
+
+    return _classify_seven_by_pattern(suit_pattern_key(cards))
+
+
+def classify_worst_case_on_board(board: BoardState, c0: int, c1: int) -> WorstCaseHandType:
+    """classify_worst_case_seven of two hole cards plus an analysed board.
+
+    The seat's suit and "seen k times" masks are the board's with two bits
+    added, so no pass over the board cards is repeated per seat.  The suit
+    masks are only sorted into a memo key when the 7-card memo is on.
+    """
+
+    b0 = 1 << (c0 >> 2)
+    b1 = 1 << (c1 >> 2)
+    masks = list(board.suit_masks)
+    masks[c0 & 3] |= b0
+    masks[c1 & 3] |= b1
+    if _seven_memo_on:
+        masks.sort()
+        return _classify_seven_by_pattern(tuple(masks))
+
+    m1, m2, m3 = board.m1, board.m2, board.m3
+    m3 |= m2 & b0
+    m2 |= m1 & b0
+    m1 |= b0
+    m3 |= m2 & b1
+    m2 |= m1 & b1
+    m1 |= b1
+    return _classify_seven_masks(masks, m1, m2, m3)
+
+
+@lru_cache(maxsize=SEVEN_CARD_MEMO_SIZE)
+def _classify_seven_by_pattern(suit_masks: Tuple[int, int, int, int]) -> WorstCaseHandType:
+    """classify_worst_case_seven on per-suit rank masks.
+
+    A 5-card hand's category is the highest rule it satisfies, so the answer
+    is the highest rule that *some* subset can satisfy; the rules are tried
+    from the top and each is skipped as soon as a histogram fact (too few
+    distinct ranks, no suit with four cards, no low pair, ...) rules it out.
+    """
+
+    s0, s1, s2, s3 = suit_masks
+    m1 = s0 | s1 | s2 | s3  # ranks seen at least 1, 2, 3 times
+    m2 = (s0 & s1) | (s0 & s2) | (s0 & s3) | (s1 & s2) | (s1 & s3) | (s2 & s3)
+    m3 = (s0 & s1 & s2) | (s0 & s1 & s3) | (s0 & s2 & s3) | (s1 & s2 & s3)
+    return _classify_seven_masks(suit_masks, m1, m2, m3)
+
+
+def _classify_seven_masks(suit_masks: Sequence[int], m1: int, m2: int, m3: int) -> WorstCaseHandType:
+    """Body of _classify_seven_by_pattern; suit_masks may be in any suit order."""
+
+    if m1 & _ROYAL_MASK == _ROYAL_MASK:
+        for suit_mask in suit_masks:
+            if suit_mask & _ROYAL_MASK == _ROYAL_MASK:
+                return WorstCaseHandType.PERFECT_MISDEAL
+        return WorstCaseHandType.DEAD_ROYAL
+
+    # Only one suit can hold four of seven cards.
+    suit_counts = [suit_mask.bit_count() for suit_mask in suit_masks]
+    top_count = max(suit_counts)
+    if top_count >= 4:
+        main = suit_counts.index(top_count)
+        off_suit_ranks = 0
+        for s in SUITS:
+            if s != main:
+                off_suit_ranks |= suit_masks[s]
+        if off_suit_ranks & suit_masks[main]:
+            return WorstCaseHandType.COLOR_CLASH
+
+    distinct = m1.bit_count()
+    if m3 and distinct >= 3:
+        return WorstCaseHandType.ALMOST_FULL_HOUSE
+
+    if distinct >= 5:
+        for gap_mask in _GAP_MASKS:
+            if m1 & gap_mask == gap_mask:
+                return WorstCaseHandType.GAP
+
+        if (m1 & _LOW_MASK).bit_count() >= 5 and _low_rainbow_possible(suit_masks):
+            return WorstCaseHandType.COLOR_DISASSOCIATE
+
+    if m2 & (m2 - 1) and distinct >= 3:
+        return WorstCaseHandType.MIRROR_HAND
+
+    if 4 <= top_count < 7:
+        return WorstCaseHandType.FAUX_FLUSH
+
+    if m2 & _LOW_MASK and distinct >= 4:
+        return WorstCaseHandType.BROKEN_PAIR
+
+    return WorstCaseHandType.LOW_CARD
+
+
+# The rules of _classify_seven_masks in the order it tries them, by the type
+# each one returns.  Keep in step with the classifier: trace_worst_case_seven
+# reads its trace off this list.
+_SEVEN_CARD_RULES = [
+    ("royal", (WorstCaseHandType.PERFECT_MISDEAL, WorstCaseHandType.DEAD_ROYAL)),
+    ("color_clash", (WorstCaseHandType.COLOR_CLASH,)),
+    ("almost_full_house", (WorstCaseHandType.ALMOST_FULL_HOUSE,)),
+    ("gap", (WorstCaseHandType.GAP,)),                                  # only with 5+ distinct ranks
+    ("color_disassociate", (WorstCaseHandType.COLOR_DISASSOCIATE,)),    # only with 5+ distinct ranks
+    ("mirror_hand", (WorstCaseHandType.MIRROR_HAND,)),
+    ("faux_flush", (WorstCaseHandType.FAUX_FLUSH,)),
+    ("broken_pair", (WorstCaseHandType.BROKEN_PAIR,)),
+    ("low_card", (WorstCaseHandType.LOW_CARD,)),
+]
+
+
+def trace_worst_case_seven(cards: Sequence[int]) -> Tuple[WorstCaseHandType, List[str]]:
+    """classify_worst_case_seven plus the rule checks it made, in order.
+
+    The category comes from the classifier itself; the checks are every rule
+    of _SEVEN_CARD_RULES down to the one returning it, less the two that
+    are skipped below five distinct ranks, so the last check listed is the
+    one that decided.  Used by profiling.py to count how often each rule is
+    tried and fires, without instrumenting the classifier.
+    """
+
+    suit_masks = suit_pattern_key(cards)
+    hand_type = _classify_seven_by_pattern.__wrapped__(suit_masks)
+    distinct = (suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]).bit_count()
+    checks = []
+    for rule, returns in _SEVEN_CARD_RULES:
+        if distinct < 5 and rule in ("gap", "color_disassociate"):
+            continue
+        checks.append(rule)
+        if hand_type in returns:
+            break
+    return hand_type, checks
+
+
+# Ranks present in each 13-bit rank mask, for building class representatives.
+_RANKS_IN_MASK = [[r for r in RANKS if mask >> (r - 2) & 1] for mask in range(1 << len(RANKS))]
+
+
+def enumerate_worst_case_frequencies(method: str = "isomorphism") -> Counter:
     """Enumerate all 5-card hands and count Worst Case categories.
 
     Returns a Counter mapping WorstCaseHandType (or None) to combination counts.
+
+    method:
+      - "isomorphism": walk every rank multiset (6,175) and, for each, every
+        distinct way of spreading it over suits up to relabelling (134,459
+        classes in total, see cards.suit_isomorphism_classes). One
+        representative per class goes through the same 5-card rules as
+        classify_worst_case_hand (_classify_ranks_suits) and is counted
+        with the class size, so edits to those rules show up here.
+      - "brute_force": classify all 2,598,960 hands one by one.
     """
 
     counts: Counter = Counter()
-    for combo in combinations(DECK, 5):
-        eval_result = classify_worst_case_hand(combo)
-        counts[eval_result.hand_type] += 1
+    if method == "brute_force":
+        for combo in combinations(CARDS, 5):
+            counts[classify_worst_case_cards(combo)] += 1
+        return counts
+    if method != "isomorphism":
+        raise ValueError("method must be 'isomorphism' or 'brute_force'")
+
+    ranks_in_mask = _RANKS_IN_MASK
+    for suit_masks, class_size in suit_isomorphism_classes(5):
+        ranks: List[int] = []
+        suits: List[int] = []
+        for suit, mask in enumerate(suit_masks):
+            held = ranks_in_mask[mask]
+            ranks += held
+            suits += [suit] * len(held)
+        counts[_classify_ranks_suits(ranks, suits)] += class_size
     return counts
 
 
-if __name__ == "__main__":
-    from math import comb
+def write_worst_case_odds_markdown(freqs: Counter, md_path: str = "worst_case_holdem_odds.md") -> None:
+    """Write the Worst Case 5-card probability table for enumerate_worst_case_frequencies output."""
 
     total = comb(52, 5)
-    freqs = enumerate_worst_case_frequencies()
-
-    # Plain-text summary to stdout
-    print(f"Total 5-card hands: {total}")
-    for hand_type, count in sorted(
-        freqs.items(), key=lambda kv: (kv[0] is None, kv[0] if kv[0] is not None else -1)
-    ):
-        label = "None" if hand_type is None else hand_type.name
-        prob = count / total
-        print(f"{label:20s} {count:10d} {prob:8.6f}")
-
-    # Also write a markdown table for easy tracking/comparison.
-    md_path = "worst_case_holdem_odds.md"
     with open(md_path, "w", encoding="utf-8") as md:
         md.write("# Worst Case Hold'em – 5-Card Hand Probabilities\n")
         md.write(f"\nTotal distinct 5-card hands: {total}\n\n")
@@ -294,4 +554,32 @@ if __name__ == "__main__":
         for rank, name, count, prob in rows:
             md.write(f"| {rank:2d} | {name:16s} | {count:11d} | {prob*100:10.4f}% |\n")
 
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Exact Worst Case Hold'em 5-card hand frequencies.")
+    parser.add_argument(
+        "--brute-force",
+        action="store_true",
+        help="Classify all 2,598,960 hands instead of one per suit-isomorphism class.",
+    )
+    args = parser.parse_args()
+
+    total = comb(52, 5)
+    freqs = enumerate_worst_case_frequencies("brute_force" if args.brute_force else "isomorphism")
+
+    # Plain-text summary to stdout
+    print(f"Total 5-card hands: {total}")
+    for hand_type, count in sorted(
+        freqs.items(), key=lambda kv: (kv[0] is None, kv[0] if kv[0] is not None else -1)
+    ):
+        label = "None" if hand_type is None else hand_type.name
+        prob = count / total
+        print(f"{label:20s} {count:10d} {prob:8.6f}")
+
+    # Also write a markdown table for easy tracking/comparison.
+    md_path = "worst_case_holdem_odds.md"
+    write_worst_case_odds_markdown(freqs, md_path)
+
     print(f"Markdown odds written to {md_path}")
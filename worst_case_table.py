@@ -0,0 +1,171 @@
+"""Precomputed Worst Case Hold'em category for every 5-card hand.
+
+The table holds one byte (the WorstCaseHandType value) per 5-card hand, in
+colexicographic order of the sorted card ints: hand c0 < c1 < c2 < c3 < c4 sits
+at ``comb(c0, 1) + comb(c1, 2) + comb(c2, 3) + comb(c3, 4) + comb(c4, 5)``.
+
+It is built once from worst_case_holdem.classify_worst_case_cards, written to
+TABLE_PATH and memory-mapped on import.  The file header carries a digest of
+the source of the 5-card rules (rules_stamp), so editing them makes the next
+import rebuild the table, while other edits to worst_case_holdem.py do not.
+
+The simulator classifies 7-card hands directly (classify_worst_case_seven) and
+no longer reads this table; enumerate_odds and verify_seven_card_classifier do.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+import sys
+from itertools import combinations
+from math import comb
+from typing import Sequence
+
+import cards
+import worst_case_holdem
+from cards import CARDS, NUM_CARDS, cards_from_suit_masks, suit_isomorphism_classes
+from worst_case_holdem import classify_worst_case_cards, classify_worst_case_seven
+
+NUM_HANDS = comb(NUM_CARDS, 5)
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "worst_case_5card_table.bin")
+_TABLE_MAGIC = b"WCT5"
+_HEADER = struct.Struct("<4s20s8x")  # 32 bytes
+
+# COLEX[k][c] = comb(c, k + 1): the colex contribution of card c in position k.
+COLEX = [[comb(c, k + 1) for c in range(NUM_CARDS)] for k in range(5)]
+
+
+def hand_index(cards: Sequence[int]) -> int:
+    """Table index of 5 card ints (any order)."""
+
+    c0, c1, c2, c3, c4 = sorted(cards)
+    return COLEX[0][c0] + COLEX[1][c1] + COLEX[2][c2] + COLEX[3][c3] + COLEX[4][c4]
+
+
+def rules_stamp() -> bytes:
+    """Digest of the code behind classify_worst_case_cards: the 5-card rules and _is_* predicates."""
+
+    rules = [
+        worst_case_holdem.WorstCaseHandType,
+        worst_case_holdem.classify_worst_case_cards,
+        worst_case_holdem.suit_pattern_key,
+        worst_case_holdem._classify_five_by_pattern.__wrapped__,
+        worst_case_holdem._classify_ranks_suits,
+        cards.cards_from_suit_masks,
+    ]
+    rules += [getattr(worst_case_holdem, name) for name in sorted(vars(worst_case_holdem)) if name.startswith("_is_")]
+    digest = hashlib.sha1()
+    for rule in rules:
+        digest.update(inspect.getsource(rule).encode("utf-8"))
+    return digest.digest()
+
+
+def build_worst_case_table() -> bytearray:
+    """Classify all C(52,5) hands, in table order."""
+
+    table = bytearray(NUM_HANDS)
+    x0, x1, x2, x3, x4 = COLEX
+    for combo in combinations(CARDS, 5):
+        c0, c1, c2, c3, c4 = combo
+        table[x0[c0] + x1[c1] + x2[c2] + x3[c3] + x4[c4]] = classify_worst_case_cards(combo)
+    return table
+
+
+def save_worst_case_table(table: bytearray, path: str = TABLE_PATH) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_TABLE_MAGIC, rules_stamp()))
+        f.write(table)
+    os.replace(tmp_path, path)
+
+
+def _map_table(path: str) -> memoryview | None:
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != _HEADER.size + NUM_HANDS:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError:
+        return None
+    magic, stamp = _HEADER.unpack_from(mapped)
+    if magic != _TABLE_MAGIC or stamp != rules_stamp():
+        mapped.close()
+        return None
+    return memoryview(mapped)[_HEADER.size :]
+
+
+def load_worst_case_table(path: str = TABLE_PATH) -> memoryview:
+    """Map the table at path, (re)building it first if missing or stale.
+
+    Indexing the returned memoryview with hand_index(...) gives the
+    WorstCaseHandType value as a plain int.
+    """
+
+    table = _map_table(path)
+    if table is None:
+        print(f"Building Worst Case 5-card table at {path} (one-time)...", file=sys.stderr)
+        built = build_worst_case_table()
+        try:
+            save_worst_case_table(built, path)
+        except OSError:
+            return memoryview(built)  # read-only checkout: keep it in memory
+        table = _map_table(path)
+    return table
+
+
+TABLE = load_worst_case_table()
+
+
+def best_of_seven_by_subsets(cards: Sequence[int]) -> int:
+    """Max table value over the 21 5-card subsets of 7 card ints."""
+
+    table = TABLE
+    x0, x1, x2, x3, x4 = COLEX
+    best = 0
+    # Subsets of a sorted hand come out sorted, as the colex index expects.
+    for c0, c1, c2, c3, c4 in combinations(sorted(cards), 5):
+        value = table[x0[c0] + x1[c1] + x2[c2] + x3[c3] + x4[c4]]
+        if value > best:
+            best = value
+    return best
+
+
+def verify_seven_card_classifier() -> int:
+    """Check classify_worst_case_seven against the 21-subset loop on every 7-card hand.
+
+    Both sides ignore which suit is which, so one representative per suit
+    isomorphism class (6,009,159 of them) covers all C(52,7) hands.  Returns
+    the number of hands checked; raises AssertionError on the first mismatch.
+    """
+
+    checked = 0
+    for suit_masks, count in suit_isomorphism_classes(7):
+        cards = cards_from_suit_masks(suit_masks)
+        direct = classify_worst_case_seven(cards)
+        by_subsets = best_of_seven_by_subsets(cards)
+        assert direct == by_subsets, f"{cards}: direct {direct!r}, subsets {by_subsets}"
+        checked += count
+    return checked
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build (or verify against) the Worst Case 5-card table.")
+    parser.add_argument(
+        "--verify-seven",
+        action="store_true",
+        help="Check classify_worst_case_seven against the table on all 7-card hands.",
+    )
+    args = parser.parse_args()
+
+    if args.verify_seven:
+        print(f"classify_worst_case_seven matches on all {verify_seven_card_classifier()} 7-card hands")
+    else:
+        save_worst_case_table(build_worst_case_table())
+        print(f"Worst Case 5-card table written to {TABLE_PATH}")